@@ -8,7 +8,7 @@ RUN pip install --no-cache-dir --upgrade pip && \
     pip install --no-cache-dir -r requirements/development.txt
 
 
-FROM python:3.12-slim
+FROM python:3.12-slim AS base
 
 WORKDIR /usr/src/app
 
@@ -24,6 +24,17 @@ RUN python -m playwright install chromium
 
 COPY . .
 
+
+# Runs the crawl jobs queued by the web container; course retrievals stay pending without it.
+# Build with `--target crawl-worker` and run it next to the web container, on the same database and with the same
+# volume mounted at CRAWLER_SLOT_DIR, so both count against one browser crawl limit.
+FROM base AS crawl-worker
+
+CMD ["python", "manage.py", "run_crawl_worker"]
+
+
+FROM base AS web
+
 EXPOSE 8000
 
 CMD ["gunicorn", "--bind", "0.0.0.0:8000", "config.wsgi:application"]
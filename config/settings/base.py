@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
     'src.reviews',
     'src.tickets',
     'src.notifications',
+    'src.crawlers',
 ]
 
 MIDDLEWARE = [
@@ -136,3 +138,109 @@ DJOSER = {
         "activation": "src.accounts.emails.CustomActivationEmail"
     },
 }
+
+# Captcha classifier to use instead of the shipped edu.pkl, e.g. a version written by `manage.py train_captcha_model`
+CAPTCHA_MODEL_PATH = os.getenv('CAPTCHA_MODEL_PATH')
+# Directory `manage.py train_captcha_model` writes its edu-v<N>.pkl versions to
+CAPTCHA_MODEL_DIR = os.getenv('CAPTCHA_MODEL_DIR', os.path.join(BASE_DIR, 'media', 'captcha_models'))
+
+# Load the captcha classifier when a web or crawl worker process starts, so its first login doesn't pay for it
+CAPTCHA_SOLVER_WARM_UP = os.getenv('CAPTCHA_SOLVER_WARM_UP', 'False') == 'True'
+
+# A captcha whose prediction has the wrong length or a lower confidence is replaced by a fresh one
+# instead of being submitted, at most CAPTCHA_MAX_REFETCHES times per login
+CAPTCHA_EXPECTED_LENGTH = int(os.getenv('CAPTCHA_EXPECTED_LENGTH', '5'))
+CAPTCHA_MIN_CONFIDENCE = float(os.getenv('CAPTCHA_MIN_CONFIDENCE', '0.05'))
+CAPTCHA_MAX_REFETCHES = int(os.getenv('CAPTCHA_MAX_REFETCHES', '10'))
+
+# Address of the captcha solver service started by `manage.py run_captcha_solver` ('/path/to.sock' or 'host:port').
+# When unset or unreachable, captchas are solved in the web worker itself
+CAPTCHA_SOLVER_SERVICE_ADDRESS = os.getenv('CAPTCHA_SOLVER_SERVICE_ADDRESS')
+CAPTCHA_SOLVER_SERVICE_TIMEOUT = float(os.getenv('CAPTCHA_SOLVER_SERVICE_TIMEOUT', '5'))
+CAPTCHA_SOLVER_SERVICE_WORKERS = int(os.getenv('CAPTCHA_SOLVER_SERVICE_WORKERS', '2'))
+
+# Warm headless Chromium instances kept by each crawler worker; a browser is relaunched after CRAWLER_BROWSER_MAX_JOBS crawls
+CRAWLER_BROWSER_POOL_SIZE = int(os.getenv('CRAWLER_BROWSER_POOL_SIZE', '1'))
+CRAWLER_BROWSER_MAX_JOBS = int(os.getenv('CRAWLER_BROWSER_MAX_JOBS', '50'))
+
+# Crawl with the asyncio crawlers on the running event loop, that of the crawl worker (or of the server under ASGI);
+# each browser holds several concurrent sessions
+CRAWLER_ASYNC_ENGINE = os.getenv('CRAWLER_ASYNC_ENGINE', 'True') == 'True'
+CRAWLER_ASYNC_BROWSER_POOL_SIZE = int(os.getenv('CRAWLER_ASYNC_BROWSER_POOL_SIZE', '2'))
+CRAWLER_ASYNC_CONTEXTS_PER_BROWSER = int(os.getenv('CRAWLER_ASYNC_CONTEXTS_PER_BROWSER', '8'))
+
+# Golestan portal crawled for courses and student info; point it at `manage.py run_fake_golestan` to crawl offline
+GOLESTAN_BASE_URL = os.getenv('GOLESTAN_BASE_URL', 'https://golestan.ui.ac.ir')
+
+# Upper bounds in milliseconds of each crawl step; every step returns as soon as Golestan responds
+CRAWLER_STEP_TIMEOUTS = {
+    'login_page': int(os.getenv('CRAWLER_LOGIN_PAGE_TIMEOUT', '15000')),
+    'captcha': int(os.getenv('CRAWLER_CAPTCHA_TIMEOUT', '5000')),
+    'login': int(os.getenv('CRAWLER_LOGIN_TIMEOUT', '10000')),
+    'menu': int(os.getenv('CRAWLER_MENU_TIMEOUT', '10000')),
+    'report': int(os.getenv('CRAWLER_REPORT_TIMEOUT', '20000')),
+    'session': int(os.getenv('CRAWLER_SESSION_TIMEOUT', '3000')),
+}
+
+# Upper bounds in milliseconds of the crawl timing histogram buckets reported by the crawl metrics endpoint
+CRAWLER_TIMING_BUCKETS_MS = tuple(
+    int(bound) for bound in os.getenv('CRAWLER_TIMING_BUCKETS_MS', '100,250,500,1000,2500,5000,10000,20000,40000').split(',')
+)
+
+# Seconds a student's Golestan session is kept (encrypted) to skip the next login; 0 disables it. Sessions are kept in
+# the GOLESTAN_SESSION_CACHE cache, a table of the database every web and crawl worker process shares, so a session
+# opened by one of them (validating a student) is resumed by another (fetching their courses)
+GOLESTAN_SESSION_TTL = int(os.getenv('GOLESTAN_SESSION_TTL', '300'))
+GOLESTAN_SESSION_CACHE = 'golestan_sessions'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    GOLESTAN_SESSION_CACHE: {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'crawlers_golestan_session_cache',
+    },
+}
+
+# Backend of course retrieval: 'playwright', or 'http' to replay Golestan's form posts with requests and
+# fall back to playwright when that fails; the http backend shares a pool of CRAWLER_HTTP_POOL_SIZE connections.
+# 'http' is experimental: its form posts haven't been recorded from the live portal, so it posts the login at most
+# CRAWLER_HTTP_LOGIN_TRIES times and leaves every login it can't complete, wrong passwords included, to playwright
+CRAWLER_BACKEND = os.getenv('CRAWLER_BACKEND', 'playwright')
+CRAWLER_HTTP_LOGIN_TRIES = int(os.getenv('CRAWLER_HTTP_LOGIN_TRIES', '2'))
+CRAWLER_HTTP_TIMEOUT = float(os.getenv('CRAWLER_HTTP_TIMEOUT', '10'))
+CRAWLER_HTTP_POOL_SIZE = int(os.getenv('CRAWLER_HTTP_POOL_SIZE', '10'))
+
+# Requests of a crawl that are aborted: resource types and URL regexes (whitespace separated), except URLs
+# matching an allowed regex, such as the captcha image. Documents, frames, scripts and XHR are needed by Golestan
+CRAWLER_BLOCK_REQUESTS = os.getenv('CRAWLER_BLOCK_REQUESTS', 'True') == 'True'
+CRAWLER_BLOCKED_RESOURCE_TYPES = os.getenv('CRAWLER_BLOCKED_RESOURCE_TYPES', 'image stylesheet font media').split()
+CRAWLER_BLOCKED_URL_PATTERNS = os.getenv(
+    'CRAWLER_BLOCKED_URL_PATTERNS', r'google-analytics\.com googletagmanager\.com \.(?:woff2?|ttf|ico)(?:\?|$)'
+).split()
+CRAWLER_ALLOWED_URL_PATTERNS = os.getenv('CRAWLER_ALLOWED_URL_PATTERNS', r'(?i)captcha').split()
+
+# Seconds the course catalog saved from report 212 is served from the database before Golestan is crawled again
+COURSE_CATALOG_TTL = int(os.getenv('COURSE_CATALOG_TTL', '3600'))
+
+# Crawl jobs queued by the course retrieval endpoint and run by `manage.py run_crawl_worker`;
+# a job still running after CRAWL_JOB_TIMEOUT seconds is failed, as is one no worker claimed within
+# CRAWL_JOB_PENDING_TIMEOUT seconds (its password is wiped with it)
+CRAWL_WORKER_POLL_INTERVAL = float(os.getenv('CRAWL_WORKER_POLL_INTERVAL', '1'))
+# Jobs a crawl worker runs at once; under CRAWLER_ASYNC_ENGINE their browser crawls share the worker's event loop
+CRAWL_WORKER_CONCURRENCY = int(os.getenv('CRAWL_WORKER_CONCURRENCY', '2'))
+CRAWL_JOB_TIMEOUT = int(os.getenv('CRAWL_JOB_TIMEOUT', '600'))
+CRAWL_JOB_PENDING_TIMEOUT = int(os.getenv('CRAWL_JOB_PENDING_TIMEOUT', '300'))
+
+# Browser crawls run at once by web and crawl worker processes alike, each holding a lock file of CRAWLER_SLOT_DIR;
+# the limit only covers the processes that share the directory, so containers must mount the same volume there
+# (production requires it to be set). A crawl made while answering a request waits CRAWLER_SLOT_WAIT seconds at most for a slot, behind
+# at most CRAWLER_SLOT_QUEUE_SIZE others; past that, or past CRAWL_JOB_QUEUE_SIZE pending crawl jobs, the request is
+# answered 429 with a Retry-After of CRAWLER_RETRY_AFTER seconds
+CRAWLER_MAX_CONCURRENT_CRAWLS = int(os.getenv('CRAWLER_MAX_CONCURRENT_CRAWLS', '2'))
+CRAWLER_SLOT_DIR = os.getenv('CRAWLER_SLOT_DIR', os.path.join(tempfile.gettempdir(), 'unico-crawl-slots'))
+CRAWLER_SLOT_WAIT = float(os.getenv('CRAWLER_SLOT_WAIT', '20'))
+CRAWLER_SLOT_QUEUE_SIZE = int(os.getenv('CRAWLER_SLOT_QUEUE_SIZE', '8'))
+CRAWL_JOB_QUEUE_SIZE = int(os.getenv('CRAWL_JOB_QUEUE_SIZE', '200'))
+CRAWLER_RETRY_AFTER = int(os.getenv('CRAWLER_RETRY_AFTER', '15'))
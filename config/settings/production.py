@@ -1,4 +1,5 @@
 import os
+from django.core.exceptions import ImproperlyConfigured
 from .base import *
 
 
@@ -18,3 +19,11 @@ DATABASES = {
         'PORT': os.getenv('PROD_DB_PORT'),
     }
 }
+
+CAPTCHA_SOLVER_WARM_UP = os.getenv('CAPTCHA_SOLVER_WARM_UP', 'True') == 'True'
+
+# the default under the temporary directory is private to each container, which would give the web and crawl worker
+# containers crawl slots of their own
+CRAWLER_SLOT_DIR = os.getenv('CRAWLER_SLOT_DIR')
+if not CRAWLER_SLOT_DIR:
+    raise ImproperlyConfigured("CRAWLER_SLOT_DIR must be a directory shared by the web and crawl worker containers")
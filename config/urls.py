@@ -11,6 +11,7 @@ urlpatterns = [
     path('professor-reviewer/', include('src.reviews.urls')),
     path('tickets/', include('src.tickets.urls')),
     path('notification/', include('src.notifications.urls')),
+    path('crawlers/', include('src.crawlers.urls')),
 ]
 
 if settings.DEBUG:
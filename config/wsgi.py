@@ -1,7 +1,9 @@
 import os
 
+from django.apps import apps
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', os.getenv('DJANGO_SETTINGS_MODULE', 'config.settings.production'))
 
 application = get_wsgi_application()
+apps.get_app_config('crawlers').warm_up_captcha_solver()
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
 
-from .models import Course, ClassSession, Exam, Plan
+from .models import Course, ClassSession, Exam, Plan, CatalogRefresh
 
 
 class ClassSessionInline(admin.TabularInline):
@@ -104,3 +104,9 @@ class PlanAdmin(admin.ModelAdmin):
     def get_courses(self, obj):
         return ", ".join([course.course_code for course in obj.courses.all()])
     get_courses.short_description = "Courses"
+
+
+@admin.register(CatalogRefresh)
+class CatalogRefreshAdmin(admin.ModelAdmin):
+    list_display = ['refreshed_at', 'courses']
+    ordering = ['-refreshed_at']
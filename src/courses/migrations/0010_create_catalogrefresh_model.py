@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_remove_plan_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refreshed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('courses', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ['-refreshed_at'],
+                'get_latest_by': 'refreshed_at',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forget_catalog_refreshes(apps, schema_editor):
+    # the courses saved so far aren't tied to a refresh, so the catalog is crawled again before it is served
+    apps.get_model('courses', 'CatalogRefresh').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_create_catalogrefresh_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='catalog_refresh',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='courses.catalogrefresh'),
+        ),
+        migrations.RunPython(forget_catalog_refreshes, reverse_code=migrations.RunPython.noop),
+    ]
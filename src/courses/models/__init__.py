@@ -2,3 +2,4 @@ from .course import WeekDay, Gender, Course
 from .exam import Exam
 from .class_session import ClassSession
 from .plan import Plan
+from .catalog_refresh import CatalogRefresh
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class CatalogRefresh(models.Model):
+    """ A save of the course catalog crawled from report 212; the latest one tells how fresh the catalog is. """
+    refreshed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    courses = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['-refreshed_at']
+        get_latest_by = 'refreshed_at'
+
+    def __str__(self):
+        return f"{self.courses} courses at {self.refreshed_at}"
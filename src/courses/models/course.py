@@ -30,6 +30,10 @@ class Course(models.Model):
     class_location = models.CharField(max_length=255, blank=True, default="")
     prerequisites = models.TextField(blank=True, default="")
     notes = models.TextField(blank=True, default="")
+    # the latest save of the catalog this course was in; courses missing from it are no longer offered
+    catalog_refresh = models.ForeignKey(
+        'courses.CatalogRefresh', on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
 
     def save(self, *args, **kwargs):
         self.id = int(self.course_code.replace('_', ''))
@@ -1,2 +1,2 @@
-from .course_schema import course_retrieve_view_schema
+from .course_schema import course_retrieve_view_schema, course_retrieve_job_view_schema
 from .plan_schema import plan_revoke_view_schema, plan_list_create_view_schema, plan_retrieve_shared_view_schema, plan_detail_view_schema
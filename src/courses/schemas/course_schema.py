@@ -1,42 +1,113 @@
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
-from src.courses.serializers import CourseOutputSerializer
-from src.utill.general_schemas import BAD_REQUEST, TOO_MANY_REQUESTS
-from src.utill.serializers import GolestanRequestSerializer
+from src.courses.serializers import CourseModelSerializer, CourseRetrieveJobSerializer, CourseRetrieveRequestSerializer
+from src.utill.general_schemas import BAD_REQUEST, NOT_FOUND, TOO_MANY_REQUESTS
 
 
 course_retrieve_view_description = """
-This endpoint retrieves a list of courses from Golestan using the provided student credentials.
+This endpoint returns the list of offered courses, crawled from Golestan using the provided student credentials.
 
 ### 🔑 Expected Flow:
 1. **POST Request**: The client sends a payload with:
    - `student_id`: The student's ID.
    - `password`: The student's password.
-2. The backend uses a crawler to log in to Golestan and fetch raw course data.
-3. Raw data is cleaned using a dedicated cleaner (e.g., `CrawlerRawDataCleaner`).
-4. Cleaned data is bulk saved/updated in the database.
-5. The endpoint returns a JSON object with a `courses` key. If no courses are found, an empty list is returned.
+   - `force_refresh` (optional, default `false`): crawl Golestan even when the saved catalog is fresh.
+2. While the catalog saved from Golestan is younger than `COURSE_CATALOG_TTL`, it is returned from the database right away
+   with **200 OK**: `{"courses": [...], "refreshed_at": ...}`.
+3. Otherwise the backend stores a crawl job (the password encrypted) and answers **202 Accepted** with its `job_id` right away.
+4. A crawl worker (`manage.py run_crawl_worker`) claims the job, wipes the stored password, logs in to Golestan and fetches raw course data.
+5. Raw data is cleaned using a dedicated cleaner (e.g., `CrawlerRawDataCleaner`) and bulk saved/updated in the database.
+6. The client polls `GET /course-scheduler/courses/jobs/{job_id}/` until `status` is `succeeded` (with `courses`) or `failed` (with `detail`).
 
 ### ⚙️ Security and Error Considerations:
-- Invalid credentials or other validation issues yield a **400 Bad Request**.
-- Any unexpected error from the crawler is mapped to a **500 Internal Server Error**.
-- The endpoint may be rate-limited, returning **429 Too Many Requests** if exceeded.
+- Missing fields yield a **400 Bad Request**; invalid credentials fail the job with a `detail` message.
+- The endpoint may be rate-limited, returning **429 Too Many Requests** if exceeded; it is also answered 429, with a
+  `Retry-After` header, while `CRAWL_JOB_QUEUE_SIZE` crawl jobs are already pending.
 """
 
 course_retrieve_view_schema = extend_schema(
     summary="Retrieve Courses from Golestan",
     description=course_retrieve_view_description,
-    request=GolestanRequestSerializer,
+    request=CourseRetrieveRequestSerializer,
     responses={
         200: OpenApiResponse(
-            response=CourseOutputSerializer,
-            description=(
-                "Courses retrieved successfully. "
-                "If no courses are found, the response will be `{'courses': []}`."
-            ),
+            response=CourseModelSerializer(many=True),
+            description="The saved catalog is fresh and is returned as is, with the time it was crawled.",
             examples=[
                 OpenApiExample(
-                    name="Successful Response",
+                    name="Fresh Catalog",
                     value={
+                        "courses": [
+                            {
+                                "course_code": "1212317_01",
+                                "course_name": "فارسي عمومي",
+                                "theory": "3",
+                                "practical": "0",
+                                "capacity": 50,
+                                "gender": "B",
+                                "professor_name": "حسين پورجيرهنده مرجان",
+                                "class_location": "ادبيات و علوم انساني _ 15 - طبقه اول - ادبيات",
+                                "prerequisites": "1212318 زبان فارسي",
+                                "notes": "",
+                                "classes": [{"day": "sun", "start": 10, "end": 12, "is_problem_solving": False}],
+                                "exam": {"date": "1404.03.26", "start": 10, "end": 12}
+                            }
+                        ],
+                        "refreshed_at": "2025-04-10T08:30:24Z",
+                    },
+                    response_only=True,
+                ),
+            ],
+        ),
+        202: OpenApiResponse(
+            description="The catalog is stale or a refresh was forced: the crawl is queued; poll the job endpoint with `job_id`.",
+            examples=[
+                OpenApiExample(
+                    name="Queued",
+                    value={"detail": "course retrieval has been queued", "job_id": "3f0a8f4e-5b7c-4d7e-9f61-2a1c5b7d9e10"},
+                    response_only=True,
+                ),
+            ],
+        ),
+        400: BAD_REQUEST,
+        429: TOO_MANY_REQUESTS,
+    },
+)
+
+course_retrieve_job_view_schema = extend_schema(
+    summary="Course Retrieval Job",
+    description=(
+        "Progress of a queued course retrieval. `status` is one of `pending`, `running`, `succeeded` or `failed`, "
+        "and `stage` one of `queued`, `crawling`, `saving` or `done`. `courses` is set once the job has succeeded; "
+        "a failed job has its reason in `detail`, and in `errors` when the crawled rows were invalid. "
+        "A job queued by a signed-in user is only found with that user's credentials; for a job queued "
+        "anonymously, its unguessable UUID is the only access check."
+    ),
+    responses={
+        200: OpenApiResponse(
+            response=CourseRetrieveJobSerializer,
+            examples=[
+                OpenApiExample(
+                    name="Running",
+                    value={
+                        "job_id": "3f0a8f4e-5b7c-4d7e-9f61-2a1c5b7d9e10",
+                        "status": "running",
+                        "stage": "crawling",
+                        "detail": "",
+                        "courses": None,
+                        "errors": None,
+                        "created_at": "2025-04-10T08:30:00Z",
+                        "started_at": "2025-04-10T08:30:01Z",
+                        "finished_at": None,
+                    },
+                    response_only=True,
+                ),
+                OpenApiExample(
+                    name="Succeeded",
+                    value={
+                        "job_id": "3f0a8f4e-5b7c-4d7e-9f61-2a1c5b7d9e10",
+                        "status": "succeeded",
+                        "stage": "done",
+                        "detail": "",
                         "courses": [
                             {
                                 "id": 121231701,
@@ -60,28 +131,31 @@ course_retrieve_view_schema = extend_schema(
                                     "end": 12
                                 }
                             }
-                        ]
+                        ],
+                        "errors": None,
+                        "created_at": "2025-04-10T08:30:00Z",
+                        "started_at": "2025-04-10T08:30:01Z",
+                        "finished_at": "2025-04-10T08:30:24Z",
                     },
                     response_only=True,
                 ),
                 OpenApiExample(
-                    name="Empty Response",
-                    value={"courses": []},
-                    response_only=True,
-                )
-            ],
-        ),
-        400: BAD_REQUEST,
-        429: TOO_MANY_REQUESTS,
-        500: OpenApiResponse(
-            description="Internal server error.",
-            examples=[
-                OpenApiExample(
-                    name="Internal Server Error",
-                    value={"detail": "internal server error"},
+                    name="Failed",
+                    value={
+                        "job_id": "3f0a8f4e-5b7c-4d7e-9f61-2a1c5b7d9e10",
+                        "status": "failed",
+                        "stage": "done",
+                        "detail": "username or password is incorrect",
+                        "courses": None,
+                        "errors": None,
+                        "created_at": "2025-04-10T08:30:00Z",
+                        "started_at": "2025-04-10T08:30:01Z",
+                        "finished_at": "2025-04-10T08:30:09Z",
+                    },
                     response_only=True,
-                )
+                ),
             ],
         ),
+        404: NOT_FOUND,
     },
 )
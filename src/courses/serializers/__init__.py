@@ -2,3 +2,5 @@ from .class_session_serializer import ClassSessionSerializer
 from .exam_serializer import ExamSerializer
 from .coures_serializer import CourseModelSerializer, CourseOutputSerializer
 from .plan_serializer import PlanUpdateSerializer, PlanCreateSerializer, PlanRetrieveSerializer, PlanRevokeSerializer
+from .crawl_job_serializer import CourseRetrieveJobSerializer
+from .course_retrieve_serializer import CourseRetrieveRequestSerializer
@@ -0,0 +1,6 @@
+from rest_framework import serializers
+from src.utill.serializers import GolestanRequestSerializer
+
+
+class CourseRetrieveRequestSerializer(GolestanRequestSerializer):
+    force_refresh = serializers.BooleanField(default=False, help_text="crawl Golestan even if the catalog is fresh")
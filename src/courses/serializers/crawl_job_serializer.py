@@ -0,0 +1,23 @@
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+from src.crawlers.models import CrawlJob
+from .coures_serializer import CourseModelSerializer
+
+
+class CourseRetrieveJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source='id', read_only=True)
+    detail = serializers.CharField(source='error', read_only=True)
+    courses = serializers.SerializerMethodField()
+    errors = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CrawlJob
+        fields = ['job_id', 'status', 'stage', 'detail', 'courses', 'errors', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+    @extend_schema_field(CourseModelSerializer(many=True, allow_null=True))
+    def get_courses(self, obj):
+        return (obj.result or {}).get('courses')
+
+    def get_errors(self, obj) -> dict:
+        return (obj.result or {}).get('errors')
@@ -1,3 +1,5 @@
+from .catalog_service import record_catalog_refresh, catalog_refreshed_at, catalog_is_fresh, catalog_courses
 from .course_service import bulk_save_courses
 from .class_session_service import bulk_save_class_sessions
 from .exam_service import bulk_save_exams
+from .course_retrieve_service import save_golestan_courses, run_course_retrieve_job
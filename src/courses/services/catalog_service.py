@@ -0,0 +1,27 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from src.courses.models import CatalogRefresh, Course
+
+
+def record_catalog_refresh(course_count):
+    return CatalogRefresh.objects.create(courses=course_count)
+
+
+def catalog_refreshed_at():
+    """ When the catalog was last saved from Golestan, or None if it never was. """
+    return CatalogRefresh.objects.values_list('refreshed_at', flat=True).first()
+
+
+def catalog_is_fresh(refreshed_at):
+    """ Whether a catalog saved at refreshed_at (see catalog_refreshed_at) is younger than COURSE_CATALOG_TTL seconds. """
+    return refreshed_at is not None and timezone.now() - refreshed_at < timedelta(seconds=settings.COURSE_CATALOG_TTL)
+
+
+def catalog_courses():
+    """ The courses of the latest catalog refresh; older courses that dropped out of report 212 are left out. """
+    latest = CatalogRefresh.objects.values('id')[:1]
+    return (
+        Course.objects.filter(catalog_refresh=latest)
+        .prefetch_related('classes').select_related('exam').order_by('id')
+    )
@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from src.utill.cleaners import CrawlerRawDataCleaner
+from src.courses.models import Course
+from src.courses.serializers import CourseModelSerializer, CourseOutputSerializer
+from src.crawlers import fetch_student_courses
+from src.crawlers.crawl_timing import CrawlTrace
+from src.crawlers.models import CrawlJobStage
+from src.crawlers.services import CrawlJobFailed, set_crawl_job_stage
+from .course_service import bulk_save_courses
+from .class_session_service import bulk_save_class_sessions
+from .exam_service import bulk_save_exams
+
+
+def save_golestan_courses(raw_courses):
+    """
+    Clean and validate crawled course rows and upsert them with their sessions and exams.
+    Returns (courses, errors) with the saved courses as a queryset; nothing is saved when a row is invalid.
+    """
+    cleaner = CrawlerRawDataCleaner()
+    cleaned_data_list = [cleaner.clean(course_data) for course_data in raw_courses]
+    serialized_courses = CourseOutputSerializer(data=cleaned_data_list, many=True)
+
+    if not serialized_courses.is_valid():
+        return None, serialized_courses.errors
+
+    with transaction.atomic():
+        saved_courses = bulk_save_courses(cleaned_data_list)
+        course_map = {c.id: c for c in saved_courses}
+        bulk_save_class_sessions(course_map, cleaned_data_list)
+        bulk_save_exams(cleaned_data_list, course_map)
+
+    courses = Course.objects.filter(id__in=course_map).prefetch_related('classes').select_related('exam')
+    return courses.order_by('id'), None
+
+
+def run_course_retrieve_job(job, student_id, password):
+    """ Crawl job handler: fetch the 212 report of a student and save its courses, traced under the job id. """
+    trace = CrawlTrace("course_retrieve_job", trace_id=job.id)
+    try:
+        raw_courses = fetch_student_courses(student_id, password, trace)
+        set_crawl_job_stage(job, CrawlJobStage.SAVING)
+
+        with trace.span('save'):
+            courses, errors = save_golestan_courses(raw_courses)
+    finally:
+        trace.finish()
+    if errors:
+        raise CrawlJobFailed(_("invalid course data"), result={"errors": errors})
+
+    return {"courses": CourseModelSerializer(courses, many=True).data}
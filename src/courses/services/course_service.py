@@ -1,11 +1,13 @@
 from django.db import transaction
 from src.courses.models import Course
+from .catalog_service import record_catalog_refresh
 
 
 def bulk_save_courses(cleaned_courses):
     """
-    Bulk update or create courses efficiently.
-    Assumes each cleaned course dict has an "id" key.
+    Bulk update or create courses efficiently, and record the refresh of the catalog.
+    The courses are the whole catalog: each one is tied to the refresh, and courses left out are no longer
+    served by catalog_courses(). Assumes each cleaned course dict has an "id" key.
     """
     course_ids = [data["id"] for data in cleaned_courses]
     existing_courses = Course.objects.filter(id__in=course_ids)
@@ -36,6 +38,10 @@ def bulk_save_courses(cleaned_courses):
             courses_to_create.append(Course(**course_data))
 
     with transaction.atomic():
+        refresh = record_catalog_refresh(len(cleaned_courses)) if cleaned_courses else None
+        for course in courses_to_create + courses_to_update:
+            course.catalog_refresh = refresh
+
         if courses_to_create:
             Course.objects.bulk_create(courses_to_create)
         if courses_to_update:
@@ -43,7 +49,7 @@ def bulk_save_courses(cleaned_courses):
                 courses_to_update,
                 [
                     "course_name", "theory", "practical", "capacity",
-                    "gender", "professor_name", "class_location", "prerequisites", "notes"
+                    "gender", "professor_name", "class_location", "prerequisites", "notes", "catalog_refresh"
                 ]
             )
 
@@ -0,0 +1,107 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APIClient
+from src.courses.models import CatalogRefresh, Course
+from src.courses.services import bulk_save_courses, catalog_courses, catalog_is_fresh, catalog_refreshed_at
+from src.crawlers.models import CrawlJob
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.defaults['HTTP_ACCEPT_LANGUAGE'] = 'en'
+    return client
+
+
+@pytest.fixture
+def valid_data():
+    return {
+        "student_id": "student123",
+        "password": "password123"
+    }
+
+
+@pytest.fixture
+def cleaned_course():
+    return {
+        "id": 1212317,
+        "course_code": "1212317_01",
+        "course_name": "فارسي عمومي",
+        "theory": "3",
+        "practical": "0",
+        "capacity": 50,
+        "gender": "B",
+        "professor_name": "حسين پورجيرهنده مرجان",
+        "class_location": "ادبيات",
+        "prerequisites": "",
+        "notes": "",
+    }
+
+
+@pytest.mark.django_db
+class TestCourseCatalog:
+
+    endpoint = "/course-scheduler/courses/"
+
+    def test_bulk_save_records_refresh(self, cleaned_course):
+        """
+                Test that saving crawled courses records when the catalog was refreshed.
+        """
+        assert catalog_refreshed_at() is None
+
+        bulk_save_courses([cleaned_course])
+
+        refresh = CatalogRefresh.objects.get()
+        assert refresh.courses == 1
+        assert catalog_refreshed_at() == refresh.refreshed_at
+        assert catalog_is_fresh(refresh.refreshed_at)
+
+    def test_fresh_catalog_is_served_from_database(self, client, valid_data, cleaned_course):
+        """
+                Test that a fresh catalog is returned right away without queueing a crawl.
+        """
+        bulk_save_courses([cleaned_course])
+
+        response = client.post(self.endpoint, valid_data, format='json')
+
+        assert response.status_code == 200
+        assert [course["course_code"] for course in response.data["courses"]] == ["1212317_01"]
+        assert response.data["refreshed_at"] == catalog_refreshed_at()
+        assert not CrawlJob.objects.exists()
+
+    def test_courses_left_out_of_a_refresh_are_not_served(self, cleaned_course):
+        """
+                Test that only the courses of the latest refresh make up the catalog.
+        """
+        dropped = {**cleaned_course, "id": 1212318, "course_code": "1212318_01"}
+        bulk_save_courses([cleaned_course, dropped])
+
+        bulk_save_courses([cleaned_course])
+
+        assert Course.objects.count() == 2
+        assert [course.course_code for course in catalog_courses()] == ["1212317_01"]
+
+    def test_stale_catalog_queues_a_crawl(self, client, valid_data, cleaned_course, settings):
+        """
+                Test that a catalog older than COURSE_CATALOG_TTL is crawled again.
+        """
+        bulk_save_courses([cleaned_course])
+        CatalogRefresh.objects.update(refreshed_at=timezone.now() - timedelta(seconds=settings.COURSE_CATALOG_TTL + 1))
+
+        response = client.post(self.endpoint, valid_data, format='json')
+
+        assert response.status_code == 202
+        assert CrawlJob.objects.filter(id=response.data["job_id"]).exists()
+
+    def test_force_refresh_queues_a_crawl(self, client, valid_data, cleaned_course):
+        """
+                Test that force_refresh bypasses a fresh catalog.
+        """
+        bulk_save_courses([cleaned_course])
+
+        response = client.post(self.endpoint, {**valid_data, "force_refresh": True}, format='json')
+
+        assert response.status_code == 202
+        assert Course.objects.count() == 1
+        assert CrawlJob.objects.count() == 1
@@ -36,8 +36,9 @@ class TestCoursesRetrieve:
         }
 
         response = client.post(self.endpoint, invalid_data, format='json')
-        assert response.status_code == 500 or 400
+        assert response.status_code == 202
         assert "detail" in response.data
+        assert "job_id" in response.data
 
     @pytest.mark.django_db
     def test_course_retrieve_wrong_data(self, client, valid_data, mocker):
@@ -56,4 +57,4 @@ class TestCoursesRetrieve:
         mocker.patch('src.courses.services.class_session_service.bulk_save_class_sessions')
         mocker.patch('src.courses.services.exam_service.bulk_save_exams')
         response = client.post(self.endpoint, valid_data, format='json')
-        assert response.status_code == 500 or 400
+        assert response.status_code == 202
@@ -0,0 +1,134 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from src.crawlers.fake_golestan import report_row
+from src.crawlers.golestan_pages import course_from_row
+from src.crawlers.models import CrawlJob, CrawlJobStatus
+from src.crawlers.services import claim_crawl_job, run_crawl_job
+
+
+@pytest.fixture
+def client():
+    client = APIClient()
+    client.defaults['HTTP_ACCEPT_LANGUAGE'] = 'en'
+    return client
+
+
+@pytest.fixture
+def valid_data():
+    return {
+        "student_id": "student123",
+        "password": "password123"
+    }
+
+
+@pytest.mark.django_db
+class TestCourseRetrieveJob:
+
+    endpoint = "/course-scheduler/courses/"
+
+    def job_endpoint(self, job_id):
+        return f"/course-scheduler/courses/jobs/{job_id}/"
+
+    def test_post_queues_a_job(self, client, valid_data):
+        """
+                Test that posting credentials queues a pending job without storing the password in clear.
+        """
+        response = client.post(self.endpoint, valid_data, format='json')
+
+        assert response.status_code == 202
+        job = CrawlJob.objects.get(id=response.data["job_id"])
+        assert job.status == CrawlJobStatus.PENDING
+        assert job.student_id == "student123"
+        assert b"password123" not in bytes(job.encrypted_password)
+
+        response = client.get(self.job_endpoint(job.id))
+        assert response.status_code == 200
+        assert response.data["status"] == "pending"
+        assert response.data["stage"] == "queued"
+        assert response.data["courses"] is None
+
+    def test_succeeded_job_reports_courses(self, client, valid_data, mocker):
+        """
+                Test that a job run by a worker reports the saved course list.
+        """
+        fetch = mocker.patch('src.courses.services.course_retrieve_service.fetch_student_courses', return_value=[])
+        job_id = client.post(self.endpoint, valid_data, format='json').data["job_id"]
+
+        run_crawl_job(*claim_crawl_job())
+
+        fetch.assert_called_once_with("student123", "password123", mocker.ANY)
+        response = client.get(self.job_endpoint(job_id))
+        assert response.data["status"] == "succeeded"
+        assert response.data["stage"] == "done"
+        assert response.data["courses"] == []
+
+    def test_job_courses_have_the_shape_of_fresh_courses(self, client, valid_data, mocker):
+        """
+                Test that a crawled course list and the one served while the catalog is fresh are the same.
+        """
+        rows = [course_from_row(list(report_row(index))) for index in range(3)]
+        mocker.patch('src.courses.services.course_retrieve_service.fetch_student_courses', return_value=rows)
+        job_id = client.post(self.endpoint, valid_data, format='json').data["job_id"]
+        run_crawl_job(*claim_crawl_job())
+
+        crawled = client.get(self.job_endpoint(job_id)).data["courses"]
+        fresh = client.post(self.endpoint, valid_data, format='json')
+
+        assert fresh.status_code == 200
+        assert len(crawled) == 3
+        assert crawled == fresh.data["courses"]
+
+    def test_failed_job_reports_detail(self, client, valid_data, mocker):
+        """
+                Test that wrong credentials fail the job with the crawler's message.
+        """
+        mocker.patch(
+            'src.courses.services.course_retrieve_service.fetch_student_courses',
+            side_effect=ValueError("username or password is incorrect"),
+        )
+        job_id = client.post(self.endpoint, valid_data, format='json').data["job_id"]
+
+        run_crawl_job(*claim_crawl_job())
+
+        response = client.get(self.job_endpoint(job_id))
+        assert response.data["status"] == "failed"
+        assert response.data["detail"] == "username or password is incorrect"
+
+    def test_job_of_a_user_is_hidden_from_others(self, client, valid_data):
+        """
+                Test that a job queued by a signed-in user is only found by that user.
+        """
+        owner, other = (
+            get_user_model().objects.create_user(username=name, email=f"{name}@test.com", password="pass")
+            for name in ("owner", "other")
+        )
+        client.force_authenticate(owner)
+        job_id = client.post(self.endpoint, valid_data, format='json').data["job_id"]
+
+        assert client.get(self.job_endpoint(job_id)).status_code == 200
+        client.force_authenticate(other)
+        assert client.get(self.job_endpoint(job_id)).status_code == 404
+        client.force_authenticate(None)
+        assert client.get(self.job_endpoint(job_id)).status_code == 404
+
+    def test_unknown_job(self, client):
+        """
+                Test that an unknown job id is not found.
+        """
+        response = client.get(self.job_endpoint("3f0a8f4e-5b7c-4d7e-9f61-2a1c5b7d9e10"))
+        assert response.status_code == 404
+
+    def test_full_job_queue_is_throttled(self, client, valid_data, settings):
+        """
+                Test that a post is answered 429 with Retry-After once the job queue is full.
+        """
+        settings.CRAWL_JOB_QUEUE_SIZE = 1
+        settings.CRAWLER_RETRY_AFTER = 30
+        assert client.post(self.endpoint, valid_data, format='json').status_code == 202
+
+        response = client.post(self.endpoint, valid_data, format='json')
+
+        assert response.status_code == 429
+        assert response["Retry-After"] == "30"
+        assert CrawlJob.objects.count() == 1
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import CourseRetrieveView, PlanListCreateView, PlanDetailView, PlanRetrieveView, PlanRevokeAPIView
+from .views import CourseRetrieveView, CourseRetrieveJobView, PlanListCreateView, PlanDetailView, PlanRetrieveView, PlanRevokeAPIView
 
 
 urlpatterns = [
+    path('courses/jobs/<uuid:pk>/', CourseRetrieveJobView.as_view(), name='course-retrieve-job'),
     path('courses/', CourseRetrieveView.as_view(), name='retrieve-courses-from-golestan'),
     path('plans/<int:pk>/revoke/', PlanRevokeAPIView.as_view(), name='plan-link-rovoke'),
     path('plans/<int:pk>/', PlanDetailView.as_view(), name='plan-detail'),
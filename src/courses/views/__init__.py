@@ -1,2 +1,2 @@
-from .course_view import CourseRetrieveView
+from .course_view import CourseRetrieveView, CourseRetrieveJobView
 from .plan_view import PlanDetailView, PlanListCreateView, PlanRetrieveView, PlanRevokeAPIView
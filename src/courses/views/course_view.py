@@ -1,51 +1,57 @@
-from django.db import transaction
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
-from rest_framework.generics import GenericAPIView
+from rest_framework.generics import GenericAPIView, RetrieveAPIView
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 
-from src.utill.serializers import GolestanRequestSerializer
-from src.utill.cleaners import CrawlerRawDataCleaner
-from src.courses.serializers import CourseOutputSerializer
-from src.crawlers import CourseRetrieveCrawler
-from src.courses.services import bulk_save_courses, bulk_save_class_sessions, bulk_save_exams
-from src.courses.schemas import course_retrieve_view_schema
+from src.courses.serializers import CourseModelSerializer, CourseRetrieveJobSerializer, CourseRetrieveRequestSerializer
+from src.courses.services import catalog_courses, catalog_is_fresh, catalog_refreshed_at
+from src.crawlers import CrawlerBusy
+from src.crawlers.models import CrawlJob, CrawlJobKind
+from src.crawlers.services import enqueue_crawl_job
+from src.courses.schemas import course_retrieve_view_schema, course_retrieve_job_view_schema
 
 
 @course_retrieve_view_schema
 class CourseRetrieveView(GenericAPIView):
     """
-    Get student courses list from Golestan.
+    Get the courses list from the database while it is fresh, or queue a crawl of it from Golestan.
     """
-    serializer_class = GolestanRequestSerializer
+    serializer_class = CourseRetrieveRequestSerializer
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data['student_id']
         password = serializer.validated_data['password']
-        crawler = CourseRetrieveCrawler()
+
+        refreshed_at = catalog_refreshed_at()
+        if not serializer.validated_data['force_refresh'] and catalog_is_fresh(refreshed_at):
+            courses = CourseModelSerializer(catalog_courses(), many=True).data
+            return Response({"courses": courses, "refreshed_at": refreshed_at}, status=status.HTTP_200_OK)
 
         try:
-            courses = crawler.fetch_student_courses(username, password)
-        except ValueError as e:
-            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            return Response({"detail": _("internal server error")}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        finally:
-            crawler.close()
-
-        cleaner = CrawlerRawDataCleaner()
-        cleaned_data_list = [cleaner.clean(course_data) for course_data in courses]
-        serialized_courses = CourseOutputSerializer(data=cleaned_data_list, many=True)
-
-        if serialized_courses.is_valid():
-            with transaction.atomic():
-                saved_courses = bulk_save_courses(cleaned_data_list)
-                course_map = {c.id: c for c in saved_courses}
-                bulk_save_class_sessions(course_map, cleaned_data_list)
-                bulk_save_exams(cleaned_data_list, course_map)
-
-            return Response({"courses": serialized_courses.validated_data}, status=status.HTTP_200_OK)
-
-        return Response({"errors": serialized_courses.errors}, status=status.HTTP_400_BAD_REQUEST)
+            job = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, username, password, user=request.user)
+        except CrawlerBusy as e:
+            raise Throttled(wait=e.retry_after, detail=str(_("too many course retrievals are waiting, try again later")))
+
+        return Response(
+            {"detail": _("course retrieval has been queued"), "job_id": job.id},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+@course_retrieve_job_view_schema
+class CourseRetrieveJobView(RetrieveAPIView):
+    """
+    Progress of a queued course retrieval, with the course list once it has succeeded.
+    A job queued by a signed-in user is only shown to that user; an anonymous job to anyone holding its id.
+    """
+    serializer_class = CourseRetrieveJobSerializer
+
+    def get_queryset(self):
+        owners = Q(requested_by__isnull=True)
+        if self.request.user.is_authenticated:
+            owners |= Q(requested_by=self.request.user)
+        return CrawlJob.objects.filter(owners, kind=CrawlJobKind.COURSE_RETRIEVE)
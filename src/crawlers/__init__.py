@@ -1,2 +1,7 @@
 from .course_retrieve_crawler import CourseRetrieveCrawler
 from .student_validator_crawler import StudentValidatorCrawler
+from .async_course_retrieve_crawler import AsyncCourseRetrieveCrawler
+from .async_student_validator_crawler import AsyncStudentValidatorCrawler
+from .http_course_retrieve_crawler import HttpCourseRetrieveCrawler
+from .admission import CrawlerBusy
+from .engine import fetch_student_courses, fetch_student_info
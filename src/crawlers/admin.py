@@ -0,0 +1,46 @@
+from django.contrib import admin
+from .models import CaptchaAttempt, CrawlJob, CrawlSpan
+
+
+@admin.register(CaptchaAttempt)
+class CaptchaAttemptAdmin(admin.ModelAdmin):
+    list_display = ('id', 'predicted_text', 'verdict', 'confidence', 'latency_ms', 'from_cache', 'created_at')
+    list_filter = ('verdict', 'from_cache', 'created_at')
+    search_fields = ('predicted_text', 'login_id')
+    ordering = ('-created_at',)
+    exclude = ('image',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CrawlJob)
+class CrawlJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'student_id', 'status', 'stage', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('kind', 'status', 'stage', 'created_at')
+    search_fields = ('id', 'student_id')
+    ordering = ('-created_at',)
+    exclude = ('encrypted_password',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CrawlSpan)
+class CrawlSpanAdmin(admin.ModelAdmin):
+    list_display = ('id', 'crawler', 'stage', 'duration_ms', 'failed', 'created_at')
+    list_filter = ('crawler', 'stage', 'failed', 'created_at')
+    search_fields = ('trace_id',)
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
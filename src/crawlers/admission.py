@@ -0,0 +1,126 @@
+import fcntl
+import os
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+from django.conf import settings
+
+
+# seconds between two looks for a free slot
+SLOT_POLL_INTERVAL = 0.1
+
+SLOT = "slot"
+QUEUE = "queue"
+
+
+class CrawlerBusy(Exception):
+    """ The crawlers can't take more work now; the client should retry after `retry_after` seconds. """
+
+    def __init__(self, retry_after):
+        super().__init__(f"the crawlers are busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _lock_paths(kind, count, suffix="lock"):
+    os.makedirs(settings.CRAWLER_SLOT_DIR, exist_ok=True)
+    return [os.path.join(settings.CRAWLER_SLOT_DIR, f"{kind}-{index}.{suffix}") for index in range(count)]
+
+
+def _take(path):
+    """ An open descriptor holding the lock of path, or None when another process or thread holds it. """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _take_any(kind, count):
+    """
+    Descriptors holding a free lock of `kind` and a shared lock on its .busy marker, or None when all are held.
+    slot_usage() only probes the markers, so it never makes a lock look taken to a crawl looking for one.
+    """
+    for path, busy_path in zip(_lock_paths(kind, count), _lock_paths(kind, count, "busy")):
+        fd = _take(path)
+        if fd is not None:
+            busy = os.open(busy_path, os.O_RDWR | os.O_CREAT, 0o600)
+            # blocks only for the instant slot_usage() is probing this marker
+            fcntl.flock(busy, fcntl.LOCK_SH)
+            return fd, busy
+    return None
+
+
+def _release(held):
+    # closing the descriptors drops the locks; so does the death of their process
+    for fd in held:
+        os.close(fd)
+
+
+def _held(kind, count):
+    held = 0
+    for busy_path in _lock_paths(kind, count, "busy"):
+        fd = _take(busy_path)
+        if fd is None:
+            held += 1
+        else:
+            os.close(fd)
+    return held
+
+
+def _record_wait(stage, seconds, rejected):
+    from src.crawlers.services import record_crawl_spans
+    record_crawl_spans(uuid4(), "admission", [{"stage": stage, "duration_ms": seconds * 1000, "failed": rejected}])
+
+
+@contextmanager
+def crawl_slot(wait=None, queue=True):
+    """
+    Hold one of the CRAWLER_MAX_CONCURRENT_CRAWLS browser crawl slots while the block runs.
+    Slots are flock()ed files of CRAWLER_SLOT_DIR, so they are shared by every process using that directory
+    (containers too, when it is a volume they mount) and released when one dies.
+    With `queue`, waiting takes one of CRAWLER_SLOT_QUEUE_SIZE queue places first, and CrawlerBusy is raised at
+    once when none is free; it is also raised when no slot came free within `wait` seconds (None waits for good).
+    Every wait is recorded as a 'slot_wait' span of the 'admission' crawler, rejections as failed ones.
+    """
+    start = time.monotonic()
+    slot = _take_any(SLOT, settings.CRAWLER_MAX_CONCURRENT_CRAWLS)
+    place = None
+
+    try:
+        if slot is None and queue:
+            place = _take_any(QUEUE, settings.CRAWLER_SLOT_QUEUE_SIZE)
+            if place is None:
+                raise CrawlerBusy(settings.CRAWLER_RETRY_AFTER)
+
+        while slot is None:
+            if wait is not None and time.monotonic() - start >= wait:
+                raise CrawlerBusy(settings.CRAWLER_RETRY_AFTER)
+            time.sleep(SLOT_POLL_INTERVAL)
+            slot = _take_any(SLOT, settings.CRAWLER_MAX_CONCURRENT_CRAWLS)
+    except CrawlerBusy:
+        _record_wait("slot_wait", time.monotonic() - start, rejected=True)
+        raise
+    finally:
+        if place is not None:
+            _release(place)
+
+    _record_wait("slot_wait", time.monotonic() - start, rejected=False)
+    try:
+        yield
+    finally:
+        _release(slot)
+
+
+def slot_usage():
+    """
+    Busy crawl slots and queue places sharing CRAWLER_SLOT_DIR. Only the .busy markers are probed, so a crawl taking
+    a slot at that moment is at most held up for the probe's instant, never turned away.
+    """
+    return {
+        "slots": settings.CRAWLER_MAX_CONCURRENT_CRAWLS,
+        "busy_slots": _held(SLOT, settings.CRAWLER_MAX_CONCURRENT_CRAWLS),
+        "queue_size": settings.CRAWLER_SLOT_QUEUE_SIZE,
+        "waiting": _held(QUEUE, settings.CRAWLER_SLOT_QUEUE_SIZE),
+    }
@@ -0,0 +1,27 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CrawlersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'src.crawlers'
+
+    def ready(self):
+        from django.core.signals import request_finished
+        from src.crawlers.browser_pool import close_request_browser_pool
+        from src.crawlers.captcha_solver.model import captcha_model
+
+        request_finished.connect(close_request_browser_pool, dispatch_uid='close_request_browser_pool')
+
+        if getattr(settings, 'CAPTCHA_MODEL_PATH', None):
+            captcha_model.path = settings.CAPTCHA_MODEL_PATH
+
+    def warm_up_captcha_solver(self):
+        """
+        Load the captcha classifier before the first login needs it, when CAPTCHA_SOLVER_WARM_UP is set.
+        Called by the processes that serve logins (wsgi, asgi and run_crawl_worker), not by every manage.py command.
+        """
+        from src.crawlers.captcha_solver.model import captcha_model
+
+        if getattr(settings, 'CAPTCHA_SOLVER_WARM_UP', False):
+            captcha_model.warm_up()
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import weakref
+from django.conf import settings
+from playwright.async_api import async_playwright
+from src.crawlers.browser_pool import PooledBrowser
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBrowserPool:
+    """
+    The asyncio counterpart of BrowserPool: warm Chromium instances shared by concurrent crawls
+    on one event loop. Each browser serves up to `contexts_per_browser` isolated contexts at once,
+    so a single process can run `max_size * contexts_per_browser` logins concurrently; further
+    acquirers wait for a slot instead of failing.
+    """
+
+    def __init__(self, max_size=2, contexts_per_browser=8, max_jobs=50, launch_options=None):
+        self.max_size = max_size
+        self.contexts_per_browser = contexts_per_browser
+        self.max_jobs = max_jobs
+        self.launch_options = launch_options or {"headless": True}
+        self._playwright = None
+        self._browsers = []
+        self._leased = {}
+        self._active = {}
+        self._launching = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def size(self):
+        return len(self._browsers) + self._launching
+
+    async def acquire(self, **context_options):
+        """ Return a new BrowserContext on a warm browser, waiting while every slot is taken. """
+        pooled = await self._take_browser()
+        try:
+            context = await pooled.browser.new_context(**context_options)
+        except Exception:
+            await self._give_back(pooled, retire=True)
+            raise
+
+        self._leased[context] = pooled
+        return context
+
+    async def release(self, context):
+        """ Close a context and free its slot, retiring the browser once it has served max_jobs. """
+        pooled = self._leased.pop(context, None)
+
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+        if pooled is not None:
+            await self._give_back(pooled)
+
+    async def close(self):
+        for context in list(self._leased):
+            await self.release(context)
+        for pooled in list(self._browsers):
+            await self._discard(pooled)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _take_browser(self):
+        async with self._condition:
+            while True:
+                for pooled in list(self._browsers):
+                    if not pooled.browser.is_connected():
+                        await self._discard(pooled)
+                        continue
+                    if pooled.jobs < self.max_jobs and self._active[pooled] < self.contexts_per_browser:
+                        pooled.jobs += 1
+                        self._active[pooled] += 1
+                        return pooled
+
+                if self.size < self.max_size:
+                    self._launching += 1
+                    break
+
+                await self._condition.wait()
+
+        try:
+            pooled = await self._launch()
+        finally:
+            async with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+
+        async with self._condition:
+            pooled.jobs += 1
+            self._browsers.append(pooled)
+            self._active[pooled] = 1
+        return pooled
+
+    async def _launch(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        logger.info("launching pooled chromium (%d/%d)", self.size, self.max_size)
+        return PooledBrowser(await self._playwright.chromium.launch(**self.launch_options))
+
+    async def _give_back(self, pooled, retire=False):
+        async with self._condition:
+            self._active[pooled] = self._active.get(pooled, 1) - 1
+            exhausted = pooled.jobs >= self.max_jobs or not pooled.browser.is_connected()
+            if (retire or exhausted) and self._active[pooled] == 0:
+                await self._discard(pooled)
+            self._condition.notify_all()
+
+    async def _discard(self, pooled):
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        self._active.pop(pooled, None)
+        try:
+            await pooled.browser.close()
+        except Exception:
+            pass
+
+
+_pools = weakref.WeakKeyDictionary()
+
+
+def get_async_browser_pool():
+    """ The browser pool of the running event loop; Playwright objects can't cross event loops. """
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = AsyncBrowserPool(
+            max_size=settings.CRAWLER_ASYNC_BROWSER_POOL_SIZE,
+            contexts_per_browser=settings.CRAWLER_ASYNC_CONTEXTS_PER_BROWSER,
+            max_jobs=settings.CRAWLER_BROWSER_MAX_JOBS,
+        )
+        _pools[loop] = pool
+    return pool
@@ -0,0 +1,81 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from .async_golestan_base_crawler import AsyncGolestanBaseCrawler
+from .golestan_pages import (
+    MENU_CLICK_WAITS, REPORT_TABLE_SCRIPT, course_from_row, report_columns, report_header, step_timeout,
+)
+
+
+class AsyncCourseRetrieveCrawler(AsyncGolestanBaseCrawler):
+    async def __search_courses(self):
+        """ Search for available courses using code 212. """
+        iframe_locator2 = self.page.frame_locator("iframe#Faci2")
+        form_body_frame2 = iframe_locator2.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
+
+        search_button = form_body_frame2.locator('//*[@id="F20851"]')
+        await search_button.wait_for(state="visible", timeout=step_timeout('menu'))
+        await search_button.fill("212")
+
+        search_click_button = form_body_frame2.locator('//*[@id="OK"]')
+        await search_click_button.wait_for(state="visible", timeout=step_timeout('menu'))
+        report_frame = self.page.locator("iframe#Faci3")
+
+        for share in MENU_CLICK_WAITS:
+            await search_click_button.click()
+            self.trace.count('menu_clicks')
+            try:
+                await report_frame.wait_for(state="attached", timeout=step_timeout('menu') * share)
+                return
+            except PlaywrightTimeoutError:
+                pass
+
+        raise Exception("Couldn't find the 212 report page after multiple attempts.")
+
+    async def __open_report(self):
+        """ Export the 212 report to its popup page and wait for the table. """
+        iframe_locator3 = self.page.frame_locator("iframe#Faci3")
+        commander = iframe_locator3.frame_locator("frame[name='Commander']")
+        export_button = commander.locator('//*[@id="ExToEx"]')
+        await export_button.wait_for(state="visible", timeout=step_timeout('report'))
+
+        async with self.page.expect_popup(timeout=step_timeout('report')) as new_tab_info:
+            await export_button.click()
+        course_page = await new_tab_info.value
+
+        await course_page.wait_for_selector("table", timeout=step_timeout('report'))
+        return course_page
+
+    async def __extract_courses(self):
+        """ Extract the course list from the page and return as structured data. """
+        course_page = await self.__open_report()
+        table = await course_page.evaluate(REPORT_TABLE_SCRIPT, {"start": 0, "count": None})
+        columns = report_columns(report_header(table))
+        rows = table["rows"][1:]
+
+        return [course_from_row(course_data, columns) for course_data in rows]
+
+    async def __stream_courses(self, chunk_size):
+        with self.trace.span('report'):
+            course_page = await self.__open_report()
+            table = await course_page.evaluate(REPORT_TABLE_SCRIPT, {"start": 0, "count": 1})
+        columns = report_columns(report_header(table))
+
+        for start in range(1, table["total"], chunk_size):
+            with self.trace.span('report'):
+                chunk = await course_page.evaluate(REPORT_TABLE_SCRIPT, {"start": start, "count": chunk_size})
+            yield [course_from_row(course_data, columns) for course_data in chunk["rows"]]
+
+    async def fetch_student_courses(self, username, password):
+        """ Main function to fetch student courses. """
+        await self.login(username, password)
+        with self.trace.span('menu'):
+            await self.__search_courses()
+        with self.trace.span('report'):
+            return await self.__extract_courses()
+
+    async def stream_student_courses(self, username, password, chunk_size=200):
+        """ fetch_student_courses for very large reports: yields the courses in lists of at most chunk_size. """
+        await self.login(username, password)
+        with self.trace.span('menu'):
+            await self.__search_courses()
+        async for courses in self.__stream_courses(chunk_size):
+            yield courses
@@ -0,0 +1,210 @@
+import asyncio
+from abc import ABC
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from src.crawlers.async_browser_pool import get_async_browser_pool
+from src.crawlers.captcha_login import PASSED, REFETCHED, UNKNOWN, WRONG, LoginAttempts, answer_captcha
+from src.crawlers.crawl_timing import CrawlTrace
+from src.crawlers.request_routing import RequestRouter
+from src.crawlers.session_cache import drop_session, load_session, save_session
+from src.crawlers.golestan_pages import (
+    CAPTCHA_REFRESH_SCRIPT, LOGIN_OUTCOME_SCRIPT, LOGIN_PATH, MAX_LOGIN_TRIES, WRONG_CAPTCHA_MESSAGE,
+    WRONG_CREDENTIALS_MESSAGE, golestan_url, is_captcha_response, step_timeout,
+)
+
+
+class AsyncGolestanBaseCrawler(ABC):
+    """
+    GolestanBaseCrawler on playwright.async_api, for running many crawls on one event loop.
+    Use it as an async context manager so its browser context goes back to the pool.
+    """
+
+    def __init__(self, trace=None):
+        self.browser_pool = None
+        self.context = None
+        self.page = None
+        self.router = RequestRouter.from_settings()
+        self.captcha_response = None
+        # a trace passed in belongs to the caller, which finishes it
+        self.trace = trace or CrawlTrace(type(self).__name__)
+        self.owns_trace = trace is None
+
+    async def __aenter__(self):
+        self.browser_pool = get_async_browser_pool()
+        try:
+            with self.trace.span('browser'):
+                self.context = await self.browser_pool.acquire()
+                if settings.CRAWLER_BLOCK_REQUESTS:
+                    await self.router.attach_async(self.context)
+                self.page = await self.context.new_page()
+            self.page.on("response", self.__on_response)
+        except Exception:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def __navigate_to_login_page(self):
+        """ Open the login page and wait for it to load. """
+        self.captcha_response = None
+        with self.trace.span('login_page'):
+            await self.page.goto(golestan_url(LOGIN_PATH), wait_until="load", timeout=step_timeout('login_page'))
+
+    async def __refresh_captcha(self):
+        """
+        Load a new captcha into the login form that is still open after a wrong one, without opening the page again.
+        False when the form is gone or can't be reached, so the login page has to be opened.
+        """
+        self.captcha_response = None
+        with self.trace.span('captcha_refresh'):
+            try:
+                return bool(await self.page.evaluate(CAPTCHA_REFRESH_SCRIPT))
+            except PlaywrightError:
+                return False
+
+    def __on_response(self, response):
+        if is_captcha_response(response):
+            self.captcha_response = response
+
+    async def __extract_captcha(self):
+        """
+        The captcha as the bytes Golestan sent for it, taken from the image response of the login form.
+        A captcha that never came over the network (e.g. a cached image) is screenshot instead.
+        """
+        with self.trace.span('captcha'):
+            return await self.__captcha_image()
+
+    async def __captcha_image(self):
+        try:
+            response = self.captcha_response or await self.page.wait_for_event(
+                "response", predicate=is_captcha_response, timeout=step_timeout('captcha'))
+            return await response.body()
+        except PlaywrightError:
+            pass
+
+        iframe_locator = self.page.frame_locator("iframe#Faci1")
+        form_body_frame = iframe_locator.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
+        captcha_element = form_body_frame.locator('img[id="imgCaptcha"]')
+        return await captcha_element.screenshot(timeout=step_timeout('captcha'))
+
+    async def __submit_login(self, username, password, captcha_text):
+        """ Fill in login details and submit the form. """
+        iframe_locator = self.page.frame_locator("iframe#Faci1")
+        form_body_frame = iframe_locator.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
+
+        await form_body_frame.locator('//*[@id="F80351"]').fill(username)
+        await form_body_frame.locator('//*[@id="F80401"]').fill(password)
+        await form_body_frame.locator('//*[@id="F51701"]').fill(captcha_text)
+
+        await form_body_frame.locator('//*[@id="btnLog"]').click()
+
+    async def __check_login_status(self):
+        """ Check if login was successful or failed (captcha or wrong password). """
+        try:
+            outcome = await (await self.page.wait_for_function(
+                LOGIN_OUTCOME_SCRIPT,
+                arg=[WRONG_CREDENTIALS_MESSAGE, WRONG_CAPTCHA_MESSAGE],
+                timeout=step_timeout('login'),
+            )).json_value()
+        except PlaywrightTimeoutError:
+            raise Exception("unknown error")
+
+        if outcome == WRONG_CREDENTIALS_MESSAGE:
+            raise ValueError(_("username or password is incorrect"))
+
+        return outcome != WRONG_CAPTCHA_MESSAGE
+
+    async def login(self, username, password):
+        """ Main function to login in golestan. """
+        if await self.__resume_session(username, password):
+            return
+
+        attempts = LoginAttempts()
+
+        try:
+            await self.__login(username, password, attempts)
+        finally:
+            await sync_to_async(attempts.save)()
+
+        await sync_to_async(save_session)(username, password, await self.context.storage_state())
+
+    async def __resume_session(self, username, password):
+        """ Continue a recently saved session of the same student, skipping the login form and its captcha. """
+        state = await sync_to_async(load_session)(username, password)
+        if state is None:
+            return False
+
+        await self.context.add_cookies(state["cookies"])
+        await self.__navigate_to_login_page()
+
+        with self.trace.span('session'):
+            try:
+                # with no message to look for, this only resolves once the main menu is open
+                await self.page.wait_for_function(LOGIN_OUTCOME_SCRIPT, arg=[], timeout=step_timeout('session'))
+                resumed = True
+            except PlaywrightTimeoutError:
+                resumed = False
+
+        if not resumed:
+            self.trace.count('expired_sessions')
+            await sync_to_async(drop_session)(username)
+            await self.context.clear_cookies()
+            return False
+
+        self.trace.count('resumed_sessions')
+        return True
+
+    async def __login(self, username, password, attempts):
+        max_tries = MAX_LOGIN_TRIES
+        refetches_left = settings.CAPTCHA_MAX_REFETCHES
+        form_open = False
+
+        while max_tries > 0:
+            # the first try opens the login page, later ones only swap the captcha in the form left open
+            if not (form_open and await self.__refresh_captcha()):
+                await self.__navigate_to_login_page()
+            form_open = True
+            captcha_image = await self.__extract_captcha()
+            # solving is CPU bound (or a blocking call to the solver service), keep it off the loop
+            with self.trace.span('solve'):
+                answer = await asyncio.to_thread(answer_captcha, captcha_image, refetches_left)
+
+            if answer.text is None:
+                attempts.record(answer, REFETCHED)
+                self.trace.count(REFETCHED)
+                refetches_left -= 1
+                if refetches_left < 0:
+                    max_tries -= 1
+                continue
+
+            try:
+                with self.trace.span('login'):
+                    await self.__submit_login(username, password, answer.text)
+                    logged_in = await self.__check_login_status()
+            except ValueError:
+                # wrong credentials: the captcha is not known to be right, so it is no training sample
+                attempts.record(answer, UNKNOWN)
+                raise
+
+            attempts.record(answer, PASSED if logged_in else WRONG)
+            if logged_in:
+                break
+
+            self.trace.count(WRONG)
+            max_tries -= 1
+
+        if max_tries == 0:
+            raise ValueError(_("Login failed"))
+
+    async def close(self):
+        """ Give the browser context back to the pool and report the timing of the crawl. """
+        if self.context is not None:
+            self.router.log_stats()
+            await self.browser_pool.release(self.context)
+            self.context = None
+        if self.owns_trace:
+            await sync_to_async(self.trace.finish)()
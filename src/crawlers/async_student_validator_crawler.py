@@ -0,0 +1,50 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from .async_golestan_base_crawler import AsyncGolestanBaseCrawler
+from .golestan_pages import MENU_CLICK_WAITS, step_timeout
+
+
+class AsyncStudentValidatorCrawler(AsyncGolestanBaseCrawler):
+    async def __navigate_to_student_info_page(self):
+        iframe2 = self.page.frame_locator("iframe#Faci2")
+        form_body2 = iframe2.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
+        student_info_btn = form_body2.locator('//td[span[text()="اطلاعات جامع دانشجو"]]')
+        await student_info_btn.wait_for(state="visible", timeout=step_timeout('menu'))
+        info_frame = self.page.locator("iframe#Faci3")
+
+        for share in MENU_CLICK_WAITS:
+            await student_info_btn.click()
+            self.trace.count('menu_clicks')
+            try:
+                await info_frame.wait_for(state="attached", timeout=step_timeout('menu') * share)
+                return
+            except PlaywrightTimeoutError:
+                pass
+
+        raise Exception("Couldn't open the student info page after multiple attempts.")
+
+    async def __extract_student_info(self):
+        iframe3 = self.page.frame_locator("iframe#Faci3")
+        form_body3 = iframe3.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
+
+        student_name_el = form_body3.locator('label#F51851')
+        student_number_el = form_body3.locator('input#F41251')
+        student_major_el = form_body3.locator('//*[@id="F17551"]')
+        student_faculty_el = form_body3.locator('//*[@id="F61151"]')
+
+        for element in (student_name_el, student_number_el, student_major_el, student_faculty_el):
+            await element.wait_for(state="visible", timeout=step_timeout('report'))
+
+        return {
+            "student_number": await student_number_el.input_value(),
+            "full_name": await student_name_el.text_content(),
+            "major": await student_major_el.text_content(),
+            "faculty": await student_faculty_el.text_content()
+        }
+
+    async def fetch_student_info(self, username, password):
+        """ Main function to fetch student info. """
+        await self.login(username, password)
+        with self.trace.span('menu'):
+            await self.__navigate_to_student_info_page()
+        with self.trace.span('report'):
+            return await self.__extract_student_info()
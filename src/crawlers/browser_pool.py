@@ -0,0 +1,136 @@
+import logging
+import threading
+from django.conf import settings
+from playwright.sync_api import sync_playwright
+
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolExhausted(Exception):
+    pass
+
+
+class PooledBrowser:
+    def __init__(self, browser):
+        self.browser = browser
+        self.jobs = 0
+
+
+class BrowserPool:
+    """
+    Warm headless Chromium instances that hand out a fresh, isolated BrowserContext per job,
+    one job per browser at a time.
+    A browser is recycled after `max_jobs` contexts or as soon as it is found disconnected, and at
+    most `max_size` browsers are alive at once. The sync Playwright API is bound to the thread that
+    started it, so a pool must only be used from one thread; see get_browser_pool().
+    """
+
+    def __init__(self, max_size=1, max_jobs=50, launch_options=None):
+        self.max_size = max_size
+        self.max_jobs = max_jobs
+        self.launch_options = launch_options or {"headless": True}
+        self._playwright = None
+        self._idle = []
+        self._leased = {}
+
+    @property
+    def size(self):
+        return len(self._idle) + len(self._leased)
+
+    def acquire(self, **context_options):
+        """ Return a new BrowserContext on a warm browser; release it with release(). """
+        pooled = self._take_browser()
+        try:
+            context = pooled.browser.new_context(**context_options)
+        except Exception:
+            self._discard(pooled)
+            raise
+
+        pooled.jobs += 1
+        self._leased[context] = pooled
+        return context
+
+    def release(self, context):
+        """ Close a context and give its browser back to the pool, or retire the browser. """
+        pooled = self._leased.pop(context, None)
+
+        try:
+            context.close()
+        except Exception:
+            pass
+
+        if pooled is None:
+            return
+
+        if pooled.jobs >= self.max_jobs or not pooled.browser.is_connected():
+            self._discard(pooled)
+        else:
+            self._idle.append(pooled)
+
+    def close(self):
+        for context in list(self._leased):
+            self.release(context)
+        while self._idle:
+            self._discard(self._idle.pop())
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _take_browser(self):
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.browser.is_connected():
+                return pooled
+            self._discard(pooled)
+
+        if self.size >= self.max_size:
+            raise BrowserPoolExhausted(f"all {self.max_size} pooled browsers are in use")
+
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+
+        logger.info("launching pooled chromium (%d/%d)", self.size + 1, self.max_size)
+        return PooledBrowser(self._playwright.chromium.launch(**self.launch_options))
+
+    def _discard(self, pooled):
+        if pooled in self._idle:
+            self._idle.remove(pooled)
+        try:
+            pooled.browser.close()
+        except Exception:
+            pass
+
+
+_local = threading.local()
+
+
+def get_browser_pool():
+    """
+    The browser pool of the calling thread, which is the worker's pool under sync gunicorn workers.
+    Pools of other request threads are closed when their request finishes, see close_request_browser_pool().
+    """
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = BrowserPool(
+            max_size=settings.CRAWLER_BROWSER_POOL_SIZE,
+            max_jobs=settings.CRAWLER_BROWSER_MAX_JOBS,
+        )
+        _local.pool = pool
+    return pool
+
+
+def close_request_browser_pool(**kwargs):
+    """
+    request_finished receiver closing the browser pool of a request served off the main thread.
+    runserver (and gunicorn's gthread workers) serve requests on other threads, which may end with the
+    request; a pool left on one would keep its Playwright driver and Chromium running for good. Only a
+    main-thread pool, that of a sync gunicorn worker or a crawl worker, is kept warm between crawls.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return
+
+    pool = getattr(_local, 'pool', None)
+    if pool is not None:
+        _local.pool = None
+        pool.close()
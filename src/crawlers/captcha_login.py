@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from time import perf_counter
+from uuid import uuid4
+from django.conf import settings
+from src.crawlers.captcha_solver.cache import solved_captchas
+from src.crawlers.captcha_solver.captcha_solver import captcha_key, solve_with_confidence
+
+
+# values of src.crawlers.models.CaptchaVerdict, which can't be imported before the app registry is ready
+PASSED = "passed"
+WRONG = "wrong"
+REFETCHED = "refetched"
+UNKNOWN = "unknown"
+
+
+@dataclass
+class CaptchaAnswer:
+    key: str = None
+    # None when a fresh captcha should be fetched instead of submitting this one
+    text: str = None
+    attempt: dict = None
+
+
+def answer_captcha(captcha_image, refetches_left):
+    """
+    Decide what to submit for a captcha: a cached answer, a fresh prediction, or nothing.
+    A captcha seen before is answered from the cache, or replaced when its answer is known to be wrong.
+    A captcha with a doubtful prediction is only worth submitting once the refetch budget is spent.
+    """
+    start_time = perf_counter()
+
+    try:
+        key = captcha_key(captcha_image)
+    except Exception:
+        return CaptchaAnswer()
+
+    known = solved_captchas.get(key)
+    if known is not None and known.verdict is not None:
+        attempt = {
+            "predicted_text": known.text, "confidence": None, "from_cache": True,
+            "latency_ms": (perf_counter() - start_time) * 1000, "image": captcha_image,
+        }
+        return CaptchaAnswer(key=key, text=known.text if known.verdict else None, attempt=attempt)
+
+    try:
+        prediction = solve_with_confidence(captcha_image)
+    except Exception:
+        return CaptchaAnswer(key=key)
+
+    solved_captchas.put(key, prediction.text)
+    attempt = {
+        "predicted_text": prediction.text, "confidence": prediction.confidence, "from_cache": False,
+        "latency_ms": (perf_counter() - start_time) * 1000, "image": captcha_image,
+    }
+
+    if refetches_left > 0 and not prediction.is_trustworthy(
+            expected_length=settings.CAPTCHA_EXPECTED_LENGTH,
+            min_confidence=settings.CAPTCHA_MIN_CONFIDENCE,
+    ):
+        return CaptchaAnswer(key=key, attempt=attempt)
+
+    return CaptchaAnswer(key=key, text=prediction.text or None, attempt=attempt)
+
+
+class LoginAttempts:
+    """ The captchas answered during one login and the verdict each of them got. """
+
+    def __init__(self):
+        self.login_id = uuid4()
+        self.attempts = []
+
+    def record(self, answer, verdict):
+        if verdict in (PASSED, WRONG):
+            solved_captchas.mark(answer.key, verdict == PASSED)
+        if answer.attempt is not None:
+            self.attempts.append({**answer.attempt, "verdict": verdict})
+
+    def save(self):
+        from src.crawlers.services import record_captcha_attempts
+        record_captcha_attempts(self.login_id, self.attempts)
@@ -0,0 +1,128 @@
+import base64
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+import numpy as np
+from . import captcha_solver
+from .model import captcha_model
+
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+STAGES = ("decode", "binarise", "denoise", "segment", "resize", "predict")
+
+
+def load_corpus(path=CORPUS_DIR):
+    """ Return (label, base64 image) pairs of a corpus directory; the label is the file name up to the first '_'. """
+    corpus = []
+    for name in sorted(os.listdir(path)):
+        if not name.lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
+            continue
+        with open(os.path.join(path, name), "rb") as f:
+            corpus.append((name.split("_")[0].split(".")[0], base64.b64encode(f.read()).decode("utf-8")))
+    return corpus
+
+
+def percentiles(samples):
+    """ p50/p95 of a list of durations in seconds, in milliseconds. """
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None}
+    p50, p95 = np.percentile(np.array(samples) * 1000, [50, 95])
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3)}
+
+
+def time_stages(img_base64):
+    """ Run one captcha through the pipeline stage by stage; return the prediction and each stage's duration. """
+    timings = {}
+
+    start = perf_counter()
+    img = captcha_solver.decode(img_base64)
+    timings["decode"] = perf_counter() - start
+
+    start = perf_counter()
+    np_img = captcha_solver.binarise(img)
+    timings["binarise"] = perf_counter() - start
+
+    start = perf_counter()
+    np_img = captcha_solver.denoise(np_img)
+    timings["denoise"] = perf_counter() - start
+
+    start = perf_counter()
+    glyphs = captcha_solver.segment(np_img)
+    timings["segment"] = perf_counter() - start
+
+    start = perf_counter()
+    features = captcha_solver.extract_features(glyphs)
+    timings["resize"] = perf_counter() - start
+
+    start = perf_counter()
+    prediction = ''.join(captcha_model.classifier.predict(features)) if len(features) else ''
+    timings["predict"] = perf_counter() - start
+
+    return prediction, timings
+
+
+def accuracy(labels, predictions):
+    """ Share of captchas solved exactly and of characters right at their position. """
+    solved = sum(label == prediction for label, prediction in zip(labels, predictions))
+    characters = sum(len(label) for label in labels)
+    correct = sum(a == b for label, prediction in zip(labels, predictions) for a, b in zip(label, prediction))
+
+    return {
+        "captcha": round(solved / len(labels), 4) if labels else None,
+        "character": round(correct / characters, 4) if characters else None,
+    }
+
+
+def run_benchmark(corpus, repeat=1, batch_size=32):
+    """
+    Measure the in-process solver on a labelled corpus: per-stage latency, single and batch
+    throughput, and per-character and per-captcha accuracy.
+    """
+    captcha_model.warm_up()
+    captcha_model.scorer
+    labels = [label for label, _ in corpus]
+    images = [img_base64 for _, img_base64 in corpus]
+
+    stage_samples = {stage: [] for stage in STAGES}
+    totals = []
+    predictions = []
+
+    for _ in range(repeat):
+        predictions = []
+        for img_base64 in images:
+            prediction, timings = time_stages(img_base64)
+            predictions.append(prediction)
+            totals.append(sum(timings.values()))
+            for stage, duration in timings.items():
+                stage_samples[stage].append(duration)
+
+    # the solver prints every solution, keep that out of the report
+    with redirect_stdout(StringIO()):
+        start = perf_counter()
+        for _ in range(repeat):
+            for img_base64 in images:
+                captcha_solver.solve.local(img_base64)
+        single_seconds = perf_counter() - start
+
+        start = perf_counter()
+        for _ in range(repeat):
+            for offset in range(0, len(images), batch_size):
+                captcha_solver.solve_many.local(images[offset:offset + batch_size])
+        batch_seconds = perf_counter() - start
+
+    solved = len(images) * repeat
+
+    return {
+        "captchas": len(images),
+        "repeat": repeat,
+        "stages": {stage: percentiles(samples) for stage, samples in stage_samples.items()},
+        "total": percentiles(totals),
+        "throughput": {
+            "single_per_second": round(solved / single_seconds, 2) if single_seconds else None,
+            "batch_per_second": round(solved / batch_seconds, 2) if batch_seconds else None,
+            "batch_size": batch_size,
+        },
+        "accuracy": accuracy(labels, predictions),
+    }
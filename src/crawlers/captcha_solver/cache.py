@@ -0,0 +1,64 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class SolvedCaptcha:
+    text: str
+    # None until a login attempt tells whether the text was right
+    verdict: bool = None
+
+
+def bitmap_key(np_img):
+    """ Hash of a binarised captcha, stable across re-encodings of the same image. """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(np_img.shape, dtype=np.int32).tobytes())
+    digest.update(np.packbits(np_img == 1).tobytes())
+    return digest.hexdigest()
+
+
+class SolvedCaptchaCache:
+    """ Bounded, thread-safe LRU of captcha bitmaps to their predicted text and login verdict. """
+
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, text):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.text != text:
+                entry = SolvedCaptcha(text=text)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return entry
+
+    def mark(self, key, verdict):
+        """ Record whether the cached text of a captcha got through the login form. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.verdict = verdict
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+solved_captchas = SolvedCaptchaCache()
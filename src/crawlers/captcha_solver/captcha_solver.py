@@ -1,114 +1,225 @@
 import base64
-import os
+import logging
+from dataclasses import dataclass
 from time import perf_counter
 from PIL import Image
 from io import BytesIO
 import numpy as np
-from joblib import load
+from .cache import bitmap_key
+from .client import service_first
+from .model import captcha_model
 
 
-def split_images_y(img):
-    imgs = []
-    start = 0
-    start_found = False
-    end = 0
-    for (idy, y) in enumerate(img[0]):
-
-        tmp = img[
-              :,
-              idy
-              ].flatten()
-        if start_found:
-            if list(tmp).count(1) < 2:
-                start_found = False
-                end = idy
-                imgs.append(img[
-                            :,
-                            start:end
-                            ])
-        else:
-            if not list(tmp).count(1) < 2:
-                start_found = True
-                start = idy
-    return imgs
+logger = logging.getLogger(__name__)
 
 
-def split_images_x(img):
-    imgs = []
-    start = 0
-    start_found = False
-    end = 0
-    for (idx, x) in enumerate(img):
-
-        tmp = img[
-              idx,
-              :
-              ].flatten()
-        if start_found:
-            if list(tmp).count(1) < 2:
-                start_found = False
-                end = idx
-                imgs.append(img[
-                            start:end,
-                            :
-                            ])
-        else:
-            if not list(tmp).count(1) < 2:
-                start_found = True
-                start = idx
-    return imgs
+@dataclass
+class CaptchaPrediction:
+    text: str
+    probabilities: list
+    confidence: float
 
+    def is_trustworthy(self, expected_length=None, min_confidence=0.0):
+        """ Whether the prediction is worth submitting rather than fetching a new captcha. """
+        if expected_length is not None and len(self.text) != expected_length:
+            return False
+        return bool(self.text) and self.confidence >= min_confidence
 
-def main(img=None):
-    start_time = perf_counter()
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(BASE_DIR, "edu.pkl")
-    clf = load(file_path)
 
-    # id = str(time())
+def find_runs(profile, min_count=2):
+    """ Return (start, end) pairs of the closed runs where a projection reaches min_count. """
+    edges = np.diff((profile >= min_count).astype(np.int8), prepend=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # a run still open at the border of the frame is dropped
+    return list(zip(starts[:len(ends)].tolist(), ends.tolist()))
 
-    src_img = img.convert("RGB")
-    img = img.convert('L')
 
-    np_img = np.array(img)
+def split_images_y(img):
+    """ Split the frame into vertical strips of columns with at least two foreground pixels. """
+    return [img[:, start:end] for start, end in find_runs(np.sum(img == 1, axis=0))]
+
+
+def split_images_x(img):
+    """ Split the frame into horizontal strips of rows with at least two foreground pixels. """
+    return [img[start:end, :] for start, end in find_runs(np.sum(img == 1, axis=1))]
+
+
+def segment(np_img):
+    """
+    Cut a denoised frame into glyph slices.
+    The column projection is computed once for the frame and the row projections of all column
+    strips in a single reduceat call, instead of counting every row and column in Python.
+    """
+    foreground = np_img == 1
+    column_runs = find_runs(np.sum(foreground, axis=0))
+    if not column_runs:
+        return []
+
+    bounds = np.array(column_runs).ravel()
+    row_profiles = np.add.reduceat(foreground, bounds, axis=1)[:, ::2]
+
+    # the original filter checks the pixel count of the last strip rather than of each glyph
+    if row_profiles[:, -1].sum() <= 15:
+        return []
+
+    glyphs = []
+    for (col_start, col_end), profile in zip(column_runs, row_profiles.T):
+        if col_end - col_start < 3:
+            continue
+        for row_start, row_end in find_runs(profile):
+            if row_end - row_start >= 6:
+                glyphs.append(np_img[row_start:row_end, col_start:col_end])
+
+    return glyphs
+
+
+def denoise(np_img, passes=3):
+    """
+    Clear foreground pixels that have fewer than 4 foreground neighbours.
+    Pixels are visited in raster order and cleared in place, so every pixel sees the already
+    cleaned row above and left neighbour. Counts from the row below and the right neighbour
+    are taken for the whole frame at once, only the row above is resolved row by row.
+    """
+    np_img = np_img.copy()
+    height, width = np_img.shape
+    if height < 3 or width < 3:
+        return np_img
+
+    positions = np.arange(width - 2)
+
+    for _ in range(passes):
+        ahead = np_img[2:, :-2] + np_img[2:, 1:-1] + np_img[2:, 2:] + np_img[1:-1, 2:]
+        center = np_img[1:-1, 1:-1] == 1
+        left = np_img[1:-1, :-2] == 1
+
+        for idx in range(1, height - 1):
+            above = np_img[idx - 1]
+            base = ahead[idx - 1] + above[:-2] + above[1:-1] + above[2:]
+            removed = center[idx - 1] & (base + left[idx - 1] < 4)
+
+            # with exactly 3 other neighbours a pixel survives only if its left neighbour did
+            chained = center[idx - 1] & left[idx - 1] & (base == 3)
+            chained[0] = False
+            if chained.any():
+                anchor = np.maximum.accumulate(np.where(chained, 0, positions))
+                removed = np.where(chained, removed[anchor], removed)
+
+            np_img[idx, 1:-1][removed] = 0
+
+    return np_img
+
+
+def decode(image):
+    """
+    Decode a captcha image, given as the raw bytes of the image file or as base64, and scale it
+    to the 140x50 frame the solver expects.
+    """
+    if isinstance(image, str):
+        image = base64.b64decode(image)
+    return Image.open(BytesIO(image)).resize((140, 50))
+
+
+def binarise(img):
+    """ Mask the bottom noise strip and threshold the image: 1 for glyph pixels, 0 for background. """
+    np_img = np.array(img.convert('L'))
 
     np_img[46:50, 45:80] = 255
     np_img[46:50, 85:95] = 255
     np_img[46:50, 100:140] = 255
 
-    np_img = np.where(np_img > np.mean(np_img) - 5, 0, 1)
+    return np.where(np_img > np.mean(np_img) - 5, 0, 1)
 
-    for _ in range(3):
-        for (idx, x) in enumerate(np_img):
-            for (idy, y) in enumerate(x):
-                if idx > 0 and idx < len(np_img) - 1 and idy > 0 and idy < len(x) - 1 and y == 1:
-                    tmp = np_img[
-                          idx - 1:idx + 2,
-                          idy - 1:idy + 2
-                          ].flatten()
-                    if list(tmp).count(1) - 1 < 4:
-                        np_img[idx, idy] = 0
 
-    imgs = []
+GLYPH_SIZE = 32
 
-    for img in split_images_y(np_img):
-        imgs.append(split_images_x(img))
 
-    arr = []
+def extract_features(glyphs):
+    """
+    Normalise every glyph to a 32x32 bitmap, written straight into one preallocated (n, 1024) matrix.
+    The resize and 1-bit conversion stay in PIL: its Lanczos kernel and Floyd-Steinberg dithering are what
+    the classifier's exemplars were made with, and an array-space threshold changes the text of some captchas.
+    """
+    features = np.empty((len(glyphs), GLYPH_SIZE * GLYPH_SIZE), dtype=bool)
 
-    for (idx, x) in enumerate(imgs):
-        for (idy, y) in enumerate(x):
-            if len(y) >= 6 and len(y[0]) >= 3 and list(img.flatten()).count(1) > 15:
-                pil_img = Image.fromarray(
-                    (y * 255).astype(np.uint8), mode="L").resize((32, 32), Image.Resampling.LANCZOS).convert("1")
-                arr.append(np.array(pil_img).reshape((1024, -1)).flatten())
+    for row, glyph in zip(features, glyphs):
+        bitmap = Image.fromarray(np.multiply(glyph, 255, dtype=np.uint8, casting='unsafe'), mode="L")
+        row[:] = np.asarray(
+            bitmap.resize((GLYPH_SIZE, GLYPH_SIZE), Image.Resampling.LANCZOS).convert("1"), dtype=bool,
+        ).ravel()
 
-    prediction = ''.join(clf.predict(np.array(arr)))
+    return features
+
+
+def captcha_key(image):
+    """ Cache key of a captcha: the hash of its binarised bitmap. """
+    return bitmap_key(binarise(decode(image)))
+
+
+def preprocess(img):
+    """ Run a decoded captcha through every stage up to the classifier input. """
+    return extract_features(segment(denoise(binarise(img))))
+
+
+def main(img=None):
+    start_time = perf_counter()
+    clf = captcha_model.classifier
+
+    prediction = ''.join(clf.predict(preprocess(img)))
     print(f"solving capcha: {perf_counter() - start_time}")
     print(prediction)
     return prediction
 
 
-def solve(img_base64):
-    img = Image.open(BytesIO(base64.b64decode(img_base64))).resize((140, 50))
-    return main(img)
+@service_first
+def solve(image):
+    return main(decode(image))
+
+
+def predict_with_confidence(features):
+    """
+    Predict the glyphs of one captcha along with the probability of each predicted glyph.
+    The overall confidence is the product of the glyph probabilities: the chance that every
+    glyph, and so the whole captcha, is right.
+    """
+    if not len(features):
+        return CaptchaPrediction(text='', probabilities=[], confidence=0.0)
+
+    labels = captcha_model.classifier.predict(features)
+    scorer = captcha_model.scorer
+    proba = scorer.predict_proba(features)
+    columns = np.searchsorted(scorer.classes_, labels)
+    probabilities = proba[np.arange(len(labels)), columns]
+
+    return CaptchaPrediction(
+        text=''.join(labels),
+        probabilities=probabilities.round(4).tolist(),
+        confidence=float(np.prod(probabilities)),
+    )
+
+
+@service_first
+def solve_with_confidence(image):
+    start_time = perf_counter()
+    prediction = predict_with_confidence(preprocess(decode(image)))
+    logger.debug("solved captcha as %r (confidence %.3f) in %.3fs",
+                 prediction.text, prediction.confidence, perf_counter() - start_time)
+    return prediction
+
+
+@service_first
+def solve_many(images):
+    """
+    Solve a batch of captchas (raw bytes or base64) with a single classifier call.
+    The glyph features of all images are stacked into one matrix and the predictions are split
+    back per image. An image in which no glyph was found is solved as an empty string.
+    """
+    features = [preprocess(decode(image)) for image in images]
+    if not features:
+        return []
+
+    stacked = np.concatenate(features)
+    labels = captcha_model.classifier.predict(stacked) if len(stacked) else np.array([])
+    bounds = np.cumsum([len(f) for f in features])[:-1]
+
+    return [''.join(chunk) for chunk in np.split(labels, bounds)]
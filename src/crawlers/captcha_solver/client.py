@@ -0,0 +1,101 @@
+import functools
+import logging
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from time import monotonic
+
+
+logger = logging.getLogger(__name__)
+
+# after a failed call the service is skipped for a while, so an outage costs one connect attempt, not one per solve
+RETRY_AFTER_SECONDS = 5.0
+
+
+class SolverUnavailable(Exception):
+    pass
+
+
+def parse_address(address):
+    """ '/path/to/socket' is a unix socket, 'host:port' a TCP address. """
+    if address.startswith('/'):
+        return address
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class SolverClient:
+    """ Talks to the captcha solver service started by the `run_captcha_solver` command. """
+
+    def __init__(self, address, authkey, timeout=5.0):
+        self.address = parse_address(address)
+        self.authkey = authkey
+        self.timeout = timeout
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, kind, *args):
+        if monotonic() < self._down_until:
+            raise SolverUnavailable("captcha solver service marked as down")
+
+        try:
+            with Client(self.address, authkey=self.authkey) as conn:
+                conn.send((kind, args))
+                if not conn.poll(self.timeout):
+                    raise SolverUnavailable(f"no answer from captcha solver service in {self.timeout}s")
+                status, result = conn.recv()
+        except (OSError, EOFError, AuthenticationError) as e:
+            with self._lock:
+                self._down_until = monotonic() + RETRY_AFTER_SECONDS
+            raise SolverUnavailable(str(e)) from e
+        except SolverUnavailable:
+            with self._lock:
+                self._down_until = monotonic() + RETRY_AFTER_SECONDS
+            raise
+
+        if status == 'error':
+            raise ValueError(result)
+        return result
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """ The client for the configured solver service, or None when solving runs in-process. """
+    global _client
+    from django.conf import settings
+
+    if not settings.configured or not getattr(settings, 'CAPTCHA_SOLVER_SERVICE_ADDRESS', None):
+        return None
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SolverClient(
+                    settings.CAPTCHA_SOLVER_SERVICE_ADDRESS,
+                    authkey=settings.SECRET_KEY.encode(),
+                    timeout=settings.CAPTCHA_SOLVER_SERVICE_TIMEOUT,
+                )
+    return _client
+
+
+def service_first(func):
+    """
+    Route a solver entry point to the solver service when one is configured.
+    The in-process function stays available as `func.local` and is used whenever the service can't
+    be reached.
+    """
+    @functools.wraps(func)
+    def wrapper(*args):
+        client = get_client()
+        if client is not None:
+            try:
+                return client.call(func.__name__, *args)
+            except SolverUnavailable as e:
+                logger.warning("captcha solver service unavailable, solving in-process: %s", e)
+        return func(*args)
+
+    wrapper.local = func
+    return wrapper
@@ -0,0 +1,105 @@
+import copy
+import logging
+import os
+import sys
+import threading
+from time import perf_counter
+import numpy as np
+from joblib import load
+from sklearn.neighbors import KNeighborsClassifier
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edu.pkl")
+
+# neighbours that vote on a glyph's probability when the classifier itself only looks at one
+SCORING_NEIGHBOURS = 5
+
+
+def estimate_nbytes(obj):
+    """ Approximate memory held by a fitted estimator: its numpy buffers plus the object headers. """
+    total = sys.getsizeof(obj)
+    for value in getattr(obj, "__dict__", {}).values():
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, (list, tuple)):
+            total += sum(v.nbytes if isinstance(v, np.ndarray) else sys.getsizeof(v) for v in value)
+        else:
+            total += sys.getsizeof(value)
+    return total
+
+
+class CaptchaModel:
+    """
+    Process-wide holder of the captcha classifier.
+    The classifier is deserialised on first use (or by warm_up at worker start) and then shared
+    by every thread of the process.
+    """
+
+    def __init__(self, path=DEFAULT_MODEL_PATH):
+        self.path = path
+        self.load_seconds = None
+        self.memory_bytes = None
+        self._classifier = None
+        self._scorer = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self):
+        return self._classifier is not None
+
+    @property
+    def classifier(self):
+        if self._classifier is None:
+            with self._lock:
+                if self._classifier is None:
+                    self._load()
+        return self._classifier
+
+    @property
+    def scorer(self):
+        """
+        Estimator whose predict_proba gives graded glyph probabilities.
+        A 1-NN classifier only returns one-hot probabilities, so it is scored by a shallow copy that
+        takes a distance-weighted vote of the nearest exemplars instead. The copy shares the fitted
+        arrays and needs no refit.
+        """
+        if self._scorer is None:
+            self._scorer = self._build_scorer(self.classifier)
+        return self._scorer
+
+    @staticmethod
+    def _build_scorer(classifier):
+        if isinstance(classifier, KNeighborsClassifier) and classifier.n_neighbors < SCORING_NEIGHBOURS:
+            scorer = copy.copy(classifier)
+            scorer.set_params(n_neighbors=SCORING_NEIGHBOURS, weights="distance")
+            return scorer
+        return classifier
+
+    def _load(self):
+        start_time = perf_counter()
+        classifier = load(self.path)
+        self.load_seconds = perf_counter() - start_time
+        self.memory_bytes = estimate_nbytes(classifier)
+        self._classifier = classifier
+        logger.info(
+            "captcha model loaded from %s in %.3fs, ~%.1f MiB",
+            self.path, self.load_seconds, self.memory_bytes / 2 ** 20,
+        )
+
+    def warm_up(self):
+        """ Load the classifier now and return its load statistics. """
+        self.classifier
+        return self.stats()
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "loaded": self.is_loaded,
+            "load_seconds": self.load_seconds,
+            "memory_bytes": self.memory_bytes,
+        }
+
+
+captcha_model = CaptchaModel()
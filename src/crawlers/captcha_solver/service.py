@@ -0,0 +1,80 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import Listener
+from . import captcha_solver
+from .client import parse_address
+from .model import captcha_model
+
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {
+    'solve': captcha_solver.solve.local,
+    'solve_with_confidence': captcha_solver.solve_with_confidence.local,
+    'solve_many': captcha_solver.solve_many.local,
+}
+
+
+def _warm_up_worker():
+    captcha_model.warm_up()
+    captcha_model.scorer
+
+
+def _run(kind, args):
+    return HANDLERS[kind](*args)
+
+
+class SolverService:
+    """
+    Captcha solving in a pool of worker processes, each with the model preloaded.
+    Clients connect over a local socket and send (kind, args) requests, one or more per connection.
+    """
+
+    def __init__(self, address, authkey, workers=None):
+        self.address = parse_address(address)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up_worker)
+        self.listener = Listener(self.address, authkey=authkey)
+        self._stopped = threading.Event()
+
+    def serve_forever(self):
+        logger.info("captcha solver service listening on %s", self.address)
+        while not self._stopped.is_set():
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError) as e:
+                if self._stopped.is_set():
+                    return
+                logger.warning("rejected captcha solver connection: %s", e)
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    kind, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                if kind == 'ping':
+                    conn.send(('ok', 'pong'))
+                    continue
+
+                if kind not in HANDLERS:
+                    conn.send(('error', f"unknown request {kind!r}"))
+                    continue
+
+                try:
+                    conn.send(('ok', self.pool.submit(_run, kind, args).result()))
+                except Exception as e:
+                    conn.send(('error', str(e)))
+
+    def shutdown(self):
+        self._stopped.set()
+        self.listener.close()
+        self.pool.shutdown(cancel_futures=True)
@@ -0,0 +1,110 @@
+import json
+import os
+import re
+from datetime import datetime, timezone
+from time import perf_counter
+import numpy as np
+from joblib import dump
+from sklearn.neighbors import KNeighborsClassifier
+from . import captcha_solver
+from .benchmark import accuracy, percentiles
+
+
+VERSIONED_MODEL = re.compile(r"^edu-v(\d+)\.pkl$")
+
+
+def glyph_features(corpus, batch_size=256):
+    """
+    Segment every labelled captcha and return the features and labels of its glyphs.
+    Captchas whose glyph count doesn't match their label can't be aligned and are skipped.
+    Features are built batch by batch and stacked once per batch.
+    """
+    feature_batches, label_batches = [], []
+    skipped = 0
+
+    for offset in range(0, len(corpus), batch_size):
+        features, labels = [], []
+        for label, img_base64 in corpus[offset:offset + batch_size]:
+            glyphs = captcha_solver.segment(captcha_solver.denoise(captcha_solver.binarise(
+                captcha_solver.decode(img_base64))))
+            if len(glyphs) != len(label):
+                skipped += 1
+                continue
+            features.append(captcha_solver.extract_features(glyphs))
+            labels.extend(label)
+
+        if features:
+            feature_batches.append(np.concatenate(features))
+            label_batches.append(np.array(labels))
+
+    if not feature_batches:
+        return np.empty((0, 1024), dtype=bool), np.array([]), skipped
+
+    return np.concatenate(feature_batches), np.concatenate(label_batches), skipped
+
+
+def split_corpus(corpus, test_size=0.2, seed=0):
+    """
+    Split by captcha, not by glyph, so no glyph of a test captcha is seen in training.
+    A corpus of two or more captchas keeps at least one on each side.
+    """
+    order = np.random.default_rng(seed).permutation(len(corpus))
+    cut = min(max(int(round(len(corpus) * (1 - test_size))), 1), len(corpus) - 1)
+    return [corpus[i] for i in order[:cut]], [corpus[i] for i in order[cut:]]
+
+
+def train(features, labels, neighbours=1, base_model=None):
+    """ Fit a k-NN glyph classifier, optionally keeping the exemplars of the current model. """
+    if base_model is not None:
+        features = np.concatenate([base_model._fit_X.astype(bool), features.astype(bool)])
+        labels = np.concatenate([base_model.classes_[base_model._y], labels])
+
+    return KNeighborsClassifier(n_neighbors=neighbours).fit(features, labels)
+
+
+def evaluate(classifier, corpus):
+    """ Per-captcha and per-character accuracy of a classifier on labelled captchas, with predict latency. """
+    predictions, latencies = [], []
+
+    for _, img_base64 in corpus:
+        features = captcha_solver.preprocess(captcha_solver.decode(img_base64))
+        start = perf_counter()
+        prediction = ''.join(classifier.predict(features)) if len(features) else ''
+        latencies.append(perf_counter() - start)
+        predictions.append(prediction)
+
+    return {
+        "captchas": len(corpus),
+        "accuracy": accuracy([label for label, _ in corpus], predictions),
+        "predict_latency": percentiles(latencies),
+    }
+
+
+def next_model_path(directory):
+    """ Path of the next edu-v<N>.pkl in a model directory, which is created when missing. """
+    os.makedirs(directory, exist_ok=True)
+    versions = [int(m.group(1)) for m in map(VERSIONED_MODEL.match, os.listdir(directory)) if m]
+    return os.path.join(directory, f"edu-v{max(versions, default=0) + 1}.pkl")
+
+
+def save_model(classifier, report, path):
+    """ Write the model with its report attached, and the report next to it as JSON. """
+    classifier.training_report_ = report
+    dump(classifier, path)
+
+    with open(os.path.splitext(path)[0] + ".json", "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def build_report(classifier, train_corpus, test_corpus, skipped, current_model=None):
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "train_captchas": len(train_corpus),
+        "skipped_captchas": skipped,
+        "glyphs": int(len(classifier._fit_X)),
+        "neighbours": classifier.n_neighbors,
+        "test": evaluate(classifier, test_corpus),
+    }
+    if current_model is not None:
+        report["current_model_test"] = evaluate(current_model, test_corpus)
+    return report
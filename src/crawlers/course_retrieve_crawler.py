@@ -1,4 +1,8 @@
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from .golestan_base_crawler import GolestanBaseCrawler
+from .golestan_pages import (
+    MENU_CLICK_WAITS, REPORT_TABLE_SCRIPT, course_from_row, report_columns, report_header, step_timeout,
+)
 
 
 class CourseRetrieveCrawler(GolestanBaseCrawler):
@@ -8,58 +12,69 @@ class CourseRetrieveCrawler(GolestanBaseCrawler):
         form_body_frame2 = iframe_locator2.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
 
         search_button = form_body_frame2.locator('//*[@id="F20851"]')
-        search_button.wait_for(state="visible")
+        search_button.wait_for(state="visible", timeout=step_timeout('menu'))
         search_button.fill("212")
 
         search_click_button = form_body_frame2.locator('//*[@id="OK"]')
-        search_click_button.wait_for(state="visible")
-        max_tries = 20
+        search_click_button.wait_for(state="visible", timeout=step_timeout('menu'))
+        report_frame = self.page.locator("iframe#Faci3")
 
-        while max_tries > 0:
-            if self.page.locator("iframe#Faci3").count() > 0:
-                return
+        for share in MENU_CLICK_WAITS:
             search_click_button.click()
-            self.page.wait_for_timeout(100)
-            max_tries -= 1
+            self.trace.count('menu_clicks')
+            try:
+                report_frame.wait_for(state="attached", timeout=step_timeout('menu') * share)
+                return
+            except PlaywrightTimeoutError:
+                pass
 
         raise Exception("Couldn't find the 212 report page after multiple attempts.")
 
-    def __extract_courses(self):
-        """ Extract the course list from the page and return as structured data. """
+    def __open_report(self):
+        """ Export the 212 report to its popup page and wait for the table. """
         iframe_locator3 = self.page.frame_locator("iframe#Faci3")
         commander = iframe_locator3.frame_locator("frame[name='Commander']")
+        export_button = commander.locator('//*[@id="ExToEx"]')
+        export_button.wait_for(state="visible", timeout=step_timeout('report'))
 
-        with self.page.expect_popup() as new_tab_info:
-            self.page.wait_for_timeout(100)
-            commander.locator('//*[@id="ExToEx"]').click()
+        with self.page.expect_popup(timeout=step_timeout('report')) as new_tab_info:
+            export_button.click()
         course_page = new_tab_info.value
 
-        course_page.wait_for_selector("table")
-        main_table = course_page.locator("table").first
-        rows = main_table.locator("> tbody > tr")
-        all_data = rows.all_inner_texts()
-        student_course_data_list = []
+        course_page.wait_for_selector("table", timeout=step_timeout('report'))
+        return course_page
+
+    def __extract_courses(self):
+        """ Extract the course list from the page and return as structured data. """
+        course_page = self.__open_report()
+        table = course_page.evaluate(REPORT_TABLE_SCRIPT, {"start": 0, "count": None})
+        columns = report_columns(report_header(table))
+        rows = table["rows"][1:]
+
+        return [course_from_row(course_data, columns) for course_data in rows]
 
-        for i in range(1, len(all_data)):
-            course_data = all_data[i].split('\t')
-            student_course_data_list.append({
-                'course_code': course_data[3],
-                'course_name': course_data[4],
-                'theory': course_data[5],
-                'practical': course_data[6],
-                'capacity': course_data[7],
-                'gender': course_data[8],
-                'professor_name': course_data[9],
-                'classes': course_data[10],
-                'class_location': course_data[11],
-                'prerequisites': course_data[12:-1],
-                'notes': course_data[-1]
-            })
+    def __stream_courses(self, chunk_size):
+        with self.trace.span('report'):
+            course_page = self.__open_report()
+            table = course_page.evaluate(REPORT_TABLE_SCRIPT, {"start": 0, "count": 1})
+        columns = report_columns(report_header(table))
 
-        return student_course_data_list
+        for start in range(1, table["total"], chunk_size):
+            with self.trace.span('report'):
+                chunk = course_page.evaluate(REPORT_TABLE_SCRIPT, {"start": start, "count": chunk_size})
+            yield [course_from_row(course_data, columns) for course_data in chunk["rows"]]
 
     def fetch_student_courses(self, username, password):
         """ Main function to fetch student courses. """
         self.login(username, password)
-        self.__search_courses()
-        return self.__extract_courses()
+        with self.trace.span('menu'):
+            self.__search_courses()
+        with self.trace.span('report'):
+            return self.__extract_courses()
+
+    def stream_student_courses(self, username, password, chunk_size=200):
+        """ fetch_student_courses for very large reports: yields the courses in lists of at most chunk_size. """
+        self.login(username, password)
+        with self.trace.span('menu'):
+            self.__search_courses()
+        yield from self.__stream_courses(chunk_size)
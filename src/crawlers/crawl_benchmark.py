@@ -0,0 +1,110 @@
+import asyncio
+import itertools
+import queue
+import threading
+from time import perf_counter
+from django.db import connections
+from src.crawlers.async_browser_pool import get_async_browser_pool
+from src.crawlers.async_course_retrieve_crawler import AsyncCourseRetrieveCrawler
+from src.crawlers.browser_pool import get_browser_pool
+from src.crawlers.captcha_solver.benchmark import percentiles
+from src.crawlers.course_retrieve_crawler import CourseRetrieveCrawler
+from src.crawlers.http_course_retrieve_crawler import HttpCourseRetrieveCrawler
+
+
+ENGINES = ("playwright", "async", "http")
+
+# every crawl logs in as another student, so none of them resumes the session of an earlier one
+_student_ids = itertools.count(90000000)
+
+
+def _crawl(crawler_class, password):
+    crawler = crawler_class()
+    try:
+        return crawler.fetch_student_courses(str(next(_student_ids)), password)
+    finally:
+        crawler.close()
+
+
+def _run_threads(crawler_class, concurrency, crawls, password):
+    """ `crawls` crawls on `concurrency` threads, each with the browser pool of its thread. """
+    jobs = queue.Queue()
+    for _ in range(crawls):
+        jobs.put(None)
+    results = []
+
+    def worker():
+        try:
+            while True:
+                try:
+                    jobs.get_nowait()
+                except queue.Empty:
+                    return
+                start = perf_counter()
+                try:
+                    courses = len(_crawl(crawler_class, password))
+                    results.append((perf_counter() - start, courses, None))
+                except Exception as e:
+                    results.append((perf_counter() - start, 0, repr(e)))
+        finally:
+            if crawler_class is CourseRetrieveCrawler:
+                get_browser_pool().close()
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+async def _run_async(concurrency, crawls, password):
+    """ `crawls` crawls on one event loop, at most `concurrency` at a time, sharing its browser pool. """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def crawl():
+        async with semaphore:
+            start = perf_counter()
+            try:
+                async with AsyncCourseRetrieveCrawler() as crawler:
+                    courses = await crawler.fetch_student_courses(str(next(_student_ids)), password)
+                return perf_counter() - start, len(courses), None
+            except Exception as e:
+                return perf_counter() - start, 0, repr(e)
+
+    try:
+        return await asyncio.gather(*(crawl() for _ in range(crawls)))
+    finally:
+        await get_async_browser_pool().close()
+
+
+def run_crawl_benchmark(engine, concurrency_levels, crawls, password):
+    """
+    Crawl report 212 `crawls` times at each concurrency level against GOLESTAN_BASE_URL (usually a FakeGolestan):
+    per-crawl latency, crawls per second and failures of each level.
+    """
+    levels = []
+
+    for concurrency in concurrency_levels:
+        start = perf_counter()
+        if engine == "async":
+            results = asyncio.run(_run_async(concurrency, crawls, password))
+        else:
+            crawler_class = HttpCourseRetrieveCrawler if engine == "http" else CourseRetrieveCrawler
+            results = _run_threads(crawler_class, concurrency, crawls, password)
+        seconds = perf_counter() - start
+
+        succeeded = [duration for duration, _, error in results if error is None]
+        errors = [error for _, _, error in results if error is not None]
+        levels.append({
+            "concurrency": concurrency,
+            "crawls": len(results),
+            "failed": len(errors),
+            "courses": max((courses for _, courses, _ in results), default=0),
+            "latency": percentiles(succeeded),
+            "crawls_per_second": round(len(succeeded) / seconds, 3) if seconds else None,
+            "errors": sorted(set(errors))[:5],
+        })
+
+    return {"engine": engine, "levels": levels}
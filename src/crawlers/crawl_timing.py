@@ -0,0 +1,78 @@
+import json
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+from uuid import uuid4
+
+
+logger = logging.getLogger(__name__)
+
+# the stages a crawl's time is split into, as named by CRAWLER_STEP_TIMEOUTS where they have a timeout;
+# the waits before a crawl starts are recorded as slot_wait and job_wait spans of the 'admission' crawler
+STAGES = ("browser", "session", "login_page", "captcha_refresh", "captcha", "solve", "login", "menu", "report", "save", "total")
+
+
+class CrawlTrace:
+    """
+    Named timing spans and attempt counters of one crawl.
+    Every span is kept, so a stage run several times (a login page loaded once per captcha) shows up as
+    several spans. finish() logs the trace as one JSON line and stores its spans for the timing metrics.
+    """
+
+    def __init__(self, crawler, trace_id=None):
+        self.trace_id = trace_id or uuid4()
+        self.crawler = crawler
+        self.spans = []
+        self.counters = Counter()
+        self.started = perf_counter()
+        self.finished = False
+
+    @contextmanager
+    def span(self, stage):
+        start = perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.spans.append({"stage": stage, "duration_ms": (perf_counter() - start) * 1000, "failed": failed})
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def stage_totals(self):
+        """ Total milliseconds and number of spans of each stage. """
+        totals = {}
+        for span in self.spans:
+            total = totals.setdefault(span["stage"], {"ms": 0.0, "spans": 0})
+            total["ms"] += span["duration_ms"]
+            total["spans"] += 1
+        return {stage: {"ms": round(total["ms"], 3), "spans": total["spans"]} for stage, total in totals.items()}
+
+    def finish(self):
+        """
+        Log the trace and store its spans, once. The crawl counts as failed when an exception left one of its spans.
+        """
+        if self.finished:
+            return
+        self.finished = True
+
+        failed = any(span["failed"] for span in self.spans)
+
+        total = {"stage": "total", "duration_ms": (perf_counter() - self.started) * 1000, "failed": failed}
+        self.spans.append(total)
+        payload = {
+            "trace_id": str(self.trace_id),
+            "crawler": self.crawler,
+            "failed": failed,
+            "total_ms": round(total["duration_ms"], 3),
+            "stages": self.stage_totals(),
+            "counters": dict(self.counters),
+        }
+        logger.info("crawl trace %s", json.dumps(payload), extra={"crawl_trace": payload})
+
+        from src.crawlers.services import record_crawl_spans
+        record_crawl_spans(self.trace_id, self.crawler, self.spans)
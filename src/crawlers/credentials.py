@@ -0,0 +1,18 @@
+import base64
+import hashlib
+from cryptography.fernet import Fernet
+from django.conf import settings
+
+
+def _fernet():
+    key = hashlib.sha256(f"crawler-credentials:{settings.SECRET_KEY}".encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def encrypt_secret(value):
+    """ Encrypt a Golestan password (or any secret) for storage, with a key derived from SECRET_KEY. """
+    return _fernet().encrypt(value.encode())
+
+
+def decrypt_secret(token):
+    return _fernet().decrypt(bytes(token)).decode()
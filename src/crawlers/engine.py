@@ -0,0 +1,88 @@
+import logging
+import os
+import requests
+from asgiref.sync import SyncToAsync, async_to_sync
+from django.conf import settings
+from .admission import crawl_slot
+from .async_course_retrieve_crawler import AsyncCourseRetrieveCrawler
+from .async_student_validator_crawler import AsyncStudentValidatorCrawler
+from .course_retrieve_crawler import CourseRetrieveCrawler
+from .http_course_retrieve_crawler import GolestanProtocolError, HttpCourseRetrieveCrawler
+from .student_validator_crawler import StudentValidatorCrawler
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch_student_courses(username, password, trace=None):
+    async with AsyncCourseRetrieveCrawler(trace) as crawler:
+        return await crawler.fetch_student_courses(username, password)
+
+
+async def _fetch_student_info(username, password):
+    async with AsyncStudentValidatorCrawler() as crawler:
+        return await crawler.fetch_student_info(username, password)
+
+
+def server_event_loop():
+    """ The running event loop of the ASGI server when called from one of its request threads, else None. """
+    # the same lookup async_to_sync does to find the loop it should run on
+    if getattr(SyncToAsync.threadlocal, "main_event_loop_pid", None) != os.getpid():
+        return None
+    loop = getattr(SyncToAsync.threadlocal, "main_event_loop", None)
+    return loop if loop is not None and loop.is_running() else None
+
+
+def use_async_engine():
+    """
+    Crawl on the event loop the caller was handed off from: that of `run_crawl_worker`, so the jobs it runs at
+    once share its browser pool, or of the server under ASGI. Under WSGI there is no long-lived loop to keep
+    browsers on, so the sync crawlers are used.
+    """
+    return settings.CRAWLER_ASYNC_ENGINE and server_event_loop() is not None
+
+
+def fetch_student_courses(username, password, trace=None):
+    """
+    Log in to Golestan and return the raw rows of the 212 course report.
+    With CRAWLER_BACKEND = 'http' the experimental browserless crawler is tried first; anything it can't
+    complete, a login it can't confirm included, falls back to Playwright.
+    The spans of the crawl go to `trace` when given (a CrawlTrace the caller finishes), else to one per crawler.
+    Browser crawls wait for a crawl slot for as long as it takes: they are run by crawl workers, whose jobs
+    are already bounded by CRAWL_JOB_QUEUE_SIZE.
+    """
+    if settings.CRAWLER_BACKEND == 'http':
+        crawler = HttpCourseRetrieveCrawler(trace)
+        try:
+            return crawler.fetch_student_courses(username, password)
+        except (GolestanProtocolError, requests.RequestException):
+            logger.warning("http crawl failed, falling back to playwright", exc_info=True)
+        finally:
+            crawler.close()
+
+    with crawl_slot(queue=False):
+        if use_async_engine():
+            return async_to_sync(_fetch_student_courses)(username, password, trace)
+
+        crawler = CourseRetrieveCrawler(trace)
+        try:
+            return crawler.fetch_student_courses(username, password)
+        finally:
+            crawler.close()
+
+
+def fetch_student_info(username, password):
+    """
+    Log in to Golestan and return the student's number, name, major and faculty.
+    The crawl answers a request, so it waits CRAWLER_SLOT_WAIT seconds at most for a crawl slot, else
+    raises CrawlerBusy.
+    """
+    with crawl_slot(wait=settings.CRAWLER_SLOT_WAIT):
+        if use_async_engine():
+            return async_to_sync(_fetch_student_info)(username, password)
+
+        crawler = StudentValidatorCrawler()
+        try:
+            return crawler.fetch_student_info(username, password)
+        finally:
+            crawler.close()
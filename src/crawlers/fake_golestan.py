@@ -0,0 +1,296 @@
+import base64
+import html
+import json
+import random
+import secrets
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from src.crawlers.captcha_solver.benchmark import CORPUS_DIR, load_corpus
+from src.crawlers.golestan_pages import (
+    HTTP_CAPTCHA_PATH, HTTP_LOGIN_PATH, HTTP_REPORT_PATH, LOGIN_PATH, WRONG_CAPTCHA_MESSAGE, WRONG_CREDENTIALS_MESSAGE,
+)
+
+
+SESSION_COOKIE = "ASP.NET_SessionId"
+
+# header of report 212 as Golestan writes it, with the Arabic forms of yeh and kaf
+REPORT_HEADER = (
+    "دانشكده درس", "گروه آموزشي", "مقطع", "شماره و گروه درس", "نام درس", "نظري", "عملي", "ظرفيت", "جنسيت",
+    "نام استاد", "زمان و مكان ارائه/ امتحان", "محل برگزاري", "پيش نياز", "هم نياز", "توضيحات",
+)
+DAYS = ("شنبه", "يك شنبه", "دو شنبه", "سه شنبه", "چهار شنبه")
+GENDERS = ("مختلط", "مرد", "زن")
+
+TOP_PAGE = """<html><head><meta charset="utf-8"><title>Golestan</title></head><body>
+<iframe id="Faci1" src="/_fake/faci.htm?body=login&amp;side=Message"></iframe>{menu}
+</body></html>"""
+MENU_IFRAME = '\n<iframe id="Faci2" src="/_fake/faci.htm?body=menu&amp;side=Message"></iframe>'
+
+# every form lives in a Faci iframe > Master frame > Form_Body frame; Faci1 and Faci2 have a Message frame
+# next to Master, Faci3 a Commander frame
+FACI_PAGE = """<html><head><meta charset="utf-8"></head><frameset rows="*,40">
+<frame name="Master" src="/_fake/master.htm?body={body}"><frame name="{side}" src="/_fake/{side_page}.htm">
+</frameset></html>"""
+MASTER_PAGE = """<html><head><meta charset="utf-8"></head><frameset rows="*">
+<frame name="Form_Body" src="{src}"></frameset></html>"""
+MESSAGE_PAGE = '<html><head><meta charset="utf-8"></head><body><span id="errtxt" title=""></span></body></html>'
+COMMANDER_PAGE = """<html><head><meta charset="utf-8"></head><body>
+<input type="button" id="ExToEx" value="Excel" onclick="window.open('/_fake/report212.htm')">
+</body></html>"""
+
+LOGIN_FORM = """<html><head><meta charset="utf-8"></head><body>
+<form method="post" action="{action}"{target}>
+<input type="hidden" name="__VIEWSTATE" value="{viewstate}">
+<input id="F80351" name="F80351"><input id="F80401" name="F80401" type="password">
+<img id="imgCaptcha" src="{captcha}?rnd={rnd}"><input id="F51701" name="F51701">
+<input type="submit" id="btnLog" value="ورود">
+</form>{result_frame}</body></html>"""
+# with keep_login_form, the login is posted into this frame, so the form stays open after a wrong captcha
+LOGIN_RESULT_FRAME = '<iframe name="loginResult" style="display: none"></iframe>'
+
+
+# answer to a login post, shown in Form_Body or in the hidden frame of a kept form: a message goes to the
+# Message frame next to Master, a login opens the menu in Faci2
+LOGIN_RESULT = """<html><head><meta charset="utf-8"></head><body>
+<span id="errtxt" title="{title}">{title}</span>
+<script>
+(function () {{
+    var message = {message};
+    if (message) {{
+        var faci = parent;
+        while (!faci.frames['Message'] && faci !== window.top) {{
+            faci = faci.parent;
+        }}
+        faci.frames['Message'].document.getElementById('errtxt').setAttribute('title', message);
+        return;
+    }}
+    var top = window.top.document;
+    if (!top.getElementById('Faci2')) {{
+        var menu = top.createElement('iframe');
+        menu.id = 'Faci2';
+        menu.src = '/_fake/faci.htm?body=menu&side=Message';
+        top.body.appendChild(menu);
+    }}
+}})();
+</script></body></html>"""
+
+MENU_FORM = """<html><head><meta charset="utf-8"></head><body>
+<input id="F20851" name="F20851"><input type="button" id="OK" value="تایید" onclick="openForm()">
+<table><tr><td onclick="openFaci3('student')"><span>اطلاعات جامع دانشجو</span></td></tr></table>
+<script>
+function openFaci3(body) {
+    var top = window.top.document;
+    var old = top.getElementById('Faci3');
+    if (old) {
+        old.remove();
+    }
+    var frame = top.createElement('iframe');
+    frame.id = 'Faci3';
+    frame.src = '/_fake/faci.htm?body=' + body + '&side=Commander';
+    top.body.appendChild(frame);
+}
+function openForm() {
+    if (document.getElementById('F20851').value === '212') {
+        openFaci3('report');
+    }
+}
+</script></body></html>"""
+
+REPORT_FORM = """<html><head><meta charset="utf-8"></head><body>
+<form method="post" action="{action}"><input type="hidden" name="__VIEWSTATE" value="{viewstate}"></form>
+</body></html>"""
+
+STUDENT_FORM = """<html><head><meta charset="utf-8"></head><body>
+<label id="F51851">{full_name}</label><input id="F41251" value="{student_id}">
+<span id="F17551">مهندسی کامپیوتر</span><span id="F61151">فنی و مهندسی</span>
+</body></html>"""
+
+
+def report_row(index):
+    """ A report 212 row that the course cleaner accepts; the same index always gives the same row. """
+    day = DAYS[index % len(DAYS)]
+    start = 8 + 2 * (index % 5)
+    classes = (f"درس(ت): {day} {start}:00-{start + 2}:00<br>"
+               f"امتحان(1404.03.{10 + index % 18:02d}) ساعت : {start}:00-{start + 2}:00")
+    return (
+        "فني و مهندسي", "كامپيوتر", "كارشناسي", f"{1212000 + index}_01", f"درس {index}", "3", "0",
+        str(20 + index % 40), GENDERS[index % len(GENDERS)], f"استاد {index % 97}", classes,
+        f"كلاس {index % 30}", f"{1211000 + index}" if index % 3 else "", "", "",
+    )
+
+
+def report_page(courses):
+    rows = [REPORT_HEADER] + [report_row(index) for index in range(courses)]
+    cells = "\n".join(
+        "<tr>" + "".join(f"<td>{cell if '<br>' in cell else html.escape(cell)}</td>" for cell in row) + "</tr>"
+        for row in rows
+    )
+    return f'<html><head><meta charset="utf-8"></head><body><table>\n{cells}\n</table></body></html>'
+
+
+class FakeGolestan:
+    """
+    A local stand-in for the Golestan pages the crawlers use, to exercise them offline.
+    Any student id logs in with `password`; captchas come from a labelled corpus and must be answered
+    with their label unless `check_captcha` is off. Report 212 has `courses` rows, and every response
+    is delayed by `latency` seconds. Sessions are kept in memory, keyed by the ASP.NET_SessionId cookie.
+    A login post replaces the form in Form_Body. With `keep_login_form` it goes to a hidden frame instead and
+    the form stays open after a wrong captcha, which the crawlers' in-place captcha refresh assumes of the
+    live portal without it having been checked there.
+    """
+
+    def __init__(self, password="secret", courses=300, corpus_dir=CORPUS_DIR, check_captcha=True, latency=0.0,
+                 keep_login_form=False):
+        self.password = password
+        self.courses = courses
+        self.check_captcha = check_captcha
+        self.keep_login_form = keep_login_form
+        self.latency = latency
+        self.captchas = [(label, base64.b64decode(image)) for label, image in load_corpus(corpus_dir)]
+        if not self.captchas:
+            raise ValueError(f"no captcha images found in {corpus_dir}")
+
+        self.report = report_page(courses)
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.server = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host="127.0.0.1", port=0):
+        """ Serve on a background thread; port 0 picks a free port, see base_url. """
+        self.server = ThreadingHTTPServer((host, port), FakeGolestanHandler)
+        self.server.daemon_threads = True
+        self.server.golestan = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def session(self, session_id):
+        """ The state of a session, created when the id is unknown; returns (id, state). """
+        with self.lock:
+            if session_id not in self.sessions:
+                session_id = secrets.token_hex(12)
+                self.sessions[session_id] = {"captcha": None, "student_id": None}
+            return session_id, self.sessions[session_id]
+
+    def next_captcha(self, state):
+        label, image = random.choice(self.captchas)
+        state["captcha"] = label
+        return image
+
+    def login(self, state, fields):
+        """ The message a login post gets, None when it logged in. """
+        captcha, state["captcha"] = state["captcha"], None
+        if self.check_captcha and (captcha is None or fields.get("F51701", "").strip().lower() != captcha.lower()):
+            return WRONG_CAPTCHA_MESSAGE
+
+        if fields.get("F80401") != self.password:
+            return WRONG_CREDENTIALS_MESSAGE
+
+        state["student_id"] = fields.get("F80351", "")
+        return None
+
+
+class FakeGolestanHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def route(self, method):
+        golestan = self.server.golestan
+        if golestan.latency:
+            time.sleep(golestan.latency)
+
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        session_id, state = golestan.session(cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None)
+        self.session_id = session_id
+        self.new_session = SESSION_COOKIE not in cookie or cookie[SESSION_COOKIE].value != session_id
+
+        path = url.path.lower()
+        logged_in = state["student_id"] is not None
+
+        if path == LOGIN_PATH.lower():
+            return self.send_page(TOP_PAGE.format(menu=MENU_IFRAME if logged_in else ""))
+        if path == "/_fake/faci.htm":
+            side = query.get("side", "Message")
+            return self.send_page(FACI_PAGE.format(
+                body=query.get("body", "login"), side=side, side_page="commander" if side == "Commander" else "message"))
+        if path == "/_fake/master.htm":
+            return self.send_page(MASTER_PAGE.format(src=self.form_body_url(query.get("body", "login"))))
+        if path == "/_fake/message.htm":
+            return self.send_page(MESSAGE_PAGE)
+        if path == "/_fake/commander.htm":
+            return self.send_page(COMMANDER_PAGE)
+
+        if path == HTTP_CAPTCHA_PATH.lower():
+            return self.send_body(golestan.next_captcha(state), "image/png")
+        if path == HTTP_LOGIN_PATH.lower():
+            if method == "GET":
+                return self.send_page(LOGIN_FORM.format(
+                    action=HTTP_LOGIN_PATH, viewstate=secrets.token_hex(8), captcha=HTTP_CAPTCHA_PATH,
+                    rnd=random.random(), target=' target="loginResult"' if golestan.keep_login_form else "",
+                    result_frame=LOGIN_RESULT_FRAME if golestan.keep_login_form else ""))
+            message = golestan.login(state, fields)
+            return self.send_page(LOGIN_RESULT.format(
+                title=html.escape(message or ""), message=json.dumps(message or "")))
+
+        if not logged_in:
+            return self.send_page(TOP_PAGE.format(menu=""))
+
+        if path == "/_fake/menu.htm":
+            return self.send_page(MENU_FORM)
+        if path == "/_fake/student.htm":
+            return self.send_page(STUDENT_FORM.format(
+                full_name=f"دانشجو {html.escape(state['student_id'])}", student_id=html.escape(state["student_id"])))
+        if path in ("/_fake/report.htm", "/_fake/report212.htm") or path == HTTP_REPORT_PATH.lower():
+            if path == "/_fake/report212.htm" or (method == "POST" and fields.get("F20851") == "212"):
+                return self.send_page(golestan.report)
+            return self.send_page(REPORT_FORM.format(action=HTTP_REPORT_PATH, viewstate=secrets.token_hex(8)))
+
+        self.send_body(b"not found", "text/plain", status=404)
+
+    @staticmethod
+    def form_body_url(body):
+        return {
+            "login": HTTP_LOGIN_PATH,
+            "menu": "/_fake/menu.htm",
+            "report": "/_fake/report.htm",
+            "student": "/_fake/student.htm",
+        }.get(body, HTTP_LOGIN_PATH)
+
+    def send_page(self, page):
+        self.send_body(page.encode(), "text/html; charset=utf-8")
+
+    def send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        if self.new_session:
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}={self.session_id}; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(body)
@@ -1,29 +1,80 @@
-import base64
 from abc import ABC
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from playwright.sync_api import sync_playwright
-from src.crawlers.captcha_solver.captcha_solver import solve
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from src.crawlers.browser_pool import get_browser_pool
+from src.crawlers.captcha_login import PASSED, REFETCHED, UNKNOWN, WRONG, LoginAttempts, answer_captcha
+from src.crawlers.crawl_timing import CrawlTrace
+from src.crawlers.request_routing import RequestRouter
+from src.crawlers.session_cache import drop_session, load_session, save_session
+from src.crawlers.golestan_pages import (
+    CAPTCHA_REFRESH_SCRIPT, LOGIN_OUTCOME_SCRIPT, LOGIN_PATH, MAX_LOGIN_TRIES, WRONG_CAPTCHA_MESSAGE,
+    WRONG_CREDENTIALS_MESSAGE, golestan_url, is_captcha_response, step_timeout,
+)
 
 
 class GolestanBaseCrawler(ABC):
-    def __init__(self):
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=True)
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+    def __init__(self, trace=None):
+        # a trace passed in belongs to the caller, which finishes it
+        self.trace = trace or CrawlTrace(type(self).__name__)
+        self.owns_trace = trace is None
+        self.browser_pool = get_browser_pool()
+        with self.trace.span('browser'):
+            self.context = self.browser_pool.acquire()
+            try:
+                self.router = RequestRouter.from_settings()
+                if settings.CRAWLER_BLOCK_REQUESTS:
+                    self.router.attach(self.context)
+                self.page = self.context.new_page()
+            except Exception:
+                # nobody will close() a crawler that failed to start, so its context goes back to the pool here
+                self.browser_pool.release(self.context)
+                raise
+        self.captcha_response = None
+        self.page.on("response", self.__on_response)
 
     def __navigate_to_login_page(self):
         """ Open the login page and wait for it to load. """
-        self.page.goto("https://golestan.ui.ac.ir/forms/authenticateuser/main.htm")
-        self.page.wait_for_load_state("load")
+        self.captcha_response = None
+        with self.trace.span('login_page'):
+            self.page.goto(golestan_url(LOGIN_PATH), wait_until="load", timeout=step_timeout('login_page'))
+
+    def __refresh_captcha(self):
+        """
+        Load a new captcha into the login form that is still open after a wrong one, without opening the page again.
+        False when the form is gone or can't be reached, so the login page has to be opened.
+        """
+        self.captcha_response = None
+        with self.trace.span('captcha_refresh'):
+            try:
+                return bool(self.page.evaluate(CAPTCHA_REFRESH_SCRIPT))
+            except PlaywrightError:
+                return False
+
+    def __on_response(self, response):
+        if is_captcha_response(response):
+            self.captcha_response = response
 
     def __extract_captcha(self):
-        """ Extract the captcha image as a base64 string. """
+        """
+        The captcha as the bytes Golestan sent for it, taken from the image response of the login form.
+        A captcha that never came over the network (e.g. a cached image) is screenshot instead.
+        """
+        with self.trace.span('captcha'):
+            return self.__captcha_image()
+
+    def __captcha_image(self):
+        try:
+            response = self.captcha_response or self.page.wait_for_event(
+                "response", predicate=is_captcha_response, timeout=step_timeout('captcha'))
+            return response.body()
+        except PlaywrightError:
+            pass
+
         iframe_locator = self.page.frame_locator("iframe#Faci1")
         form_body_frame = iframe_locator.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
         captcha_element = form_body_frame.locator('img[id="imgCaptcha"]')
-        captcha_byte = captcha_element.screenshot()
-        return base64.b64encode(captcha_byte).decode("utf-8")
+        return captcha_element.screenshot(timeout=step_timeout('captcha'))
 
     def __submit_login(self, username, password, captcha_text):
         """ Fill in login details and submit the form. """
@@ -38,61 +89,115 @@ class GolestanBaseCrawler(ABC):
         pass_field.fill(password)
         captcha_field.fill(captcha_text)
 
-        # Click login button
+        # Click login button; the outcome is awaited by __check_login_status
         login_button = form_body_frame.locator('//*[@id="btnLog"]')
         login_button.click()
-        self.page.wait_for_load_state("networkidle")
 
     def __check_login_status(self):
         """ Check if login was successful or failed (captcha or wrong password). """
-        iframe_locator = self.page.frame_locator("iframe#Faci1")
-        message_frame = iframe_locator.frame_locator("frame[name='Message']")
-        max_tries = 20
+        try:
+            outcome = self.page.wait_for_function(
+                LOGIN_OUTCOME_SCRIPT,
+                arg=[WRONG_CREDENTIALS_MESSAGE, WRONG_CAPTCHA_MESSAGE],
+                timeout=step_timeout('login'),
+            ).json_value()
+        except PlaywrightTimeoutError:
+            raise Exception("unknown error")
 
-        while max_tries > 0:
-            if self.page.locator("iframe#Faci2").count() > 0:
-                print("Login successful!")
-                return True
+        if outcome == WRONG_CREDENTIALS_MESSAGE:
+            raise ValueError(_("username or password is incorrect"))
 
-            err_txt = message_frame.locator("#errtxt")
-            error_message = err_txt.get_attribute("title")
+        if outcome == WRONG_CAPTCHA_MESSAGE:
+            print("wrong_captcha")
+            return False
 
-            if error_message and error_message == "کد1 : شناسه کاربري يا گذرواژه اشتباه است.":
-                raise ValueError(_("username or password is incorrect"))
+        print("Login successful!")
+        return True
 
-            if error_message and error_message == "لطفا كد امنيتي را به صورت صحيح وارد نماييد":
-                print("wrong_captcha")
-                return False
+    def login(self, username, password):
+        """ Main function to login in golestan. """
+        if self.__resume_session(username, password):
+            return
 
-            self.page.wait_for_timeout(100)
-            max_tries -= 1
+        attempts = LoginAttempts()
 
-        raise Exception("unknown error")
+        try:
+            self.__login(username, password, attempts)
+        finally:
+            attempts.save()
 
-    def login(self, username, password):
-        """ Main function to login in golestan. """
-        max_tries = 20
+        save_session(username, password, self.context.storage_state())
 
-        while max_tries > 0:
-            self.__navigate_to_login_page()
-            captcha_b64 = self.__extract_captcha()
+    def __resume_session(self, username, password):
+        """ Continue a recently saved session of the same student, skipping the login form and its captcha. """
+        state = load_session(username, password)
+        if state is None:
+            return False
 
+        self.context.add_cookies(state["cookies"])
+        self.__navigate_to_login_page()
+
+        with self.trace.span('session'):
             try:
-                captcha_text = solve(captcha_b64)
-            except Exception:
+                # with no message to look for, this only resolves once the main menu is open
+                self.page.wait_for_function(LOGIN_OUTCOME_SCRIPT, arg=[], timeout=step_timeout('session'))
+                resumed = True
+            except PlaywrightTimeoutError:
+                resumed = False
+
+        if not resumed:
+            self.trace.count('expired_sessions')
+            drop_session(username)
+            self.context.clear_cookies()
+            return False
+
+        self.trace.count('resumed_sessions')
+        return True
+
+    def __login(self, username, password, attempts):
+        max_tries = MAX_LOGIN_TRIES
+        refetches_left = settings.CAPTCHA_MAX_REFETCHES
+        form_open = False
+
+        while max_tries > 0:
+            # the first try opens the login page, later ones only swap the captcha in the form left open
+            if not (form_open and self.__refresh_captcha()):
+                self.__navigate_to_login_page()
+            form_open = True
+            captcha_image = self.__extract_captcha()
+            with self.trace.span('solve'):
+                answer = answer_captcha(captcha_image, refetches_left)
+
+            if answer.text is None:
+                attempts.record(answer, REFETCHED)
+                self.trace.count(REFETCHED)
+                refetches_left -= 1
+                if refetches_left < 0:
+                    max_tries -= 1
                 continue
 
-            self.__submit_login(username, password, captcha_text)
-            if self.__check_login_status():
+            try:
+                with self.trace.span('login'):
+                    self.__submit_login(username, password, answer.text)
+                    logged_in = self.__check_login_status()
+            except ValueError:
+                # wrong credentials: the captcha is not known to be right, so it is no training sample
+                attempts.record(answer, UNKNOWN)
+                raise
+
+            attempts.record(answer, PASSED if logged_in else WRONG)
+            if logged_in:
                 break
 
+            self.trace.count(WRONG)
             max_tries -= 1
 
         if max_tries == 0:
             raise ValueError(_("Login failed"))
 
     def close(self):
-        """ Clean up Playwright resources. """
-        self.context.close()
-        self.browser.close()
-        self.playwright.stop()
+        """ Give the browser context back to the pool and report the timing of the crawl. """
+        self.router.log_stats()
+        self.browser_pool.release(self.context)
+        if self.owns_trace:
+            self.trace.finish()
@@ -0,0 +1,90 @@
+import re
+from html.parser import HTMLParser
+
+
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+
+def _inner_text(parts):
+    """ Text of a cell the way innerText renders it: <br> as a newline, runs of spaces collapsed. """
+    lines = "".join(parts).split("\n")
+    return "\n".join(_SPACES.sub(" ", line).strip() for line in lines).strip()
+
+
+class _ReportTableParser(HTMLParser):
+    """ Cells of the direct rows of the first table of a page; nested tables stay inside their cell. """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.depth = 0
+        self.done = False
+        self.row = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self.depth += 1
+        elif self.depth == 1 and tag == "tr":
+            self.row = []
+        elif self.depth == 1 and tag in ("td", "th") and self.row is not None:
+            self.cell = []
+        elif tag == "br" and self.cell is not None:
+            self.cell.append("\n")
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == "table":
+            self.depth -= 1
+            self.done = self.depth == 0
+        elif self.depth == 1 and tag in ("td", "th") and self.cell is not None:
+            self.row.append(_inner_text(self.cell))
+            self.cell = None
+        elif self.depth == 1 and tag == "tr" and self.row is not None:
+            self.rows.append(self.row)
+            self.row = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def report_rows(html):
+    """ The rows of the first table of a report page as lists of cell texts, header row included. """
+    parser = _ReportTableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+class _FormParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {}
+        self.titles = {}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "input" and attrs.get("name") and attrs.get("type", "text").lower() in ("hidden", "text"):
+            self.fields[attrs["name"]] = attrs.get("value") or ""
+        if attrs.get("id") and attrs.get("title") is not None:
+            self.titles[attrs["id"]] = attrs["title"]
+
+
+def form_fields(html):
+    """ The hidden and text inputs of a form page by name, e.g. the ASP.NET view state to post back. """
+    parser = _FormParser()
+    parser.feed(html)
+    parser.close()
+    return parser.fields
+
+
+def element_title(html, element_id):
+    """ The title attribute of the element with the given id, where Golestan puts its messages. """
+    parser = _FormParser()
+    parser.feed(html)
+    parser.close()
+    return parser.titles.get(element_id)
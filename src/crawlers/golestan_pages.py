@@ -0,0 +1,169 @@
+import re
+from django.conf import settings
+
+
+LOGIN_PATH = "/forms/authenticateuser/main.htm"
+
+# form pages posted to by the HTTP backend; the frameset loads the same pages into its frames.
+# These paths, and the field names posted to them, are read off the pages' DOM and haven't been checked
+# against the live portal's form posts
+HTTP_LOGIN_PATH = "/Forms/AuthenticateUser/AuthUser.aspx"
+HTTP_CAPTCHA_PATH = "/Forms/AuthenticateUser/captcha.aspx"
+HTTP_REPORT_PATH = "/Forms/F0202_PROCESS_REP_FILTER/F0202_01_PROCESS_REP_FILTER_DAT.ASPX"
+
+CAPTCHA_URL = re.compile(r"(?i)captcha")
+
+WRONG_CREDENTIALS_MESSAGE = "کد1 : شناسه کاربري يا گذرواژه اشتباه است."
+WRONG_CAPTCHA_MESSAGE = "لطفا كد امنيتي را به صورت صحيح وارد نماييد"
+
+MAX_LOGIN_TRIES = 20
+
+# Golestan sometimes ignores the first click on a menu button: it is clicked again after each of these
+# shares of the step timeout passes without the next frame attaching
+MENU_CLICK_WAITS = (0.05, 0.25, 0.7)
+
+
+# Course fields of a report 212 row: the header keywords of their column, in the order columns are
+# claimed (so "زمان و مکان" goes to classes before class_location looks for "مکان"), and the
+# position the column had when the report was read by index
+REPORT_COLUMNS = {
+    'course_code': (("شماره و گروه", "کد درس", "شماره درس"), 3),
+    'course_name': (("نام درس",), 4),
+    'theory': (("نظری",), 5),
+    'practical': (("عملی",), 6),
+    'capacity': (("ظرفیت",), 7),
+    'gender': (("جنسیت",), 8),
+    'professor_name': (("استاد",), 9),
+    'classes': (("زمان",), 10),
+    'class_location': (("مکان", "محل"), 11),
+    'prerequisites': (("پیش نیاز", "پیشنیاز", "هم نیاز"), 12),
+    'notes': (("توضیحات",), -1),
+}
+
+LEGACY_COLUMNS = {field: index for field, (_, index) in REPORT_COLUMNS.items()}
+
+
+def _normalise_header(text):
+    # Golestan mixes the Arabic and Persian forms of yeh and kaf
+    return " ".join(text.replace("ي", "ی").replace("ك", "ک").replace("\u200c", " ").split())
+
+
+def report_columns(header):
+    """
+    Column index of each course field, found from the header row, or its legacy position when not found.
+    Raises ValueError when that position already holds a column found by its header.
+    """
+    headers = [_normalise_header(cell) for cell in header]
+    columns = {}
+
+    for field, (keywords, fallback) in REPORT_COLUMNS.items():
+        claimed = {index % len(headers) for index in columns.values()}
+        for index, text in enumerate(headers):
+            if index not in claimed and any(keyword in text for keyword in keywords):
+                columns[field] = index
+                break
+        else:
+            if fallback % len(headers) in claimed:
+                raise ValueError(f"report 212 has no {field} column")
+            columns[field] = fallback
+
+    return columns
+
+
+def report_header(table):
+    """ Header row of a REPORT_TABLE_SCRIPT result, raising ValueError when the report has no course row. """
+    if not table or table["total"] < 2:
+        raise ValueError("report 212 has no courses")
+    return table["rows"][0]
+
+
+def course_from_row(course_data, columns=LEGACY_COLUMNS):
+    """ Map the cells of a report 212 row to the raw course fields. """
+    course = {field: course_data[index] for field, index in columns.items() if field != 'prerequisites'}
+    notes = columns['notes'] % len(course_data)
+    course['prerequisites'] = course_data[columns['prerequisites']:notes]
+    return course
+
+
+# Cells of rows [start, start + count) of the first table of the page, as innerText, with the row count;
+# count null reads to the end. One evaluate() returns the whole slice.
+REPORT_TABLE_SCRIPT = """
+({start, count}) => {
+    const table = document.querySelector('table');
+    if (!table) {
+        return null;
+    }
+    const rows = table.rows;
+    const end = count === null ? rows.length : Math.min(rows.length, start + count);
+    const cells = [];
+    for (let i = start; i < end; i++) {
+        cells.push(Array.from(rows[i].cells, cell => cell.innerText.trim()));
+    }
+    return {total: rows.length, rows: cells};
+}
+"""
+
+
+# Resolves once the login either opened the main menu (iframe#Faci2) or showed one of the given
+# messages in Faci1's Message frame; the frames are same-origin, so their documents are reachable.
+LOGIN_OUTCOME_SCRIPT = """
+messages => {
+    if (document.querySelector('iframe#Faci2')) {
+        return 'logged_in';
+    }
+    const faci1 = document.querySelector('iframe#Faci1');
+    const message = faci1 && faci1.contentDocument && faci1.contentDocument.querySelector("frame[name='Message']");
+    const errtxt = message && message.contentDocument && message.contentDocument.querySelector('#errtxt');
+    const title = errtxt && errtxt.getAttribute('title');
+    return messages.includes(title) ? title : false;
+}
+"""
+
+# After a wrong captcha, loads a new captcha into the login form that is still open in Faci1 > Master >
+# Form_Body: the captcha field and the last message are cleared, so LOGIN_OUTCOME_SCRIPT doesn't find
+# the old one again. False, with nothing changed, when the form is gone and the login page has to be opened.
+CAPTCHA_REFRESH_SCRIPT = """
+() => {
+    const faci1 = document.querySelector('iframe#Faci1');
+    const faci1Document = faci1 && faci1.contentDocument;
+    const master = faci1Document && faci1Document.querySelector("frame[name='Master']");
+    const formBody = master && master.contentDocument && master.contentDocument.querySelector("frame[name='Form_Body']");
+    const form = formBody && formBody.contentDocument;
+    const captcha = form && form.querySelector('#imgCaptcha');
+    const captchaField = form && form.querySelector('#F51701');
+    if (!captcha || !captchaField || !form.querySelector('#btnLog')) {
+        return false;
+    }
+    const message = faci1Document.querySelector("frame[name='Message']");
+    const errtxt = message && message.contentDocument && message.contentDocument.querySelector('#errtxt');
+    if (errtxt) {
+        errtxt.setAttribute('title', '');
+    }
+    captchaField.value = '';
+    const src = new URL(captcha.getAttribute('src'), form.baseURI);
+    src.searchParams.set('rnd', Math.random());
+    captcha.src = src.href;
+    return true;
+}
+"""
+
+LOGGED_IN = 'logged_in'
+
+# id of the main menu frame a successful login opens (see LOGIN_OUTCOME_SCRIPT); the HTTP backend only takes a
+# login answer as logged in when it has this
+MAIN_MENU_MARKER = "Faci2"
+
+
+def is_captcha_response(response):
+    """ Whether a page response is the captcha image of the login form. """
+    return response.request.resource_type == "image" and response.ok and CAPTCHA_URL.search(response.url) is not None
+
+
+def golestan_url(path):
+    """ Absolute URL of a Golestan page on GOLESTAN_BASE_URL, the live portal or a stand-in for it. """
+    return settings.GOLESTAN_BASE_URL.rstrip("/") + path
+
+
+def step_timeout(step):
+    """ Timeout of one crawl step in milliseconds, see CRAWLER_STEP_TIMEOUTS. """
+    return settings.CRAWLER_STEP_TIMEOUTS[step]
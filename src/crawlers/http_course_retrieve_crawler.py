@@ -0,0 +1,155 @@
+from functools import cache
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.crawlers.captcha_login import PASSED, REFETCHED, UNKNOWN, WRONG, LoginAttempts, answer_captcha
+from src.crawlers.crawl_timing import CrawlTrace
+from src.crawlers.golestan_html import element_title, form_fields, report_rows
+from src.crawlers.golestan_pages import (
+    HTTP_CAPTCHA_PATH, HTTP_LOGIN_PATH, HTTP_REPORT_PATH, MAIN_MENU_MARKER, WRONG_CAPTCHA_MESSAGE,
+    WRONG_CREDENTIALS_MESSAGE, course_from_row, golestan_url, report_columns,
+)
+
+
+class GolestanProtocolError(Exception):
+    """ Golestan answered the HTTP backend with a page it doesn't understand. """
+
+
+@cache
+def shared_adapter():
+    """ One connection pool for every HTTP crawl of the process; cookies stay per crawl. """
+    return HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=settings.CRAWLER_HTTP_POOL_SIZE,
+        max_retries=Retry(total=2, backoff_factor=0.2, allowed_methods={"GET"}),
+    )
+
+
+class HttpCourseRetrieveCrawler:
+    """
+    CourseRetrieveCrawler without a browser: replays the login and report 212 form posts with requests
+    and parses the exported report with the same row mapping. It only knows the form pages, so any
+    unexpected answer raises GolestanProtocolError and the caller falls back to Playwright.
+    The form paths and field names it posts (DOM ids as field names, ExToEx for the export) are read off
+    the pages and haven't been checked against the live portal; it is tried against FakeGolestan only.
+    Until they are, it is experimental: the student's password is posted at most CRAWLER_HTTP_LOGIN_TRIES
+    times, and no login failure, not even Golestan's wrong password message, is reported from here.
+    """
+
+    def __init__(self, trace=None):
+        # a trace passed in belongs to the caller, which finishes it
+        self.trace = trace or CrawlTrace(type(self).__name__)
+        self.owns_trace = trace is None
+        self.session = requests.Session()
+        self.session.mount("https://", shared_adapter())
+        self.session.mount("http://", shared_adapter())
+
+    def __request(self, method, path, **kwargs):
+        response = self.session.request(method, golestan_url(path), timeout=settings.CRAWLER_HTTP_TIMEOUT, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def __extract_captcha(self):
+        response = self.__request("GET", HTTP_CAPTCHA_PATH)
+        if not response.headers.get("Content-Type", "").startswith("image/"):
+            raise GolestanProtocolError(f"captcha is {response.headers.get('Content-Type')}, not an image")
+        return response.content
+
+    def __submit_login(self, fields, username, password, captcha_text):
+        """
+        Post the login form; True when the answer opens the main menu, False for a wrong captcha.
+        Any other answer is a GolestanProtocolError, not a login; so is a wrong password message, which a post
+        the portal doesn't understand could get as well, so the browser crawler is left to confirm it.
+        """
+        response = self.__request("POST", HTTP_LOGIN_PATH, data={
+            **fields, "F80351": username, "F80401": password, "F51701": captcha_text,
+        })
+        error_message = element_title(response.text, "errtxt")
+
+        if error_message == WRONG_CREDENTIALS_MESSAGE:
+            raise GolestanProtocolError("the login was answered with the wrong password message")
+
+        if error_message == WRONG_CAPTCHA_MESSAGE:
+            return False
+
+        if error_message:
+            raise GolestanProtocolError(f"unexpected login message: {error_message}")
+
+        if MAIN_MENU_MARKER not in response.text:
+            raise GolestanProtocolError("the login answer has neither a message nor the main menu")
+
+        return True
+
+    def login(self, username, password):
+        attempts = LoginAttempts()
+
+        try:
+            self.__login(username, password, attempts)
+        finally:
+            attempts.save()
+
+    def __login(self, username, password, attempts):
+        max_tries = settings.CRAWLER_HTTP_LOGIN_TRIES
+        refetches_left = settings.CAPTCHA_MAX_REFETCHES
+
+        while max_tries > 0:
+            with self.trace.span('login_page'):
+                fields = form_fields(self.__request("GET", HTTP_LOGIN_PATH).text)
+            with self.trace.span('captcha'):
+                captcha_image = self.__extract_captcha()
+            with self.trace.span('solve'):
+                answer = answer_captcha(captcha_image, refetches_left)
+
+            if answer.text is None:
+                attempts.record(answer, REFETCHED)
+                self.trace.count(REFETCHED)
+                refetches_left -= 1
+                if refetches_left < 0:
+                    max_tries -= 1
+                continue
+
+            try:
+                with self.trace.span('login'):
+                    logged_in = self.__submit_login(fields, username, password, answer.text)
+            except GolestanProtocolError:
+                attempts.record(answer, UNKNOWN)
+                raise
+
+            attempts.record(answer, PASSED if logged_in else WRONG)
+            if logged_in:
+                return
+
+            self.trace.count(WRONG)
+            max_tries -= 1
+
+        # every try was a wrong captcha: the posts may not match the portal, so this is left to the Playwright
+        # crawler instead of being reported as a failed login
+        raise GolestanProtocolError(f"no captcha was accepted in {settings.CRAWLER_HTTP_LOGIN_TRIES} tries")
+
+    def __extract_courses(self):
+        """ Request report 212 exported as an HTML table and map its rows. """
+        fields = form_fields(self.__request("GET", HTTP_REPORT_PATH).text)
+        response = self.__request("POST", HTTP_REPORT_PATH, data={**fields, "F20851": "212", "ExToEx": "1"})
+
+        rows = report_rows(response.text)
+        if not rows or any(len(row) < 13 for row in rows[1:]):
+            raise GolestanProtocolError("report 212 is not the expected table")
+
+        try:
+            columns = report_columns(rows[0])
+        except ValueError as e:
+            raise GolestanProtocolError(str(e))
+        return [course_from_row(row, columns) for row in rows[1:]]
+
+    def fetch_student_courses(self, username, password):
+        """ Main function to fetch student courses. """
+        self.login(username, password)
+        with self.trace.span('report'):
+            return self.__extract_courses()
+
+    def close(self):
+        # the adapter is shared with other crawls, so only this crawl's cookies are dropped
+        self.session.cookies.clear()
+        if self.owns_trace:
+            self.trace.finish()
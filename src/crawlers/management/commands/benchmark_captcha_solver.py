@@ -0,0 +1,50 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from src.crawlers.captcha_solver.benchmark import CORPUS_DIR, STAGES, load_corpus, run_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark the captcha solver on a labelled corpus: stage latency, throughput and accuracy."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', default=CORPUS_DIR, help="directory of <label>_<n>.png captchas")
+        parser.add_argument('--repeat', type=int, default=1, help="passes over the corpus")
+        parser.add_argument('--batch-size', type=int, default=32, help="captchas per solve_many call")
+        parser.add_argument('--json', action='store_true', help="print the raw report as JSON")
+        parser.add_argument('--min-captcha-accuracy', type=float, help="fail below this per-captcha accuracy")
+        parser.add_argument('--max-p95-ms', type=float, help="fail when the p95 solve latency is above this")
+
+    def handle(self, *args, **options):
+        corpus = load_corpus(options['corpus'])
+        if not corpus:
+            raise CommandError(f"no captcha images found in {options['corpus']}")
+
+        report = run_benchmark(corpus, repeat=options['repeat'], batch_size=options['batch_size'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+
+        min_accuracy = options['min_captcha_accuracy']
+        if min_accuracy is not None and report['accuracy']['captcha'] < min_accuracy:
+            raise CommandError(f"captcha accuracy {report['accuracy']['captcha']} is below {min_accuracy}")
+
+        max_p95 = options['max_p95_ms']
+        if max_p95 is not None and report['total']['p95_ms'] > max_p95:
+            raise CommandError(f"p95 solve latency {report['total']['p95_ms']}ms is above {max_p95}ms")
+
+    def print_report(self, report):
+        self.stdout.write(f"{report['captchas']} captchas x {report['repeat']}")
+        self.stdout.write(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}")
+        for stage in STAGES + ('total',):
+            timing = report['total'] if stage == 'total' else report['stages'][stage]
+            self.stdout.write(f"{stage:<10}{timing['p50_ms']:>10.3f}{timing['p95_ms']:>10.3f}")
+
+        throughput = report['throughput']
+        self.stdout.write(f"single: {throughput['single_per_second']} captchas/s")
+        self.stdout.write(f"batch of {throughput['batch_size']}: {throughput['batch_per_second']} captchas/s")
+        self.stdout.write(
+            f"accuracy: {report['accuracy']['captcha']:.2%} per captcha, "
+            f"{report['accuracy']['character']:.2%} per character"
+        )
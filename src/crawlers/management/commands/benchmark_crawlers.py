@@ -0,0 +1,72 @@
+import json
+from contextlib import redirect_stdout
+from io import StringIO
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from src.crawlers.crawl_benchmark import ENGINES, run_crawl_benchmark
+from src.crawlers.fake_golestan import FakeGolestan
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark course retrieval end to end against a local fake Golestan: "
+        "crawl latency and throughput at several concurrency levels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', choices=ENGINES, default="playwright",
+                            help="sync Playwright crawlers on threads, async ones on one loop, or the HTTP backend")
+        parser.add_argument('--concurrency', default="1,2,4,8", help="comma separated concurrency levels")
+        parser.add_argument('--crawls', type=int, default=8, help="crawls per concurrency level")
+        parser.add_argument('--courses', type=int, default=300, help="rows of report 212")
+        parser.add_argument('--latency-ms', type=float, default=0, help="delay the fake Golestan adds to every response")
+        parser.add_argument('--no-captcha-check', action='store_true', help="accept any captcha answer")
+        parser.add_argument('--keep-login-form', action='store_true',
+                            help="leave the login form open after a wrong captcha (assumed, not checked, of the portal)")
+        parser.add_argument('--base-url', help="crawl an already running Golestan stand-in instead of starting one")
+        parser.add_argument('--password', default="secret", help="password of the stand-in given by --base-url")
+        parser.add_argument('--json', action='store_true', help="print the raw report as JSON")
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError("--concurrency must be comma separated integers")
+        if not levels or min(levels) < 1 or options['crawls'] < 1:
+            raise CommandError("concurrency levels and crawls must be positive")
+
+        golestan = None
+        base_url, password = options['base_url'], options['password']
+        if base_url is None:
+            golestan = FakeGolestan(
+                courses=options['courses'],
+                check_captcha=not options['no_captcha_check'],
+                latency=options['latency_ms'] / 1000,
+                keep_login_form=options['keep_login_form'],
+            ).start()
+            base_url, password = golestan.base_url, golestan.password
+
+        try:
+            # the solver prints every solution, keep that out of the report
+            with override_settings(GOLESTAN_BASE_URL=base_url), redirect_stdout(StringIO()):
+                report = run_crawl_benchmark(options['engine'], levels, options['crawls'], password)
+        finally:
+            if golestan is not None:
+                golestan.stop()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report, base_url)
+
+    def print_report(self, report, base_url):
+        self.stdout.write(f"{report['engine']} crawls of {base_url}")
+        self.stdout.write(f"{'concurrency':>12}{'crawls':>8}{'failed':>8}{'p50 ms':>12}{'p95 ms':>12}{'crawls/s':>10}")
+        for level in report['levels']:
+            latency = level['latency']
+            self.stdout.write(
+                f"{level['concurrency']:>12}{level['crawls']:>8}{level['failed']:>8}"
+                f"{latency['p50_ms'] or 0:>12.1f}{latency['p95_ms'] or 0:>12.1f}{level['crawls_per_second'] or 0:>10.3f}"
+            )
+            for error in level['errors']:
+                self.stdout.write(self.style.WARNING(f"  {error}"))
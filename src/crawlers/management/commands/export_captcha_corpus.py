@@ -0,0 +1,30 @@
+import os
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from src.crawlers.models import CaptchaAttempt, CaptchaVerdict
+
+
+class Command(BaseCommand):
+    help = "Write captchas verified by a successful login as <label>_<id>.png, ready for train_captcha_model."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="corpus directory to write to")
+        parser.add_argument('--days', type=int, help="only captchas of the last N days")
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output'], exist_ok=True)
+        attempts = CaptchaAttempt.objects.filter(verdict=CaptchaVerdict.PASSED, image__isnull=False)
+        if options['days']:
+            attempts = attempts.filter(created_at__gte=timezone.now() - timedelta(days=options['days']))
+
+        written = 0
+        for attempt in attempts.only('id', 'predicted_text', 'image').iterator():
+            path = os.path.join(options['output'], f"{attempt.predicted_text}_{attempt.id}.png")
+            if os.path.exists(path):
+                continue
+            with open(path, 'wb') as f:
+                f.write(attempt.image)
+            written += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{written} verified captchas written to {options['output']}"))
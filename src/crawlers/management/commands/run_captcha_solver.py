@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from src.crawlers.captcha_solver.service import SolverService
+
+
+class Command(BaseCommand):
+    help = "Run the captcha solver service: a pool of processes with the captcha model preloaded."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--address', default=settings.CAPTCHA_SOLVER_SERVICE_ADDRESS,
+            help="unix socket path or host:port to listen on (default: CAPTCHA_SOLVER_SERVICE_ADDRESS)",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.CAPTCHA_SOLVER_SERVICE_WORKERS,
+            help="number of solver processes (default: CAPTCHA_SOLVER_SERVICE_WORKERS)",
+        )
+
+    def handle(self, *args, **options):
+        if not options['address']:
+            raise CommandError("no address given and CAPTCHA_SOLVER_SERVICE_ADDRESS is not set")
+
+        service = SolverService(options['address'], authkey=settings.SECRET_KEY.encode(), workers=options['workers'])
+        self.stdout.write(f"captcha solver service on {options['address']} with {options['workers']} workers")
+
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.shutdown()
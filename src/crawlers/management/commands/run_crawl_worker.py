@@ -0,0 +1,73 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from src.crawlers.async_browser_pool import get_async_browser_pool
+from src.crawlers.browser_pool import get_browser_pool
+from src.crawlers.services import claim_crawl_job, expire_pending_crawl_jobs, fail_stale_crawl_jobs, run_crawl_job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued crawl jobs. Any number of workers can run side by side; each job is claimed by one of them. "
+        "A worker runs --concurrency jobs at once: their database work runs on threads, and with "
+        "CRAWLER_ASYNC_ENGINE their browser crawls run on the worker's event loop, sharing its browser pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.CRAWL_WORKER_POLL_INTERVAL,
+            help="seconds to wait when the queue is empty (default: CRAWL_WORKER_POLL_INTERVAL)",
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.CRAWL_WORKER_CONCURRENCY,
+            help="jobs run at once (default: CRAWL_WORKER_CONCURRENCY)",
+        )
+        parser.add_argument('--max-jobs', type=int, help="exit after running this many jobs")
+        parser.add_argument('--once', action='store_true', help="exit as soon as the queue is empty")
+
+    def handle(self, *args, **options):
+        self.jobs = 0
+        apps.get_app_config('crawlers').warm_up_captcha_solver()
+
+        try:
+            asyncio.run(self.run(options))
+        except KeyboardInterrupt:
+            pass
+
+    async def run(self, options):
+        try:
+            await asyncio.gather(*(self.work(options) for _ in range(max(options['concurrency'], 1))))
+        finally:
+            await get_async_browser_pool().close()
+
+    async def work(self, options):
+        """ Claim and run jobs one after another; several of these share the event loop. """
+        # off the loop's thread, so the engine finds the loop and awaits the async crawlers on it
+        next_job = sync_to_async(self.run_next_job, thread_sensitive=False)
+
+        while options['max_jobs'] is None or self.jobs < options['max_jobs']:
+            job = await next_job()
+
+            if job is None:
+                if options['once']:
+                    break
+                await asyncio.sleep(options['poll_interval'])
+                continue
+
+            self.jobs += 1
+            self.stdout.write(f"{job.kind} {job.id}: {job.status}")
+
+    def run_next_job(self):
+        close_old_connections()
+        try:
+            fail_stale_crawl_jobs(settings.CRAWL_JOB_TIMEOUT)
+            expire_pending_crawl_jobs(settings.CRAWL_JOB_PENDING_TIMEOUT)
+            job, password = claim_crawl_job()
+            return None if job is None else run_crawl_job(job, password)
+        finally:
+            # a sync crawler's browsers belong to this executor thread, which may not run the next job
+            get_browser_pool().close()
+            close_old_connections()
@@ -0,0 +1,37 @@
+import threading
+from django.core.management.base import BaseCommand
+from src.crawlers.captcha_solver.benchmark import CORPUS_DIR
+from src.crawlers.fake_golestan import FakeGolestan
+
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for the Golestan pages the crawlers use; set GOLESTAN_BASE_URL to its address."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default="127.0.0.1")
+        parser.add_argument('--port', type=int, default=8800)
+        parser.add_argument('--password', default="secret", help="password every student id logs in with")
+        parser.add_argument('--courses', type=int, default=300, help="rows of report 212")
+        parser.add_argument('--corpus', default=CORPUS_DIR, help="directory of <label>_<n>.png captchas to serve")
+        parser.add_argument('--latency-ms', type=float, default=0, help="delay added to every response")
+        parser.add_argument('--no-captcha-check', action='store_true', help="accept any captcha answer")
+        parser.add_argument('--keep-login-form', action='store_true',
+                            help="leave the login form open after a wrong captcha (assumed, not checked, of the portal)")
+
+    def handle(self, *args, **options):
+        golestan = FakeGolestan(
+            password=options['password'],
+            courses=options['courses'],
+            corpus_dir=options['corpus'],
+            check_captcha=not options['no_captcha_check'],
+            latency=options['latency_ms'] / 1000,
+            keep_login_form=options['keep_login_form'],
+        ).start(options['host'], options['port'])
+
+        self.stdout.write(self.style.SUCCESS(f"fake Golestan on {golestan.base_url}, set GOLESTAN_BASE_URL to it"))
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            golestan.stop()
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from src.crawlers.captcha_solver import training
+from src.crawlers.captcha_solver.benchmark import CORPUS_DIR, load_corpus
+from src.crawlers.captcha_solver.model import captcha_model
+
+
+def percentage(value):
+    return "n/a" if value is None else f"{value:.2%}"
+
+
+class Command(BaseCommand):
+    help = "Train a replacement captcha model from labelled captchas and write it as a new model version."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--corpus', action='append',
+            help=f"directory of <label>_<n>.png captchas, may be repeated (default: {CORPUS_DIR})",
+        )
+        parser.add_argument('--test-size', type=float, default=0.2, help="share of captchas held out for evaluation")
+        parser.add_argument('--neighbours', type=int, default=1, help="k of the k-NN classifier")
+        parser.add_argument('--batch-size', type=int, default=256, help="captchas per feature extraction batch")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--keep-current-exemplars', action='store_true',
+            help="train on the glyphs of the current model as well as on the corpus",
+        )
+        parser.add_argument('--output', help="model path (default: the next edu-v<N>.pkl in CAPTCHA_MODEL_DIR)")
+
+    def handle(self, *args, **options):
+        corpus = [item for path in options['corpus'] or [CORPUS_DIR] for item in load_corpus(path)]
+        if len(corpus) < 2:
+            raise CommandError("at least two labelled captchas are needed")
+
+        if not 0 < options['test_size'] < 1:
+            raise CommandError("--test-size must be between 0 and 1")
+
+        train_corpus, test_corpus = training.split_corpus(corpus, options['test_size'], options['seed'])
+        features, labels, skipped = training.glyph_features(train_corpus, options['batch_size'])
+        if not len(features):
+            raise CommandError("no captcha of the training set could be segmented into its labelled glyphs")
+
+        current_model = captcha_model.classifier
+        classifier = training.train(
+            features, labels,
+            neighbours=options['neighbours'],
+            base_model=current_model if options['keep_current_exemplars'] else None,
+        )
+        report = training.build_report(classifier, train_corpus, test_corpus, skipped, current_model)
+
+        path = options['output'] or training.next_model_path(settings.CAPTCHA_MODEL_DIR)
+        training.save_model(classifier, report, path)
+
+        self.stdout.write(f"trained on {len(labels)} glyphs of {len(train_corpus) - skipped} captchas ({skipped} skipped)")
+        for name in ('test', 'current_model_test'):
+            result = report[name]
+            self.stdout.write(
+                f"{name}: {percentage(result['accuracy']['captcha'])} per captcha, "
+                f"{percentage(result['accuracy']['character'])} per character, "
+                f"predict p50 {result['predict_latency']['p50_ms']}ms p95 {result['predict_latency']['p95_ms']}ms"
+            )
+        self.stdout.write(self.style.SUCCESS(f"model written to {path}, set CAPTCHA_MODEL_PATH to use it"))
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaptchaAttempt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('login_id', models.UUIDField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('predicted_text', models.CharField(blank=True, default='', max_length=16)),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('latency_ms', models.FloatField()),
+                ('from_cache', models.BooleanField(default=False)),
+                ('verdict', models.CharField(choices=[('passed', 'Passed'), ('wrong', 'Wrong'), ('refetched', 'Refetched')], max_length=9)),
+                ('image', models.BinaryField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
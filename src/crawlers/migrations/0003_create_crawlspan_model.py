@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawlers', '0002_create_crawljob_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlSpan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trace_id', models.UUIDField(db_index=True)),
+                ('crawler', models.CharField(max_length=64)),
+                ('stage', models.CharField(max_length=16)),
+                ('duration_ms', models.FloatField()),
+                ('failed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
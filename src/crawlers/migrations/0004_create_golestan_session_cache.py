@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_session_cache_table(apps, schema_editor):
+    # the GOLESTAN_SESSION_CACHE table, so sessions are shared without running createcachetable by hand
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+def drop_session_cache_table(apps, schema_editor):
+    table = settings.CACHES[settings.GOLESTAN_SESSION_CACHE]['LOCATION']
+    schema_editor.execute(f"DROP TABLE IF EXISTS {schema_editor.quote_name(table)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawlers', '0003_create_crawlspan_model'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_session_cache_table, reverse_code=drop_session_cache_table),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crawlers', '0004_create_golestan_session_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='captchaattempt',
+            name='verdict',
+            field=models.CharField(choices=[('passed', 'Passed'), ('wrong', 'Wrong'), ('refetched', 'Refetched'), ('unknown', 'Unknown')], max_length=9),
+        ),
+    ]
@@ -0,0 +1,3 @@
+from .captcha_attempt import CaptchaAttempt, CaptchaVerdict
+from .crawl_job import CrawlJob, CrawlJobKind, CrawlJobStage, CrawlJobStatus
+from .crawl_span import CrawlSpan
@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class CaptchaVerdict(models.TextChoices):
+    PASSED = 'passed', 'Passed'
+    WRONG = 'wrong', 'Wrong'
+    REFETCHED = 'refetched', 'Refetched'
+    # submitted, but the login failed for another reason, so whether the answer was right is not known
+    UNKNOWN = 'unknown', 'Unknown'
+
+
+class CaptchaAttempt(models.Model):
+    """ One captcha solved during a Golestan login, written once and never updated. """
+    login_id = models.UUIDField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    predicted_text = models.CharField(max_length=16, blank=True, default="")
+    confidence = models.FloatField(null=True, blank=True)
+    latency_ms = models.FloatField()
+    from_cache = models.BooleanField(default=False)
+    verdict = models.CharField(max_length=9, choices=CaptchaVerdict)
+    # only kept for passed captchas, which are verified training samples
+    image = models.BinaryField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.predicted_text} ({self.verdict})"
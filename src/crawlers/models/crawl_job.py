@@ -0,0 +1,48 @@
+import uuid
+from django.conf import settings
+from django.db import models
+
+
+class CrawlJobKind(models.TextChoices):
+    COURSE_RETRIEVE = 'course_retrieve', 'Course Retrieve'
+
+
+class CrawlJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pending'
+    RUNNING = 'running', 'Running'
+    SUCCEEDED = 'succeeded', 'Succeeded'
+    FAILED = 'failed', 'Failed'
+
+
+class CrawlJobStage(models.TextChoices):
+    QUEUED = 'queued', 'Queued'
+    CRAWLING = 'crawling', 'Crawling'
+    SAVING = 'saving', 'Saving'
+    DONE = 'done', 'Done'
+
+
+class CrawlJob(models.Model):
+    """
+    A Golestan crawl queued by a request and run by `manage.py run_crawl_worker`.
+    The password is stored encrypted only until a worker claims the job.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=16, choices=CrawlJobKind)
+    status = models.CharField(max_length=9, choices=CrawlJobStatus, default=CrawlJobStatus.PENDING)
+    stage = models.CharField(max_length=8, choices=CrawlJobStage, default=CrawlJobStage.QUEUED)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                                     related_name='crawl_jobs')
+    student_id = models.CharField(max_length=64)
+    encrypted_password = models.BinaryField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.kind} {self.id} ({self.status})"
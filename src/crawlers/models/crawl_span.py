@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class CrawlSpan(models.Model):
+    """ The duration of one stage of a crawl (see src.crawlers.crawl_timing), written once and never updated. """
+    trace_id = models.UUIDField(db_index=True)
+    crawler = models.CharField(max_length=64)
+    stage = models.CharField(max_length=16)
+    duration_ms = models.FloatField()
+    failed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.crawler} {self.stage} ({self.duration_ms:.0f}ms)"
@@ -0,0 +1,103 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from django.conf import settings
+from playwright.sync_api import Error as PlaywrightError
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestStats:
+    allowed_requests: int = 0
+    # response body bytes of the allowed requests that finished, measured once their body was read
+    allowed_bytes: int = 0
+    blocked_requests: int = 0
+    blocked_by_type: dict = field(default_factory=dict)
+
+    def as_dict(self):
+        return {
+            "allowed_requests": self.allowed_requests,
+            "allowed_bytes": self.allowed_bytes,
+            "blocked_requests": self.blocked_requests,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+
+class RequestRouter:
+    """
+    Aborts the requests of a BrowserContext that the crawl doesn't need: the given resource types and
+    URL patterns, unless the URL matches the allowlist. Allowed and blocked traffic is counted in `stats`.
+    A blocked request is never sent, so only its count is known, not its size.
+    """
+
+    def __init__(self, blocked_resource_types=(), blocked_url_patterns=(), allowed_url_patterns=()):
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.blocked_url_patterns = [re.compile(pattern) for pattern in blocked_url_patterns]
+        self.allowed_url_patterns = [re.compile(pattern) for pattern in allowed_url_patterns]
+        self.stats = RequestStats()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            blocked_resource_types=settings.CRAWLER_BLOCKED_RESOURCE_TYPES,
+            blocked_url_patterns=settings.CRAWLER_BLOCKED_URL_PATTERNS,
+            allowed_url_patterns=settings.CRAWLER_ALLOWED_URL_PATTERNS,
+        )
+
+    def should_block(self, resource_type, url):
+        if any(pattern.search(url) for pattern in self.allowed_url_patterns):
+            return False
+        return resource_type in self.blocked_resource_types or any(
+            pattern.search(url) for pattern in self.blocked_url_patterns)
+
+    def attach(self, context):
+        """ Route every request of a sync BrowserContext, popups included, through the router. """
+        context.route("**/*", self._route)
+        context.on("requestfinished", self._count_finished)
+
+    async def attach_async(self, context):
+        """ attach() for a playwright.async_api BrowserContext. """
+        await context.route("**/*", self._route_async)
+        context.on("requestfinished", self._count_finished_async)
+
+    def _route(self, route):
+        if self._block(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def _route_async(self, route):
+        if self._block(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def _block(self, request):
+        if not self.should_block(request.resource_type, request.url):
+            self.stats.allowed_requests += 1
+            return False
+
+        self.stats.blocked_requests += 1
+        self.stats.blocked_by_type[request.resource_type] = self.stats.blocked_by_type.get(request.resource_type, 0) + 1
+        return True
+
+    def _count_finished(self, request):
+        try:
+            self._count_sizes(request.sizes())
+        except PlaywrightError:
+            # the page went away before its sizes were read
+            pass
+
+    async def _count_finished_async(self, request):
+        try:
+            self._count_sizes(await request.sizes())
+        except PlaywrightError:
+            pass
+
+    def _count_sizes(self, sizes):
+        self.stats.allowed_bytes += max(sizes.get("responseBodySize", 0), 0)
+
+    def log_stats(self):
+        logger.info("crawl requests: %s", self.stats.as_dict())
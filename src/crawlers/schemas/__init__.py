@@ -0,0 +1,3 @@
+from .metrics_schema import (
+    admission_metrics_view_schema, captcha_metrics_view_schema, crawl_timing_metrics_view_schema,
+)
@@ -0,0 +1,139 @@
+from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter, OpenApiResponse
+from src.utill.general_schemas import BAD_REQUEST, INVALID_AUTHENTICATION, NOT_AUTHORIZED
+
+
+captcha_metrics_view_schema = extend_schema(
+    summary="Captcha Solver Metrics",
+    description=(
+        "Rolling captcha solver metrics over the last `hours` (default 24, at most 720), computed from the "
+        "recorded login attempts: accuracy of submitted captchas, wrong captchas and refetches per login, "
+        "cache hit rate, and average solve latency and confidence. Admin only."
+    ),
+    parameters=[
+        OpenApiParameter(name="hours", type=int, location=OpenApiParameter.QUERY, required=False),
+    ],
+    responses={
+        200: OpenApiResponse(
+            description="Metrics of the requested window. Ratios are null when there is no attempt in it.",
+            examples=[
+                OpenApiExample(
+                    name="Example Response",
+                    value={
+                        "window_hours": 24,
+                        "logins": 130,
+                        "submitted": 171,
+                        "accuracy": 0.7602,
+                        "retries_per_login": 0.315,
+                        "refetches_per_login": 0.6,
+                        "cache_hit_rate": 0.0201,
+                        "avg_latency_ms": 11.42,
+                        "avg_confidence": 0.4117,
+                    },
+                    response_only=True,
+                )
+            ],
+        ),
+        400: BAD_REQUEST,
+        401: INVALID_AUTHENTICATION,
+        403: NOT_AUTHORIZED,
+    },
+)
+
+
+crawl_timing_metrics_view_schema = extend_schema(
+    summary="Crawl Timing Metrics",
+    description=(
+        "Per-stage latency of the Golestan crawls of the last `hours` (default 24, at most 720), optionally of one "
+        "`crawler` (e.g. `CourseRetrieveCrawler`, or `course_retrieve_job` for queued course retrievals). "
+        "Stages are `browser`, `session`, `login_page`, `captcha`, `solve`, `login`, `menu`, `report` and `save`, "
+        "ordered by the time spent in them, the slowest first; `total` covers whole crawls. Each has a cumulative "
+        "histogram over `CRAWLER_TIMING_BUCKETS_MS`, p50/p95 estimated as the upper bound of their bucket, and spans "
+        "per crawl, which count its attempts (e.g. login pages loaded per login). Admin only."
+    ),
+    parameters=[
+        OpenApiParameter(name="hours", type=int, location=OpenApiParameter.QUERY, required=False),
+        OpenApiParameter(name="crawler", type=str, location=OpenApiParameter.QUERY, required=False),
+    ],
+    responses={
+        200: OpenApiResponse(
+            description="Metrics of the requested window. `total` is null when no crawl finished in it.",
+            examples=[
+                OpenApiExample(
+                    name="Example Response",
+                    value={
+                        "window_hours": 24,
+                        "crawler": None,
+                        "crawls": 40,
+                        "failed_crawls": 3,
+                        "total": {
+                            "stage": "total", "spans": 40, "spans_per_crawl": 1.0, "failed": 3,
+                            "total_ms": 412000.0, "avg_ms": 10300.0, "p50_ms": 10000, "p95_ms": 20000,
+                            "max_ms": 23100.5,
+                            "histogram": [{"le_ms": 5000, "count": 2}, {"le_ms": 10000, "count": 24},
+                                          {"le_ms": 20000, "count": 39}],
+                        },
+                        "stages": [
+                            {
+                                "stage": "login_page", "spans": 71, "spans_per_crawl": 1.775, "failed": 1,
+                                "total_ms": 170400.0, "avg_ms": 2400.0, "p50_ms": 2500, "p95_ms": 5000,
+                                "max_ms": 7210.2,
+                                "histogram": [{"le_ms": 1000, "count": 4}, {"le_ms": 2500, "count": 40},
+                                              {"le_ms": 5000, "count": 69}],
+                            },
+                        ],
+                    },
+                    response_only=True,
+                )
+            ],
+        ),
+        400: BAD_REQUEST,
+        401: INVALID_AUTHENTICATION,
+        403: NOT_AUTHORIZED,
+    },
+)
+
+
+admission_metrics_view_schema = extend_schema(
+    summary="Crawler Admission Metrics",
+    description=(
+        "Live load of the crawlers: busy crawl slots of `CRAWLER_SLOT_DIR` (`CRAWLER_MAX_CONCURRENT_CRAWLS`), requests "
+        "waiting for one (at most `CRAWLER_SLOT_QUEUE_SIZE`) and pending crawl jobs (at most `CRAWL_JOB_QUEUE_SIZE`). "
+        "`waits` has the latency metrics of the last `hours` (default 24, at most 720) of `slot_wait`, the wait for "
+        "a crawl slot, whose failed spans were answered 429, and of `job_wait`, from queueing a job to its start. "
+        "Admin only."
+    ),
+    parameters=[
+        OpenApiParameter(name="hours", type=int, location=OpenApiParameter.QUERY, required=False),
+    ],
+    responses={
+        200: OpenApiResponse(
+            description="Queue depths now and waits of the requested window; a wait with no span in it is left out.",
+            examples=[
+                OpenApiExample(
+                    name="Example Response",
+                    value={
+                        "slots": 2,
+                        "busy_slots": 2,
+                        "queue_size": 8,
+                        "waiting": 3,
+                        "pending_jobs": 12,
+                        "job_queue_size": 200,
+                        "window_hours": 24,
+                        "waits": {
+                            "slot_wait": {
+                                "stage": "slot_wait", "spans": 160, "spans_per_crawl": 1.0, "failed": 4,
+                                "total_ms": 96000.0, "avg_ms": 600.0, "p50_ms": 100, "p95_ms": 5000,
+                                "max_ms": 20003.1,
+                                "histogram": [{"le_ms": 100, "count": 90}, {"le_ms": 5000, "count": 153}],
+                            },
+                        },
+                    },
+                    response_only=True,
+                )
+            ],
+        ),
+        400: BAD_REQUEST,
+        401: INVALID_AUTHENTICATION,
+        403: NOT_AUTHORIZED,
+    },
+)
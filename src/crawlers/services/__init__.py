@@ -0,0 +1,7 @@
+from .captcha_telemetry_service import record_captcha_attempts, captcha_metrics
+from .crawl_timing_service import record_crawl_spans, crawl_timing_metrics
+from .admission_service import admission_metrics
+from .crawl_job_service import (
+    CrawlJobFailed, enqueue_crawl_job, claim_crawl_job, set_crawl_job_stage, run_crawl_job, fail_stale_crawl_jobs,
+    expire_pending_crawl_jobs,
+)
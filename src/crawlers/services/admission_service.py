@@ -0,0 +1,20 @@
+from django.conf import settings
+from src.crawlers.admission import slot_usage
+from src.crawlers.models import CrawlJob, CrawlJobStatus
+from .crawl_timing_service import crawl_timing_metrics
+
+
+def admission_metrics(hours=24):
+    """
+    Live depth of the crawl slot queue of this host and of the crawl job queue, with the waits of the last `hours`:
+    `slot_wait` for a crawl slot (failed spans are 429 answers) and `job_wait` from queueing a job to its start.
+    """
+    waits = crawl_timing_metrics(hours, crawler="admission")['stages']
+
+    return {
+        **slot_usage(),
+        'pending_jobs': CrawlJob.objects.filter(status=CrawlJobStatus.PENDING).count(),
+        'job_queue_size': settings.CRAWL_JOB_QUEUE_SIZE,
+        'window_hours': hours,
+        'waits': {stage['stage']: stage for stage in waits},
+    }
@@ -0,0 +1,62 @@
+import base64
+import logging
+from datetime import timedelta
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+from src.crawlers.models import CaptchaAttempt, CaptchaVerdict
+
+
+logger = logging.getLogger(__name__)
+
+
+def record_captcha_attempts(login_id, attempts):
+    """
+    Store the captcha attempts of one login with a single insert.
+    Each attempt is a dict of CaptchaAttempt fields, where 'image' is the captcha as bytes or base64; the image
+    is only kept for passed captchas. Telemetry must never break a login, so errors are logged only.
+    """
+    if not attempts:
+        return
+
+    rows = []
+    for attempt in attempts:
+        attempt = dict(attempt)
+        image = attempt.pop('image', None)
+        if attempt['verdict'] == CaptchaVerdict.PASSED and image:
+            attempt['image'] = base64.b64decode(image) if isinstance(image, str) else image
+        rows.append(CaptchaAttempt(login_id=login_id, **attempt))
+
+    try:
+        CaptchaAttempt.objects.bulk_create(rows)
+    except Exception:
+        logger.exception("could not record captcha attempts of login %s", login_id)
+
+
+def captcha_metrics(hours=24):
+    """ Rolling solver accuracy and retries per login over the last `hours`. """
+    since = timezone.now() - timedelta(hours=hours)
+    stats = CaptchaAttempt.objects.filter(created_at__gte=since).aggregate(
+        logins=Count('login_id', distinct=True),
+        passed=Count('pk', filter=Q(verdict=CaptchaVerdict.PASSED)),
+        wrong=Count('pk', filter=Q(verdict=CaptchaVerdict.WRONG)),
+        refetched=Count('pk', filter=Q(verdict=CaptchaVerdict.REFETCHED)),
+        cached=Count('pk', filter=Q(from_cache=True)),
+        avg_latency_ms=Avg('latency_ms', filter=Q(from_cache=False)),
+        avg_confidence=Avg('confidence', filter=Q(from_cache=False)),
+    )
+
+    submitted = stats['passed'] + stats['wrong']
+    logins = stats['logins']
+
+    return {
+        'window_hours': hours,
+        'logins': logins,
+        'submitted': submitted,
+        'accuracy': round(stats['passed'] / submitted, 4) if submitted else None,
+        'retries_per_login': round(stats['wrong'] / logins, 3) if logins else None,
+        'refetches_per_login': round(stats['refetched'] / logins, 3) if logins else None,
+        'cache_hit_rate': round(stats['cached'] / (submitted + stats['refetched']), 4)
+        if submitted + stats['refetched'] else None,
+        'avg_latency_ms': round(stats['avg_latency_ms'], 3) if stats['avg_latency_ms'] is not None else None,
+        'avg_confidence': round(stats['avg_confidence'], 4) if stats['avg_confidence'] is not None else None,
+    }
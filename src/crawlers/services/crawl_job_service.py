@@ -0,0 +1,132 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from src.crawlers.admission import CrawlerBusy
+from src.crawlers.credentials import decrypt_secret, encrypt_secret
+from src.crawlers.models import CrawlJob, CrawlJobKind, CrawlJobStage, CrawlJobStatus
+from .crawl_timing_service import record_crawl_spans
+
+
+logger = logging.getLogger(__name__)
+
+# handler(job, student_id, password) -> JSON result of the job
+CRAWL_JOB_HANDLERS = {
+    CrawlJobKind.COURSE_RETRIEVE: 'src.courses.services.run_course_retrieve_job',
+}
+
+
+class CrawlJobFailed(ValueError):
+    """ A failure to report to the client as is, optionally with a result to keep on the job. """
+
+    def __init__(self, detail, result=None):
+        super().__init__(detail)
+        self.result = result
+
+
+def enqueue_crawl_job(kind, student_id, password, user=None):
+    """ Queue a crawl, or raise CrawlerBusy when CRAWL_JOB_QUEUE_SIZE jobs are already pending. """
+    # jobs no worker took in time don't count, even when no worker is running to expire them
+    expire_pending_crawl_jobs(settings.CRAWL_JOB_PENDING_TIMEOUT)
+    if CrawlJob.objects.filter(status=CrawlJobStatus.PENDING).count() >= settings.CRAWL_JOB_QUEUE_SIZE:
+        raise CrawlerBusy(settings.CRAWLER_RETRY_AFTER)
+
+    return CrawlJob.objects.create(
+        kind=kind,
+        student_id=student_id,
+        encrypted_password=encrypt_secret(password),
+        requested_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def claim_crawl_job():
+    """
+    Take the oldest pending job, or return (None, None) when there is none.
+    Rows locked by other workers are skipped, so any number of workers can poll the same table.
+    The password is decrypted and wiped from the row in the same transaction.
+    """
+    with transaction.atomic():
+        job = (
+            CrawlJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=CrawlJobStatus.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None, None
+
+        password = decrypt_secret(job.encrypted_password)
+        job.encrypted_password = None
+        job.status = CrawlJobStatus.RUNNING
+        job.stage = CrawlJobStage.CRAWLING
+        job.started_at = timezone.now()
+        job.save(update_fields=['encrypted_password', 'status', 'stage', 'started_at'])
+
+    record_crawl_spans(job.id, "admission", [{
+        "stage": "job_wait", "duration_ms": (job.started_at - job.created_at).total_seconds() * 1000, "failed": False,
+    }])
+    return job, password
+
+
+def set_crawl_job_stage(job, stage):
+    job.stage = stage
+    job.save(update_fields=['stage'])
+
+
+def run_crawl_job(job, password):
+    """ Run a claimed job with the handler of its kind and store its outcome. """
+    handler = import_string(CRAWL_JOB_HANDLERS[job.kind])
+
+    try:
+        job.result = handler(job, job.student_id, password)
+        job.status = CrawlJobStatus.SUCCEEDED
+    except ValueError as e:
+        job.result = getattr(e, 'result', None)
+        job.error = str(e)
+        job.status = CrawlJobStatus.FAILED
+    except Exception:
+        logger.exception("crawl job %s failed", job.id)
+        job.error = str(_("internal server error"))
+        job.status = CrawlJobStatus.FAILED
+
+    job.stage = CrawlJobStage.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['result', 'error', 'status', 'stage', 'finished_at'])
+    return job
+
+
+def fail_stale_crawl_jobs(timeout):
+    """
+    Fail jobs left running by a worker that died. Their password is already wiped,
+    so they can't be retried; the client has to post again.
+    """
+    return CrawlJob.objects.filter(
+        status=CrawlJobStatus.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(
+        status=CrawlJobStatus.FAILED,
+        stage=CrawlJobStage.DONE,
+        error=str(_("the crawl timed out")),
+        finished_at=timezone.now(),
+    )
+
+
+def expire_pending_crawl_jobs(timeout):
+    """
+    Fail jobs no worker claimed within `timeout` seconds and wipe their password, so a queue nobody
+    works on neither keeps passwords nor fills up for good.
+    """
+    return CrawlJob.objects.filter(
+        status=CrawlJobStatus.PENDING,
+        created_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(
+        encrypted_password=None,
+        status=CrawlJobStatus.FAILED,
+        stage=CrawlJobStage.DONE,
+        error=str(_("the crawl timed out")),
+        finished_at=timezone.now(),
+    )
@@ -0,0 +1,80 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Q, Sum
+from django.utils import timezone
+from src.crawlers.models import CrawlSpan
+
+
+logger = logging.getLogger(__name__)
+
+
+def record_crawl_spans(trace_id, crawler, spans):
+    """ Store the spans of one crawl with a single insert. Telemetry must never break a crawl, so errors are logged only. """
+    if not spans:
+        return
+
+    try:
+        CrawlSpan.objects.bulk_create([CrawlSpan(trace_id=trace_id, crawler=crawler, **span) for span in spans])
+    except Exception:
+        logger.exception("could not record the spans of crawl %s", trace_id)
+
+
+def _quantile(histogram, spans, max_ms, quantile):
+    """ Upper bound of the bucket holding the quantile, or the slowest span when it is past the last bucket. """
+    for bucket in histogram:
+        if bucket['count'] >= quantile * spans:
+            return bucket['le_ms']
+    return round(max_ms, 3)
+
+
+def _stage_metrics(row, buckets):
+    histogram = [{'le_ms': bound, 'count': row[f'le_{bound}']} for bound in buckets]
+
+    return {
+        'stage': row['stage'],
+        'spans': row['spans'],
+        'spans_per_crawl': round(row['spans'] / row['crawls'], 3),
+        'failed': row['failed'],
+        'total_ms': round(row['total_ms'], 3),
+        'avg_ms': round(row['avg_ms'], 3),
+        'p50_ms': _quantile(histogram, row['spans'], row['max_ms'], 0.5),
+        'p95_ms': _quantile(histogram, row['spans'], row['max_ms'], 0.95),
+        'max_ms': round(row['max_ms'], 3),
+        'histogram': histogram,
+    }
+
+
+def crawl_timing_metrics(hours=24, crawler=None):
+    """
+    Per-stage latency of the crawls of the last `hours`: a cumulative histogram (CRAWLER_TIMING_BUCKETS_MS),
+    p50/p95 estimated from it, and spans per crawl, which count the attempts of a stage.
+    Stages are ordered by the time spent in them, the slowest first; whole crawls are reported as `total`.
+    """
+    since = timezone.now() - timedelta(hours=hours)
+    buckets = settings.CRAWLER_TIMING_BUCKETS_MS
+
+    spans = CrawlSpan.objects.filter(created_at__gte=since)
+    if crawler:
+        spans = spans.filter(crawler=crawler)
+
+    rows = spans.order_by().values('stage').annotate(
+        spans=Count('pk'),
+        crawls=Count('trace_id', distinct=True),
+        failed=Count('pk', filter=Q(failed=True)),
+        total_ms=Sum('duration_ms'),
+        avg_ms=Avg('duration_ms'),
+        max_ms=Max('duration_ms'),
+        **{f'le_{bound}': Count('pk', filter=Q(duration_ms__lte=bound)) for bound in buckets},
+    )
+    stages = sorted((_stage_metrics(row, buckets) for row in rows), key=lambda stage: stage['total_ms'], reverse=True)
+    total = next((stage for stage in stages if stage['stage'] == 'total'), None)
+
+    return {
+        'window_hours': hours,
+        'crawler': crawler,
+        'crawls': total['spans'] if total else 0,
+        'failed_crawls': total['failed'] if total else 0,
+        'total': total,
+        'stages': [stage for stage in stages if stage['stage'] != 'total'],
+    }
@@ -0,0 +1,51 @@
+import hashlib
+import hmac
+import json
+from cryptography.fernet import InvalidToken
+from django.conf import settings
+from django.core.cache import caches
+from src.crawlers.credentials import decrypt_secret, encrypt_secret
+
+
+def _cache():
+    return caches[settings.GOLESTAN_SESSION_CACHE]
+
+
+def _cache_key(student_id):
+    return "golestan-session:" + hashlib.sha256(student_id.encode()).hexdigest()
+
+
+def _password_digest(student_id, password):
+    message = f"{student_id}:{password}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def save_session(student_id, password, storage_state):
+    """
+    Keep the Playwright storage_state of a logged-in student for GOLESTAN_SESSION_TTL seconds.
+    The state is encrypted, and bound to an HMAC of the password so only the same credentials resume it.
+    """
+    if not settings.GOLESTAN_SESSION_TTL:
+        return
+
+    _cache().set(
+        _cache_key(student_id),
+        {"password": _password_digest(student_id, password), "state": encrypt_secret(json.dumps(storage_state))},
+        timeout=settings.GOLESTAN_SESSION_TTL,
+    )
+
+
+def load_session(student_id, password):
+    """ The saved storage_state of a student, or None when there is none or the password doesn't match. """
+    entry = _cache().get(_cache_key(student_id))
+    if entry is None or not hmac.compare_digest(entry["password"], _password_digest(student_id, password)):
+        return None
+
+    try:
+        return json.loads(decrypt_secret(entry["state"]))
+    except (InvalidToken, ValueError):
+        return None
+
+
+def drop_session(student_id):
+    _cache().delete(_cache_key(student_id))
@@ -1,5 +1,6 @@
-import time
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 from .golestan_base_crawler import GolestanBaseCrawler
+from .golestan_pages import MENU_CLICK_WAITS, step_timeout
 
 
 class StudentValidatorCrawler(GolestanBaseCrawler):
@@ -7,10 +8,19 @@ class StudentValidatorCrawler(GolestanBaseCrawler):
         iframe2 = self.page.frame_locator("iframe#Faci2")
         form_body2 = iframe2.frame_locator("frame[name='Master']").frame_locator("frame[name='Form_Body']")
         student_info_btn = form_body2.locator('//td[span[text()="اطلاعات جامع دانشجو"]]')
-        student_info_btn.wait_for(state="visible", timeout=5000)
-        student_info_btn.click()
-        time.sleep(0.5)
-        student_info_btn.click()
+        student_info_btn.wait_for(state="visible", timeout=step_timeout('menu'))
+        info_frame = self.page.locator("iframe#Faci3")
+
+        for share in MENU_CLICK_WAITS:
+            student_info_btn.click()
+            self.trace.count('menu_clicks')
+            try:
+                info_frame.wait_for(state="attached", timeout=step_timeout('menu') * share)
+                return
+            except PlaywrightTimeoutError:
+                pass
+
+        raise Exception("Couldn't open the student info page after multiple attempts.")
 
     def __extract_student_info(self):
         iframe3 = self.page.frame_locator("iframe#Faci3")
@@ -21,10 +31,10 @@ class StudentValidatorCrawler(GolestanBaseCrawler):
         student_major_el = form_body3.locator('//*[@id="F17551"]')
         student_faculty_el = form_body3.locator('//*[@id="F61151"]')
 
-        student_name_el.wait_for(state="visible", timeout=5000)
-        student_number_el.wait_for(state="visible", timeout=5000)
-        student_major_el.wait_for(state="visible", timeout=5000)
-        student_faculty_el.wait_for(state="visible", timeout=5000)
+        student_name_el.wait_for(state="visible", timeout=step_timeout('report'))
+        student_number_el.wait_for(state="visible", timeout=step_timeout('report'))
+        student_major_el.wait_for(state="visible", timeout=step_timeout('report'))
+        student_faculty_el.wait_for(state="visible", timeout=step_timeout('report'))
 
         student_fullname = student_name_el.text_content()
         student_number = student_number_el.input_value()
@@ -41,5 +51,7 @@ class StudentValidatorCrawler(GolestanBaseCrawler):
     def fetch_student_info(self, username, password):
         """ Main function to fetch student courses. """
         self.login(username, password)
-        self.__navigate_to_student_info_page()
-        return self.__extract_student_info()
+        with self.trace.span('menu'):
+            self.__navigate_to_student_info_page()
+        with self.trace.span('report'):
+            return self.__extract_student_info()
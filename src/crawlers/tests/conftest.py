@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+
+def draw_captcha(seed, text="a7kx3"):
+    """ Draw a Golestan-like 140x50 captcha: dark glyphs over a light, speckled background. """
+    rng = np.random.default_rng(seed)
+    img = Image.new("L", (140, 50), color=int(rng.integers(200, 256)))
+    draw = ImageDraw.Draw(img)
+
+    for idx, char in enumerate(text):
+        x = 12 + idx * 24 + int(rng.integers(-3, 4))
+        y = 14 + int(rng.integers(-4, 5))
+        draw.text((x, y), char, fill=int(rng.integers(0, 80)), font_size=22)
+
+    for _ in range(int(rng.integers(2, 6))):
+        points = [tuple(int(v) for v in rng.integers(0, (140, 50))) for _ in range(2)]
+        draw.line(points, fill=int(rng.integers(0, 120)), width=int(rng.integers(1, 3)))
+
+    np_img = np.array(img)
+    speckles = rng.random(np_img.shape) < rng.uniform(0.01, 0.08)
+    np_img[speckles] = rng.integers(0, 120, size=int(speckles.sum()))
+    return Image.fromarray(np_img, mode="L")
+
+
+@pytest.fixture
+def sample_captchas():
+    return [draw_captcha(seed) for seed in range(20)]
+
+
+@pytest.fixture
+def binarised_captchas(sample_captchas):
+    frames = []
+    for img in sample_captchas:
+        np_img = np.array(img)
+        frames.append(np.where(np_img > np.mean(np_img) - 5, 0, 1))
+    return frames
@@ -0,0 +1,140 @@
+import fcntl
+import os
+import threading
+import time
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from src.crawlers.admission import CrawlerBusy, crawl_slot, slot_usage
+from src.crawlers.models import CrawlJobKind, CrawlSpan
+from src.crawlers.services import claim_crawl_job, enqueue_crawl_job
+
+
+@pytest.fixture
+def slots(settings, tmp_path):
+    settings.CRAWLER_SLOT_DIR = str(tmp_path)
+    settings.CRAWLER_MAX_CONCURRENT_CRAWLS = 1
+    settings.CRAWLER_SLOT_QUEUE_SIZE = 1
+    settings.CRAWLER_RETRY_AFTER = 7
+    return settings
+
+
+@pytest.fixture
+def recorded_waits(mocker):
+    """ Waits recorded by crawl_slot(); waiter threads have connections of their own, outside the test transaction. """
+    record = mocker.patch("src.crawlers.services.record_crawl_spans")
+    return lambda: [call.args[2][0] for call in record.call_args_list]
+
+
+def wait_in_thread(**options):
+    """ Start a crawl_slot() waiter on another thread; returns the thread and what it ended with. """
+    outcome = {}
+
+    def wait():
+        try:
+            with crawl_slot(**options):
+                outcome["admitted"] = True
+        except CrawlerBusy as e:
+            outcome["busy"] = e
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    return thread, outcome
+
+
+def test_waiter_gets_the_slot_once_released(slots, recorded_waits):
+    """
+        Test that a crawl waits for a busy slot and takes it as soon as it is released.
+    """
+    with crawl_slot():
+        thread, outcome = wait_in_thread(wait=5)
+        time.sleep(0.3)
+        assert slot_usage() == {"slots": 1, "busy_slots": 1, "queue_size": 1, "waiting": 1}
+
+    thread.join()
+    assert outcome == {"admitted": True}
+    assert slot_usage()["busy_slots"] == 0
+
+    waits = recorded_waits()
+    assert [wait["stage"] for wait in waits] == ["slot_wait", "slot_wait"]
+    assert max(wait["duration_ms"] for wait in waits) >= 250
+
+
+def test_full_queue_is_rejected_at_once(slots, recorded_waits):
+    """
+        Test that a crawl is refused without waiting when the wait queue is full, and a waiter times out.
+    """
+    with crawl_slot():
+        thread, outcome = wait_in_thread(wait=0.5)
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        with pytest.raises(CrawlerBusy) as busy:
+            with crawl_slot(wait=5):
+                pass
+        assert time.monotonic() - start < 0.1
+        assert busy.value.retry_after == 7
+
+        thread.join()
+        assert isinstance(outcome["busy"], CrawlerBusy)
+
+    assert sum(wait["failed"] for wait in recorded_waits()) == 2
+
+
+@pytest.mark.django_db
+def test_job_queue_is_bounded(slots):
+    """
+        Test that jobs are refused past CRAWL_JOB_QUEUE_SIZE pending ones and their wait is recorded when claimed.
+    """
+    slots.CRAWL_JOB_QUEUE_SIZE = 1
+    enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4001", "secret")
+
+    with pytest.raises(CrawlerBusy):
+        enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4002", "secret")
+
+    job, _ = claim_crawl_job()
+    assert CrawlSpan.objects.get(trace_id=job.id, crawler="admission").stage == "job_wait"
+    enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4002", "secret")
+
+
+@pytest.mark.django_db
+def test_admission_metrics(slots):
+    """
+        Test that the metrics report the queue depths and the recorded waits.
+    """
+    admin = get_user_model().objects.create(username="admin", email="admin@example.com", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    with crawl_slot():
+        pass
+
+    response = client.get(reverse('admission-metrics'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["busy_slots"] == 0
+    assert response.data["pending_jobs"] == 0
+    assert response.data["waits"]["slot_wait"]["spans"] == 1
+
+
+def open_busy_marker(slots):
+    """ Hold the busy marker of slot 0 the way slot_usage() does while probing it. """
+    fd = os.open(os.path.join(slots.CRAWLER_SLOT_DIR, "slot-0.busy"), os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+
+def test_probing_usage_never_turns_a_crawl_away(slots, recorded_waits):
+    """
+        Test that a crawl taking the last slot while slot_usage() probes it is held up, not refused.
+    """
+    slots.CRAWLER_SLOT_QUEUE_SIZE = 0
+    probing = open_busy_marker(slots)
+
+    thread, outcome = wait_in_thread(wait=0)
+    time.sleep(0.1)
+    os.close(probing)
+    thread.join()
+
+    assert outcome == {"admitted": True}
@@ -0,0 +1,81 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.crawlers.async_browser_pool import AsyncBrowserPool
+
+
+def fake_browser(**kwargs):
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.close = AsyncMock()
+    browser.new_context = AsyncMock(side_effect=lambda **options: MagicMock(close=AsyncMock()))
+    return browser
+
+
+@pytest.fixture
+def chromium(mocker):
+    playwright = MagicMock()
+    playwright.stop = AsyncMock()
+    playwright.chromium.launch = AsyncMock(side_effect=fake_browser)
+    mocker.patch("src.crawlers.async_browser_pool.async_playwright").return_value.start = AsyncMock(
+        return_value=playwright)
+    return playwright.chromium
+
+
+def test_concurrent_contexts_share_a_browser(chromium):
+    """
+        Test that concurrent jobs get their own contexts on one browser until it is full.
+    """
+    async def scenario():
+        pool = AsyncBrowserPool(max_size=2, contexts_per_browser=3, max_jobs=50)
+        contexts = await asyncio.gather(*(pool.acquire() for _ in range(4)))
+        return pool, contexts
+
+    pool, contexts = asyncio.run(scenario())
+
+    assert chromium.launch.call_count == 2
+    assert len(set(map(id, contexts))) == 4
+    assert pool.size == 2
+
+
+def test_acquire_waits_for_a_free_slot(chromium):
+    """
+        Test that an acquirer waits, instead of failing, while every slot of every browser is taken.
+    """
+    async def scenario():
+        pool = AsyncBrowserPool(max_size=1, contexts_per_browser=1, max_jobs=50)
+        first = await pool.acquire()
+        waiting = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+
+        await pool.release(first)
+        second = await asyncio.wait_for(waiting, 1)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert chromium.launch.call_count == 1
+    first.close.assert_awaited_once()
+    assert first is not second
+
+
+def test_browser_is_retired_after_max_jobs(chromium):
+    """
+        Test that a browser is closed once it has served max_jobs contexts and they are all released.
+    """
+    async def scenario():
+        pool = AsyncBrowserPool(max_size=1, contexts_per_browser=2, max_jobs=2)
+        first, second = await pool.acquire(), await pool.acquire()
+        await pool.release(first)
+        browser = pool._browsers[0].browser
+        browser.close.assert_not_awaited()
+        await pool.release(second)
+        third = await pool.acquire()
+        return browser, pool, third
+
+    browser, pool, third = asyncio.run(scenario())
+
+    browser.close.assert_awaited_once()
+    assert chromium.launch.call_count == 2
+    assert pool.size == 1
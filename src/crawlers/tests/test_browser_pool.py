@@ -0,0 +1,118 @@
+import threading
+from unittest.mock import MagicMock
+import pytest
+from django.core.signals import request_finished
+from src.crawlers.browser_pool import BrowserPool, BrowserPoolExhausted, get_browser_pool
+
+
+def fake_browser(**kwargs):
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.new_context.side_effect = lambda **options: MagicMock()
+    return browser
+
+
+@pytest.fixture
+def chromium(mocker):
+    playwright = MagicMock()
+    mocker.patch("src.crawlers.browser_pool.sync_playwright").return_value.start.return_value = playwright
+    playwright.chromium.launch.side_effect = fake_browser
+    return playwright.chromium
+
+
+def test_browser_is_reused_across_jobs(chromium):
+    """
+        Test that consecutive jobs get fresh contexts on the same warm browser.
+    """
+    pool = BrowserPool(max_size=1, max_jobs=10)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert chromium.launch.call_count == 1
+    assert chromium.launch.call_args.kwargs == {"headless": True}
+    assert first is not second
+    first.close.assert_called_once()
+
+
+def test_browser_is_recycled_after_max_jobs(chromium):
+    """
+        Test that a browser is closed and relaunched after serving max_jobs contexts.
+    """
+    pool = BrowserPool(max_size=1, max_jobs=2)
+    context = pool.acquire()
+    browser = pool._leased[context].browser
+    pool.release(context)
+    pool.release(pool.acquire())
+
+    pool.acquire()
+
+    browser.close.assert_called_once()
+    assert chromium.launch.call_count == 2
+
+
+def test_crashed_browser_is_replaced(chromium):
+    """
+        Test that a disconnected browser is dropped instead of being handed out again.
+    """
+    pool = BrowserPool(max_size=1, max_jobs=10)
+    context = pool.acquire()
+    pool._leased[context].browser.is_connected.return_value = False
+    pool.release(context)
+
+    pool.acquire()
+
+    assert chromium.launch.call_count == 2
+
+
+def test_pool_size_is_enforced(chromium):
+    """
+        Test that no more than max_size browsers are launched.
+    """
+    pool = BrowserPool(max_size=2, max_jobs=10)
+    pool.acquire()
+    pool.acquire()
+
+    with pytest.raises(BrowserPoolExhausted):
+        pool.acquire()
+    assert pool.size == 2
+
+
+def test_close_shuts_every_browser(chromium):
+    """
+        Test that closing the pool closes leased and idle browsers.
+    """
+    pool = BrowserPool(max_size=2, max_jobs=10)
+    leased = pool.acquire()
+    leased_browser = pool._leased[leased].browser
+    pool.release(pool.acquire())
+
+    pool.close()
+
+    assert pool.size == 0
+    leased_browser.close.assert_called_once()
+
+
+def test_request_thread_pool_is_closed_when_the_request_finishes(chromium):
+    """
+        Test that the pool of a request thread is closed with its request and the main thread's is kept warm.
+    """
+    pools = []
+
+    def request_thread():
+        pool = get_browser_pool()
+        pool.release(pool.acquire())
+        request_finished.send(sender=None)
+        pools.append((pool, get_browser_pool()))
+
+    thread = threading.Thread(target=request_thread)
+    thread.start()
+    thread.join()
+
+    closed, replacement = pools[0]
+    assert closed.size == 0
+    assert replacement is not closed
+    main_pool = get_browser_pool()
+    request_finished.send(sender=None)
+    assert get_browser_pool() is main_pool
@@ -0,0 +1,42 @@
+from src.crawlers.captcha_solver.benchmark import STAGES, accuracy, load_corpus, run_benchmark
+from src.crawlers.captcha_solver.captcha_solver import solve_many
+
+# accuracy of the shipped model on the checked-in corpus, a solver change must not go below it
+BASELINE_CAPTCHA_ACCURACY = 0.79
+BASELINE_CHARACTER_ACCURACY = 0.95
+
+
+def test_corpus_accuracy_does_not_regress():
+    """
+        Test the solver against the labelled corpus as a regression gate.
+    """
+    corpus = load_corpus()
+    labels = [label for label, _ in corpus]
+
+    result = accuracy(labels, solve_many.local([img for _, img in corpus]))
+
+    assert len(corpus) >= 100
+    assert result["captcha"] >= BASELINE_CAPTCHA_ACCURACY
+    assert result["character"] >= BASELINE_CHARACTER_ACCURACY
+
+
+def test_benchmark_report_covers_every_stage():
+    """
+        Test that the benchmark reports latency per stage, throughput and accuracy.
+    """
+    report = run_benchmark(load_corpus()[:10], batch_size=4)
+
+    assert report["captchas"] == 10
+    assert set(report["stages"]) == set(STAGES)
+    assert all(timing["p95_ms"] >= timing["p50_ms"] >= 0 for timing in report["stages"].values())
+    assert report["throughput"]["single_per_second"] > 0
+    assert report["throughput"]["batch_per_second"] > 0
+    assert 0 <= report["accuracy"]["captcha"] <= report["accuracy"]["character"] <= 1
+
+
+def test_accuracy_counts_characters_by_position():
+    """
+        Test per-character accuracy for wrong and missing glyphs.
+    """
+    result = accuracy(["ab3k7", "x9y2c"], ["ab3k7", "x9y2"])
+    assert result == {"captcha": 0.5, "character": 0.9}
@@ -0,0 +1,59 @@
+import base64
+from io import BytesIO
+from src.crawlers.captcha_solver.cache import SolvedCaptchaCache
+from src.crawlers.captcha_solver.captcha_solver import captcha_key
+
+
+def encode(img, format="PNG"):
+    buffer = BytesIO()
+    img.save(buffer, format=format)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_key_is_stable_across_encodings(sample_captchas):
+    """
+        Test that the same captcha served as PNG or BMP maps to one cache entry.
+    """
+    img = sample_captchas[0]
+    assert captcha_key(encode(img)) == captcha_key(encode(img, format="BMP"))
+    assert captcha_key(encode(img)) != captcha_key(encode(sample_captchas[1]))
+
+
+def test_verdicts_are_recorded():
+    """
+        Test that a cached answer keeps the verdict of the login it was used for.
+    """
+    cache = SolvedCaptchaCache()
+    cache.put("key", "ab3k7")
+    assert cache.get("key").verdict is None
+
+    cache.mark("key", False)
+    assert cache.get("key").verdict is False
+
+    cache.put("key", "ab3k9")
+    assert cache.get("key").text == "ab3k9"
+    assert cache.get("key").verdict is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+        Test that the cache stays bounded and keeps recently used entries.
+    """
+    cache = SolvedCaptchaCache(max_size=2)
+    cache.put("a", "aaaaa")
+    cache.put("b", "bbbbb")
+    cache.get("a")
+    cache.put("c", "ccccc")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a").text == "aaaaa"
+
+
+def test_marking_unknown_key_is_ignored():
+    """
+        Test that a verdict for an evicted captcha doesn't raise.
+    """
+    cache = SolvedCaptchaCache()
+    cache.mark("missing", True)
+    assert cache.get("missing") is None
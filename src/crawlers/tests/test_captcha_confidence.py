@@ -0,0 +1,44 @@
+import numpy as np
+from src.crawlers.captcha_solver.captcha_solver import (
+    CaptchaPrediction, main, predict_with_confidence, preprocess,
+)
+
+
+def test_prediction_text_matches_plain_solve(sample_captchas):
+    """
+        Test that scoring doesn't change the predicted text.
+    """
+    for img in sample_captchas[:5]:
+        prediction = predict_with_confidence(preprocess(img))
+        assert prediction.text == main(img)
+        assert len(prediction.probabilities) == len(prediction.text)
+
+
+def test_confidence_is_product_of_glyph_probabilities(sample_captchas):
+    """
+        Test that every glyph gets a probability and the captcha confidence combines them.
+    """
+    prediction = predict_with_confidence(preprocess(sample_captchas[0]))
+
+    assert all(0 < p <= 1 for p in prediction.probabilities)
+    assert np.isclose(prediction.confidence, np.prod(prediction.probabilities), atol=1e-3)
+
+
+def test_prediction_without_glyphs():
+    """
+        Test that a captcha without glyphs has zero confidence instead of raising.
+    """
+    prediction = predict_with_confidence(np.empty((0, 1024), dtype=bool))
+    assert prediction == CaptchaPrediction(text='', probabilities=[], confidence=0.0)
+    assert not prediction.is_trustworthy()
+
+
+def test_is_trustworthy_checks_length_and_confidence():
+    """
+        Test the refetch decision for wrong glyph counts and low confidence.
+    """
+    prediction = CaptchaPrediction(text='ab3k7', probabilities=[0.9] * 5, confidence=0.59)
+
+    assert prediction.is_trustworthy(expected_length=5, min_confidence=0.5)
+    assert not prediction.is_trustworthy(expected_length=4, min_confidence=0.5)
+    assert not prediction.is_trustworthy(expected_length=5, min_confidence=0.6)
@@ -0,0 +1,55 @@
+import numpy as np
+from src.crawlers.captcha_solver.captcha_solver import denoise
+
+
+def legacy_denoise(np_img):
+    """ The original per-pixel noise filter, kept as the reference for the vectorized one. """
+    np_img = np_img.copy()
+    for _ in range(3):
+        for (idx, x) in enumerate(np_img):
+            for (idy, y) in enumerate(x):
+                if idx > 0 and idx < len(np_img) - 1 and idy > 0 and idy < len(x) - 1 and y == 1:
+                    tmp = np_img[
+                          idx - 1:idx + 2,
+                          idy - 1:idy + 2
+                          ].flatten()
+                    if list(tmp).count(1) - 1 < 4:
+                        np_img[idx, idy] = 0
+    return np_img
+
+
+def test_denoise_matches_legacy_loop_on_sample_captchas(binarised_captchas):
+    """
+        Test that the vectorized filter produces exactly the same bitmap as the pixel loop.
+    """
+    for frame in binarised_captchas:
+        assert np.array_equal(denoise(frame), legacy_denoise(frame))
+
+
+def test_denoise_matches_legacy_loop_on_random_noise():
+    """
+        Test that the vectorized filter matches the pixel loop for every noise density.
+    """
+    rng = np.random.default_rng(0)
+
+    for density in np.linspace(0.05, 0.95, 19):
+        frame = (rng.random((50, 140)) < density).astype(np.int64)
+        assert np.array_equal(denoise(frame), legacy_denoise(frame))
+
+
+def test_denoise_does_not_modify_input(binarised_captchas):
+    """
+        Test that the filter works on a copy of the frame.
+    """
+    frame = binarised_captchas[0]
+    original = frame.copy()
+    denoise(frame)
+    assert np.array_equal(frame, original)
+
+
+def test_denoise_keeps_tiny_frames():
+    """
+        Test that frames without interior pixels are returned unchanged.
+    """
+    frame = np.ones((2, 5), dtype=np.int64)
+    assert np.array_equal(denoise(frame), frame)
@@ -0,0 +1,47 @@
+import numpy as np
+from PIL import Image
+from src.crawlers.captcha_solver import captcha_solver
+from src.crawlers.captcha_solver.benchmark import load_corpus
+
+
+def pil_features(glyphs):
+    """ The per-glyph PIL normalisation the classifier's exemplars were built with. """
+    arr = []
+    for glyph in glyphs:
+        pil_img = Image.fromarray(
+            (glyph * 255).astype(np.uint8), mode="L").resize((32, 32), Image.Resampling.LANCZOS).convert("1")
+        arr.append(np.array(pil_img).reshape((1024, -1)).flatten())
+    return np.array(arr).reshape((len(arr), 1024))
+
+
+def corpus_glyphs():
+    return [
+        captcha_solver.segment(captcha_solver.denoise(captcha_solver.binarise(captcha_solver.decode(img))))
+        for _, img in load_corpus()
+    ]
+
+
+def test_features_have_classifier_layout():
+    """
+        Test that the features are one boolean row of 1024 pixels per glyph.
+    """
+    glyphs = corpus_glyphs()[0]
+    features = captcha_solver.extract_features(glyphs)
+
+    assert features.shape == (len(glyphs), 1024)
+    assert features.dtype == bool
+
+
+def test_features_match_pil_normalisation():
+    """
+        Test that the features are bit for bit the PIL ones the classifier's exemplars were built with.
+    """
+    for glyphs in corpus_glyphs():
+        assert np.array_equal(captcha_solver.extract_features(glyphs), pil_features(glyphs).astype(bool))
+
+
+def test_features_of_no_glyphs():
+    """
+        Test that a captcha without glyphs gives an empty matrix.
+    """
+    assert captcha_solver.extract_features([]).shape == (0, 1024)
@@ -0,0 +1,101 @@
+import base64
+import uuid
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from src.crawlers.models import CaptchaAttempt, CaptchaVerdict
+from src.crawlers.services import record_captcha_attempts
+
+
+IMAGE = base64.b64encode(b"\x89PNG fake captcha").decode("utf-8")
+
+
+def attempt(verdict, text="ab3k7", from_cache=False):
+    return {
+        "predicted_text": text, "confidence": 0.5, "latency_ms": 10.0,
+        "from_cache": from_cache, "verdict": verdict, "image": IMAGE,
+    }
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = get_user_model().objects.create(username="admin", email="admin@example.com", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.mark.django_db
+def test_attempts_of_a_login_are_recorded():
+    """
+        Test that one login's attempts are stored and only passed captchas keep their image.
+    """
+    login_id = uuid.uuid4()
+    record_captcha_attempts(login_id, [attempt("refetched"), attempt("wrong"), attempt("passed")])
+
+    attempts = CaptchaAttempt.objects.filter(login_id=login_id)
+    assert attempts.count() == 3
+    assert bytes(attempts.get(verdict=CaptchaVerdict.PASSED).image) == base64.b64decode(IMAGE)
+    assert attempts.get(verdict=CaptchaVerdict.WRONG).image is None
+
+
+@pytest.mark.django_db
+def test_captcha_metrics(admin_client):
+    """
+        Test rolling accuracy, retries and refetches per login.
+    """
+    record_captcha_attempts(uuid.uuid4(), [attempt("wrong"), attempt("wrong"), attempt("passed")])
+    record_captcha_attempts(uuid.uuid4(), [attempt("refetched"), attempt("passed", from_cache=True)])
+
+    response = admin_client.get(reverse('captcha-metrics'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["logins"] == 2
+    assert response.data["submitted"] == 4
+    assert response.data["accuracy"] == 0.5
+    assert response.data["retries_per_login"] == 1.0
+    assert response.data["refetches_per_login"] == 0.5
+
+
+@pytest.mark.django_db
+def test_captcha_metrics_without_attempts(admin_client):
+    """
+        Test that an empty window has no ratios.
+    """
+    response = admin_client.get(reverse('captcha-metrics'), {"hours": 1})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["logins"] == 0
+    assert response.data["accuracy"] is None
+
+
+@pytest.mark.django_db
+def test_captcha_metrics_require_admin():
+    """
+        Test that regular users can't read solver metrics.
+    """
+    user = get_user_model().objects.create(username="user", email="user@example.com")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert client.get(reverse('captcha-metrics')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_verified_captchas_are_exported_to_corpus(tmp_path):
+    """
+        Test that only passed captchas are written as labelled corpus images, not unverified ones.
+    """
+    record_captcha_attempts(uuid.uuid4(), [
+        attempt("wrong", text="zzzzz"), attempt("unknown", text="qqqqq"), attempt("passed", text="ab3k7"),
+    ])
+
+    call_command("export_captcha_corpus", str(tmp_path))
+
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    assert files[0].name.startswith("ab3k7_")
+    assert files[0].read_bytes() == base64.b64decode(IMAGE)
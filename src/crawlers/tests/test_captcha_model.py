@@ -0,0 +1,57 @@
+import threading
+from unittest.mock import patch
+from django.apps import apps
+from src.crawlers.captcha_solver.model import CaptchaModel, DEFAULT_MODEL_PATH
+
+
+def test_model_is_loaded_once_across_threads():
+    """
+        Test that concurrent first uses deserialise the classifier only once.
+    """
+    model = CaptchaModel()
+    results = []
+
+    with patch("src.crawlers.captcha_solver.model.load", return_value=object()) as mock_load:
+        threads = [threading.Thread(target=lambda: results.append(model.classifier)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert mock_load.call_count == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_warm_up_reports_load_statistics():
+    """
+        Test that warm_up loads the shipped classifier and reports time and memory.
+    """
+    model = CaptchaModel()
+    assert not model.is_loaded
+
+    stats = model.warm_up()
+
+    assert stats["loaded"] is True
+    assert stats["path"] == DEFAULT_MODEL_PATH
+    assert stats["load_seconds"] > 0
+    # the 1-NN classifier keeps its 1574 x 1024 training glyphs
+    assert stats["memory_bytes"] > 1574 * 1024
+
+
+def test_app_warms_up_only_when_asked(settings):
+    """
+        Test that loading the app leaves the classifier alone and the serving entry points warm it up on request.
+    """
+    config = apps.get_app_config('crawlers')
+    settings.CAPTCHA_SOLVER_WARM_UP = True
+
+    with patch("src.crawlers.captcha_solver.model.captcha_model.warm_up") as warm_up:
+        config.ready()
+        warm_up.assert_not_called()
+
+        config.warm_up_captcha_solver()
+        warm_up.assert_called_once()
+
+        settings.CAPTCHA_SOLVER_WARM_UP = False
+        config.warm_up_captcha_solver()
+        warm_up.assert_called_once()
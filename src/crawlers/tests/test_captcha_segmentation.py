@@ -0,0 +1,81 @@
+import numpy as np
+from src.crawlers.captcha_solver.captcha_solver import denoise, segment, split_images_x, split_images_y
+
+
+def legacy_split(img, axis):
+    """ The original per-line splitter, kept as the reference for the array-based one. """
+    imgs = []
+    start = 0
+    start_found = False
+    for idx in range(img.shape[axis]):
+        tmp = img[:, idx] if axis == 1 else img[idx, :]
+        if start_found:
+            if list(tmp.flatten()).count(1) < 2:
+                start_found = False
+                imgs.append(img[:, start:idx] if axis == 1 else img[start:idx, :])
+        else:
+            if not list(tmp.flatten()).count(1) < 2:
+                start_found = True
+                start = idx
+    return imgs
+
+
+def legacy_segment(np_img):
+    """ The glyph selection main() used to do on top of the per-line splitters. """
+    imgs = []
+    img = None
+    for img in legacy_split(np_img, axis=1):
+        imgs.append(legacy_split(img, axis=0))
+
+    glyphs = []
+    for x in imgs:
+        for y in x:
+            if len(y) >= 6 and len(y[0]) >= 3 and list(img.flatten()).count(1) > 15:
+                glyphs.append(y)
+    return glyphs
+
+
+def assert_same_slices(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert np.array_equal(a, e)
+
+
+def test_split_images_match_legacy_splitters(binarised_captchas):
+    """
+        Test that the projection-based splitters return the same strips as the line loops.
+    """
+    for frame in binarised_captchas:
+        frame = denoise(frame)
+        assert_same_slices(split_images_y(frame), legacy_split(frame, axis=1))
+        assert_same_slices(split_images_x(frame), legacy_split(frame, axis=0))
+
+
+def test_segment_matches_legacy_glyph_selection(binarised_captchas):
+    """
+        Test that segment returns the same glyph slices main() used to build.
+    """
+    for frame in binarised_captchas:
+        frame = denoise(frame)
+        assert_same_slices(segment(frame), legacy_segment(frame))
+
+
+def test_segment_matches_legacy_on_random_blocks():
+    """
+        Test edge cases: strips touching the frame border and strips of a single column.
+    """
+    rng = np.random.default_rng(1)
+
+    for _ in range(50):
+        frame = np.zeros((50, 140), dtype=np.int64)
+        for _ in range(rng.integers(1, 8)):
+            top, left = rng.integers(0, 50), rng.integers(0, 140)
+            frame[top:top + rng.integers(1, 30), left:left + rng.integers(1, 25)] = 1
+        assert_same_slices(segment(frame), legacy_segment(frame))
+
+
+def test_segment_of_empty_frame():
+    """
+        Test that a frame without foreground has no glyphs.
+    """
+    assert segment(np.zeros((50, 140), dtype=np.int64)) == []
@@ -0,0 +1,68 @@
+import base64
+import threading
+from io import BytesIO
+import pytest
+from src.crawlers.captcha_solver import captcha_solver, client
+from src.crawlers.captcha_solver.client import SolverClient
+from src.crawlers.captcha_solver.service import SolverService
+
+
+def encode(img):
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+@pytest.fixture
+def service_address(tmp_path):
+    address = str(tmp_path / "solver.sock")
+    service = SolverService(address, authkey=b"secret", workers=1)
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+    yield address
+    service.shutdown()
+
+
+@pytest.fixture
+def reset_client():
+    client._client = None
+    yield
+    client._client = None
+
+
+def test_service_solves_like_in_process(service_address, sample_captchas):
+    """
+        Test that the solver service returns what the in-process solver returns.
+    """
+    images = [encode(img) for img in sample_captchas[:3]]
+    solver = SolverClient(service_address, authkey=b"secret", timeout=30)
+
+    assert solver.call('ping') == 'pong'
+    assert solver.call('solve', images[0]) == captcha_solver.solve.local(images[0])
+    assert solver.call('solve_many', images) == captcha_solver.solve_many.local(images)
+    assert solver.call('solve_with_confidence', images[1]) == captcha_solver.solve_with_confidence.local(images[1])
+
+
+def test_solve_falls_back_to_in_process(settings, tmp_path, sample_captchas, reset_client):
+    """
+        Test that solve() still works when the configured service isn't running.
+    """
+    settings.CAPTCHA_SOLVER_SERVICE_ADDRESS = str(tmp_path / "missing.sock")
+    image = encode(sample_captchas[0])
+
+    assert captcha_solver.solve(image) == captcha_solver.solve.local(image)
+
+
+def test_client_rejects_unknown_requests(service_address):
+    """
+        Test that unknown request kinds come back as errors.
+    """
+    with pytest.raises(ValueError):
+        SolverClient(service_address, authkey=b"secret").call('train')
+
+
+def test_solve_without_service_configured(settings, reset_client):
+    """
+        Test that no client is built when no service address is configured.
+    """
+    settings.CAPTCHA_SOLVER_SERVICE_ADDRESS = None
+    assert client.get_client() is None
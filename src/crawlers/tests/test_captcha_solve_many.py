@@ -0,0 +1,62 @@
+import base64
+from io import BytesIO
+import numpy as np
+from PIL import Image
+from src.crawlers.captcha_solver.captcha_solver import solve, solve_many
+
+
+def encode(img):
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_solve_many_matches_single_solves(sample_captchas):
+    """
+        Test that batch solving returns the same text as solving each captcha on its own.
+    """
+    images = [encode(img) for img in sample_captchas]
+    assert solve_many(images) == [solve(img_base64) for img_base64 in images]
+
+
+def test_solve_many_calls_predict_once(sample_captchas, mocker):
+    """
+        Test that the glyphs of all captchas go through a single predict call.
+    """
+    from src.crawlers.captcha_solver.model import captcha_model
+    predict = mocker.spy(captcha_model.classifier, "predict")
+
+    solve_many([encode(img) for img in sample_captchas[:5]])
+
+    assert predict.call_count == 1
+
+
+def test_solve_many_with_blank_captcha(sample_captchas):
+    """
+        Test that a captcha without glyphs gives an empty string without breaking the batch.
+    """
+    blank = Image.fromarray(np.full((50, 140), 255, dtype=np.uint8), mode="L")
+    images = [encode(sample_captchas[0]), encode(blank)]
+
+    result = solve_many(images)
+
+    assert result[0] == solve(images[0])
+    assert result[1] == ""
+
+
+def test_solve_many_of_nothing():
+    """
+        Test that an empty batch gives an empty result.
+    """
+    assert solve_many([]) == []
+
+
+def test_raw_bytes_and_base64_solve_alike(sample_captchas):
+    """
+        Test that a captcha passed as the bytes of its image file solves like its base64 form.
+    """
+    images = [encode(img) for img in sample_captchas[:5]]
+    raw = [base64.b64decode(img_base64) for img_base64 in images]
+
+    assert solve_many(raw) == solve_many(images)
+    assert [solve(image) for image in raw] == [solve(img_base64) for img_base64 in images]
@@ -0,0 +1,76 @@
+import os
+import shutil
+from io import StringIO
+from django.core.management import call_command
+from joblib import load
+from src.crawlers.captcha_solver import training
+from src.crawlers.captcha_solver.benchmark import CORPUS_DIR, load_corpus
+
+
+def test_glyph_features_align_with_labels():
+    """
+        Test that every kept captcha contributes one feature row per label character.
+    """
+    corpus = load_corpus()[:20]
+
+    features, labels, skipped = training.glyph_features(corpus, batch_size=7)
+
+    assert features.shape == (len(labels), 1024)
+    assert len(labels) == sum(len(label) for label, _ in corpus) - 5 * skipped
+
+
+def test_split_keeps_captchas_apart():
+    """
+        Test that train and test sets don't share captchas.
+    """
+    corpus = load_corpus()
+    train, test = training.split_corpus(corpus, test_size=0.25)
+
+    assert len(train) + len(test) == len(corpus)
+    assert not {img for _, img in train} & {img for _, img in test}
+
+
+def test_split_of_a_small_corpus_keeps_a_test_captcha():
+    """
+        Test that a corpus too small for the test share still holds one captcha out.
+    """
+    corpus = load_corpus()[:2]
+    train, test = training.split_corpus(corpus, test_size=0.2)
+
+    assert len(train) == len(test) == 1
+
+
+def test_command_writes_the_model_to_the_model_dir(tmp_path, settings):
+    """
+        Test training on three captchas and writing the model to CAPTCHA_MODEL_DIR, not the package.
+    """
+    corpus_dir = tmp_path / "corpus"
+    corpus_dir.mkdir()
+    for name in sorted(os.listdir(CORPUS_DIR))[:3]:
+        shutil.copy(os.path.join(CORPUS_DIR, name), corpus_dir)
+    settings.CAPTCHA_MODEL_DIR = str(tmp_path / "models")
+    out = StringIO()
+
+    call_command('train_captcha_model', corpus=[str(corpus_dir)], stdout=out)
+
+    assert (tmp_path / "models" / "edu-v1.pkl").exists()
+    assert "test: " in out.getvalue()
+
+
+def test_trained_model_is_versioned_with_report(tmp_path):
+    """
+        Test training on the corpus and writing edu-v<N>.pkl with its report.
+    """
+    train_corpus, test_corpus = training.split_corpus(load_corpus(), test_size=0.2)
+    features, labels, skipped = training.glyph_features(train_corpus)
+    classifier = training.train(features, labels)
+    report = training.build_report(classifier, train_corpus, test_corpus, skipped)
+
+    (tmp_path / "edu-v3.pkl").touch()
+    path = training.next_model_path(tmp_path)
+    training.save_model(classifier, report, path)
+
+    assert path.endswith("edu-v4.pkl")
+    assert (tmp_path / "edu-v4.json").exists()
+    assert load(path).training_report_["test"]["captchas"] == len(test_corpus)
+    assert report["test"]["accuracy"]["character"] > 0.5
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+from datetime import timedelta
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from src.crawlers.models import CrawlJob, CrawlJobKind, CrawlJobStage, CrawlJobStatus
+from src.crawlers.services import (
+    claim_crawl_job, enqueue_crawl_job, expire_pending_crawl_jobs, fail_stale_crawl_jobs, run_crawl_job,
+)
+
+
+@pytest.mark.django_db
+def test_claim_wipes_the_password():
+    """
+        Test that claiming a job decrypts its password and removes it from the row.
+    """
+    job = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4001", "secret")
+
+    claimed, password = claim_crawl_job()
+    job.refresh_from_db()
+
+    assert claimed.id == job.id
+    assert password == "secret"
+    assert job.encrypted_password is None
+    assert job.status == CrawlJobStatus.RUNNING
+    assert job.stage == CrawlJobStage.CRAWLING
+    assert claim_crawl_job() == (None, None)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claim_skips_jobs_locked_by_another_worker():
+    """
+        Test that a job locked by another worker is skipped instead of waited for.
+    """
+    first = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4001", "first")
+    second = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4002", "second")
+    locked, release = threading.Event(), threading.Event()
+
+    def other_worker():
+        with transaction.atomic():
+            CrawlJob.objects.select_for_update().get(id=first.id)
+            locked.set()
+            release.wait(5)
+        connection.close()
+
+    thread = threading.Thread(target=other_worker)
+    thread.start()
+    try:
+        assert locked.wait(5)
+        claimed, password = claim_crawl_job()
+    finally:
+        release.set()
+        thread.join()
+
+    assert claimed.id == second.id
+    assert password == "second"
+
+
+@pytest.mark.django_db
+def test_unexpected_errors_are_not_leaked(mocker):
+    """
+        Test that an unexpected handler error fails the job with a generic message.
+    """
+    mocker.patch(
+        'src.courses.services.course_retrieve_service.fetch_student_courses',
+        side_effect=RuntimeError("Timeout 30000ms exceeded"),
+    )
+    enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4001", "secret")
+
+    job = run_crawl_job(*claim_crawl_job())
+
+    assert job.status == CrawlJobStatus.FAILED
+    assert job.error == "internal server error"
+    assert job.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_stale_running_jobs_are_failed():
+    """
+        Test that jobs left running past the timeout are failed and fresh ones are left alone.
+    """
+    stale = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4001", "secret")
+    fresh = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4002", "secret")
+    CrawlJob.objects.filter(id=stale.id).update(
+        status=CrawlJobStatus.RUNNING, started_at=timezone.now() - timedelta(minutes=30))
+    CrawlJob.objects.filter(id=fresh.id).update(status=CrawlJobStatus.RUNNING, started_at=timezone.now())
+
+    assert fail_stale_crawl_jobs(600) == 1
+    stale.refresh_from_db()
+    fresh.refresh_from_db()
+    assert stale.status == CrawlJobStatus.FAILED
+    assert fresh.status == CrawlJobStatus.RUNNING
+
+
+@pytest.mark.django_db
+def test_unclaimed_jobs_expire_with_their_password(settings):
+    """
+        Test that jobs pending past the timeout are failed with their password wiped and stop counting against the queue.
+    """
+    settings.CRAWL_JOB_QUEUE_SIZE = 1
+    stale = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4001", "secret")
+    CrawlJob.objects.filter(id=stale.id).update(created_at=timezone.now() - timedelta(hours=1))
+
+    fresh = enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, "4002", "secret")
+    stale.refresh_from_db()
+
+    assert stale.status == CrawlJobStatus.FAILED
+    assert stale.encrypted_password is None
+    assert fresh.status == CrawlJobStatus.PENDING
+    assert expire_pending_crawl_jobs(300) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_crawls_several_jobs_on_one_event_loop(mocker, settings, tmp_path):
+    """
+        Test that the worker runs --concurrency jobs at once, their async crawls sharing the worker's event loop.
+    """
+    settings.CRAWLER_ASYNC_ENGINE = True
+    settings.CRAWLER_BACKEND = "playwright"
+    settings.CRAWLER_SLOT_DIR = str(tmp_path)
+    settings.CRAWLER_MAX_CONCURRENT_CRAWLS = 2
+    sync_crawler = mocker.patch("src.crawlers.engine.CourseRetrieveCrawler")
+    loops, in_flight = [], []
+
+    class FakeCrawler:
+        def __init__(self, trace=None):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+        async def fetch_student_courses(self, username, password):
+            loops.append(asyncio.get_running_loop())
+            in_flight.append(username)
+            # only returns once both jobs are crawling
+            while len(in_flight) < 2:
+                await asyncio.sleep(0.01)
+            return []
+
+    mocker.patch("src.crawlers.engine.AsyncCourseRetrieveCrawler", FakeCrawler)
+    jobs = [enqueue_crawl_job(CrawlJobKind.COURSE_RETRIEVE, student_id, "secret") for student_id in ("4001", "4002")]
+
+    call_command("run_crawl_worker", once=True, concurrency=2, stdout=StringIO())
+
+    assert sorted(in_flight) == ["4001", "4002"]
+    assert len(set(loops)) == 1
+    sync_crawler.assert_not_called()
+    for job in jobs:
+        job.refresh_from_db()
+        assert job.status == CrawlJobStatus.SUCCEEDED
@@ -0,0 +1,111 @@
+import json
+import logging
+import uuid
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from src.crawlers.crawl_timing import CrawlTrace
+from src.crawlers.models import CrawlSpan
+from src.crawlers.services import record_crawl_spans
+
+
+def span(stage, duration_ms, failed=False):
+    return {"stage": stage, "duration_ms": duration_ms, "failed": failed}
+
+
+@pytest.fixture
+def admin_client(db):
+    admin = get_user_model().objects.create(username="admin", email="admin@example.com", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+@pytest.mark.django_db
+def test_trace_is_logged_and_stored(caplog):
+    """
+        Test that a finished trace logs one JSON line and stores its spans with a total, once.
+    """
+    trace = CrawlTrace("CourseRetrieveCrawler")
+    with trace.span("login_page"):
+        pass
+    with pytest.raises(ValueError):
+        with trace.span("login"):
+            raise ValueError("username or password is incorrect")
+    trace.count("wrong")
+
+    with caplog.at_level(logging.INFO, logger="src.crawlers.crawl_timing"):
+        trace.finish()
+        trace.finish()
+
+    spans = CrawlSpan.objects.filter(trace_id=trace.trace_id)
+    assert sorted(spans.values_list("stage", flat=True)) == ["login", "login_page", "total"]
+    assert spans.get(stage="login").failed
+    assert spans.get(stage="total").failed
+
+    assert len(caplog.records) == 1
+    payload = json.loads(caplog.records[0].getMessage().split(" ", 2)[2])
+    assert payload == caplog.records[0].crawl_trace
+    assert payload["failed"] is True
+    assert payload["counters"] == {"wrong": 1}
+    assert payload["stages"]["login_page"]["spans"] == 1
+
+
+@pytest.mark.django_db
+def test_crawl_timing_metrics(admin_client, settings):
+    """
+        Test per-stage histograms, estimated percentiles and spans per crawl, slowest stage first.
+    """
+    settings.CRAWLER_TIMING_BUCKETS_MS = (100, 1000, 10000)
+    record_crawl_spans(uuid.uuid4(), "CourseRetrieveCrawler", [
+        span("login_page", 800), span("login_page", 900), span("report", 5000), span("total", 6700),
+    ])
+    record_crawl_spans(uuid.uuid4(), "CourseRetrieveCrawler", [
+        span("login_page", 50), span("report", 20000, failed=True), span("total", 20050, failed=True),
+    ])
+
+    response = admin_client.get(reverse('crawl-timing-metrics'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["crawls"] == 2
+    assert response.data["failed_crawls"] == 1
+    assert [stage["stage"] for stage in response.data["stages"]] == ["report", "login_page"]
+
+    report, login_page = response.data["stages"]
+    assert report["failed"] == 1
+    assert report["p50_ms"] == 10000
+    assert report["p95_ms"] == 20000
+    assert login_page["spans_per_crawl"] == 1.5
+    assert login_page["histogram"] == [
+        {"le_ms": 100, "count": 1}, {"le_ms": 1000, "count": 3}, {"le_ms": 10000, "count": 3},
+    ]
+    assert login_page["p50_ms"] == 1000
+
+
+@pytest.mark.django_db
+def test_crawl_timing_metrics_of_one_crawler(admin_client):
+    """
+        Test that the metrics can be narrowed to one crawler and an empty window has no total.
+    """
+    record_crawl_spans(uuid.uuid4(), "StudentValidatorCrawler", [span("menu", 300), span("total", 300)])
+
+    response = admin_client.get(reverse('crawl-timing-metrics'), {"crawler": "CourseRetrieveCrawler"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["crawls"] == 0
+    assert response.data["total"] is None
+    assert response.data["stages"] == []
+
+
+@pytest.mark.django_db
+def test_crawl_timing_metrics_require_admin():
+    """
+        Test that regular users can't read crawl metrics.
+    """
+    user = get_user_model().objects.create(username="user", email="user@example.com")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert client.get(reverse('crawl-timing-metrics')).status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,60 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from src.crawlers import engine
+
+
+def test_sync_crawler_is_used_outside_asgi(mocker, settings):
+    """
+        Test that without a server event loop the sync crawler runs and is closed.
+    """
+    settings.CRAWLER_ASYNC_ENGINE = True
+    crawler = mocker.patch("src.crawlers.engine.CourseRetrieveCrawler").return_value
+    crawler.fetch_student_courses.return_value = [{"course_code": "1"}]
+
+    assert engine.fetch_student_courses("4001", "secret") == [{"course_code": "1"}]
+    crawler.close.assert_called_once()
+
+
+def test_async_crawler_runs_on_the_server_loop(mocker, settings):
+    """
+        Test that a sync view served under ASGI awaits the async crawler on the server's event loop.
+    """
+    settings.CRAWLER_ASYNC_ENGINE = True
+    sync_crawler = mocker.patch("src.crawlers.engine.StudentValidatorCrawler")
+    loops = []
+
+    class FakeCrawler:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+        async def fetch_student_info(self, username, password):
+            loops.append(asyncio.get_running_loop())
+            return {"student_number": username}
+
+    mocker.patch("src.crawlers.engine.AsyncStudentValidatorCrawler", FakeCrawler)
+
+    async def serve():
+        info = await sync_to_async(engine.fetch_student_info)("4001", "secret")
+        return info, asyncio.get_running_loop()
+
+    info, server_loop = asyncio.run(serve())
+
+    assert info == {"student_number": "4001"}
+    assert loops == [server_loop]
+    sync_crawler.assert_not_called()
+
+
+def test_async_engine_can_be_disabled(mocker, settings):
+    """
+        Test that CRAWLER_ASYNC_ENGINE=False keeps ASGI requests on the sync crawler.
+    """
+    settings.CRAWLER_ASYNC_ENGINE = False
+
+    async def serve():
+        return await sync_to_async(engine.use_async_engine)()
+
+    assert asyncio.run(serve()) is False
+
@@ -0,0 +1,161 @@
+from unittest.mock import MagicMock
+import pytest
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from src.crawlers import CourseRetrieveCrawler
+from src.crawlers.captcha_login import UNKNOWN
+from src.crawlers.golestan_base_crawler import GolestanBaseCrawler
+from src.crawlers.golestan_pages import (
+    CAPTCHA_REFRESH_SCRIPT, LOGGED_IN, WRONG_CAPTCHA_MESSAGE, WRONG_CREDENTIALS_MESSAGE,
+)
+
+
+@pytest.fixture
+def page(mocker):
+    pool = mocker.patch("src.crawlers.golestan_base_crawler.get_browser_pool").return_value
+    return pool.acquire.return_value.new_page.return_value
+
+
+def login_outcome(page, value):
+    page.wait_for_function.return_value.json_value.return_value = value
+    return GolestanBaseCrawler()._GolestanBaseCrawler__check_login_status()
+
+
+def test_login_outcome_is_awaited_once(page, settings):
+    """
+        Test that the login status is one wait on the page, bounded by the login step timeout.
+    """
+    settings.CRAWLER_STEP_TIMEOUTS = {**settings.CRAWLER_STEP_TIMEOUTS, 'login': 1234}
+
+    assert login_outcome(page, "logged_in") is True
+    page.wait_for_function.assert_called_once()
+    assert page.wait_for_function.call_args.kwargs["timeout"] == 1234
+    assert page.wait_for_function.call_args.kwargs["arg"] == [WRONG_CREDENTIALS_MESSAGE, WRONG_CAPTCHA_MESSAGE]
+    page.wait_for_timeout.assert_not_called()
+
+
+def test_login_outcome_messages(page):
+    """
+        Test that a wrong captcha returns False and wrong credentials raise ValueError.
+    """
+    assert login_outcome(page, WRONG_CAPTCHA_MESSAGE) is False
+
+    with pytest.raises(ValueError):
+        login_outcome(page, WRONG_CREDENTIALS_MESSAGE)
+
+
+def test_login_timeout(page):
+    """
+        Test that no outcome within the step timeout is an unknown error.
+    """
+    page.wait_for_function.side_effect = PlaywrightTimeoutError("Timeout 10000ms exceeded")
+
+    with pytest.raises(Exception, match="unknown error"):
+        GolestanBaseCrawler()._GolestanBaseCrawler__check_login_status()
+
+
+def test_search_is_clicked_again_until_the_report_frame_attaches(page, settings):
+    """
+        Test that an ignored click is retried after a share of the menu timeout, and a working one returns at once.
+    """
+    settings.CRAWLER_STEP_TIMEOUTS = {**settings.CRAWLER_STEP_TIMEOUTS, 'menu': 1000}
+    report_frame = page.locator.return_value
+    report_frame.wait_for.side_effect = [PlaywrightTimeoutError("Timeout"), None]
+    ok_button = MagicMock()
+    page.frame_locator.return_value.frame_locator.return_value.frame_locator.return_value.locator.return_value = ok_button
+
+    CourseRetrieveCrawler()._CourseRetrieveCrawler__search_courses()
+
+    assert ok_button.click.call_count == 2
+    assert [c.kwargs["timeout"] for c in report_frame.wait_for.call_args_list] == [50, 250]
+
+
+def captcha_response(url="https://golestan.ui.ac.ir/Forms/AuthenticateUser/captcha.aspx?rnd=0.3", resource_type="image"):
+    response = MagicMock(url=url, ok=True)
+    response.request.resource_type = resource_type
+    response.body.return_value = b"GIF89a..."
+    return response
+
+
+def test_captcha_is_taken_from_its_response(page):
+    """
+        Test that the captcha bytes come from the image response of the login form, not a screenshot.
+    """
+    crawler = GolestanBaseCrawler()
+    on_response = page.on.call_args.args[1]
+    on_response(captcha_response(url="https://golestan.ui.ac.ir/_images/logo.gif"))
+    on_response(captcha_response())
+
+    assert crawler._GolestanBaseCrawler__extract_captcha() == b"GIF89a..."
+    page.wait_for_event.assert_not_called()
+    page.frame_locator.assert_not_called()
+
+
+def test_captcha_falls_back_to_a_screenshot(page):
+    """
+        Test that a captcha without a network response is screenshot from the form.
+    """
+    page.wait_for_event.side_effect = PlaywrightTimeoutError("Timeout 5000ms exceeded")
+    captcha_element = page.frame_locator.return_value.frame_locator.return_value.frame_locator.return_value.locator
+    captcha_element.return_value.screenshot.return_value = b"\x89PNG..."
+
+    assert GolestanBaseCrawler()._GolestanBaseCrawler__extract_captcha() == b"\x89PNG..."
+
+
+def log_in(page, mocker, outcomes):
+    mocker.patch("src.crawlers.golestan_base_crawler.answer_captcha", return_value=MagicMock(text="a1b2c"))
+    page.wait_for_function.return_value.json_value.side_effect = outcomes
+    crawler = GolestanBaseCrawler()
+    crawler._GolestanBaseCrawler__login("40012345", "secret", MagicMock())
+    return crawler
+
+
+def test_wrong_captcha_is_refreshed_in_the_open_form(page, mocker):
+    """
+        Test that after a wrong captcha only the captcha of the open login form is reloaded, not the login page.
+    """
+    page.evaluate.return_value = True
+
+    crawler = log_in(page, mocker, [WRONG_CAPTCHA_MESSAGE, WRONG_CAPTCHA_MESSAGE, LOGGED_IN])
+
+    page.goto.assert_called_once()
+    assert page.evaluate.call_args_list == [mocker.call(CAPTCHA_REFRESH_SCRIPT)] * 2
+    assert crawler.trace.stage_totals()["captcha_refresh"]["spans"] == 2
+
+
+def test_captcha_of_wrong_credentials_is_not_verified(page, mocker):
+    """
+        Test that a captcha answered with the wrong password message is recorded with an unknown verdict.
+    """
+    mocker.patch("src.crawlers.golestan_base_crawler.answer_captcha", return_value=MagicMock(text="a1b2c"))
+    page.wait_for_function.return_value.json_value.return_value = WRONG_CREDENTIALS_MESSAGE
+    attempts = MagicMock()
+
+    with pytest.raises(ValueError):
+        GolestanBaseCrawler()._GolestanBaseCrawler__login("40012345", "wrong", attempts)
+
+    assert attempts.record.call_args.args[1] == UNKNOWN
+
+
+def test_login_page_is_opened_again_when_the_form_is_gone(page, mocker):
+    """
+        Test that a captcha refresh that finds no form, or fails, falls back to opening the login page.
+    """
+    page.evaluate.side_effect = [False, PlaywrightError("Execution context was destroyed")]
+
+    log_in(page, mocker, [WRONG_CAPTCHA_MESSAGE, WRONG_CAPTCHA_MESSAGE, LOGGED_IN])
+
+    assert page.goto.call_count == 3
+
+
+def test_context_goes_back_to_the_pool_when_the_crawler_fails_to_start(mocker):
+    """
+        Test that a context whose page can't be opened is released instead of staying leased.
+    """
+    pool = mocker.patch("src.crawlers.golestan_base_crawler.get_browser_pool").return_value
+    context = pool.acquire.return_value
+    context.new_page.side_effect = PlaywrightError("Target page, context or browser has been closed")
+
+    with pytest.raises(PlaywrightError):
+        GolestanBaseCrawler()
+
+    pool.release.assert_called_once_with(context)
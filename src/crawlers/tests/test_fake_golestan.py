@@ -0,0 +1,99 @@
+import json
+import pytest
+import requests
+from django.core.management import call_command
+from src.courses.services import save_golestan_courses
+from src.crawlers import HttpCourseRetrieveCrawler
+from src.crawlers.captcha_login import CaptchaAnswer
+from src.crawlers.fake_golestan import FakeGolestan
+from src.crawlers.golestan_pages import HTTP_LOGIN_PATH, HTTP_REPORT_PATH, LOGIN_PATH, golestan_url
+from src.crawlers.http_course_retrieve_crawler import GolestanProtocolError
+
+
+@pytest.fixture
+def golestan(settings, mocker):
+    mocker.patch("src.crawlers.captcha_login.LoginAttempts.save")
+    mocker.patch("src.crawlers.crawl_timing.CrawlTrace.finish")
+    golestan = FakeGolestan(courses=25, check_captcha=False).start()
+    settings.GOLESTAN_BASE_URL = golestan.base_url
+    yield golestan
+    golestan.stop()
+
+
+def crawl(username, password):
+    crawler = HttpCourseRetrieveCrawler()
+    try:
+        return crawler.fetch_student_courses(username, password)
+    finally:
+        crawler.close()
+
+
+@pytest.mark.django_db
+def test_report_is_crawled_and_saved(golestan):
+    """
+        Test that the HTTP crawler logs in to the stand-in and its report rows pass the course cleaner.
+    """
+    courses = crawl("4001", "secret")
+
+    assert len(courses) == 25
+    saved, errors = save_golestan_courses(courses)
+    assert errors is None
+    assert len(saved) == 25
+
+
+def test_wrong_password_is_reported(golestan):
+    """
+        Test that a wrong password gets Golestan's wrong credentials message, left to the browser crawler to confirm.
+    """
+    with pytest.raises(GolestanProtocolError, match="wrong password"):
+        crawl("4001", "wrong")
+
+
+def test_wrong_captchas_are_rejected(golestan, mocker, settings):
+    """
+        Test that a checked captcha must be answered with the label of the corpus image served.
+    """
+    golestan.check_captcha = True
+    answer = mocker.patch("src.crawlers.http_course_retrieve_crawler.answer_captcha",
+                          return_value=CaptchaAnswer(text="?????"))
+
+    with pytest.raises(GolestanProtocolError, match="no captcha was accepted"):
+        crawl("4001", "secret")
+    assert answer.call_count == settings.CRAWLER_HTTP_LOGIN_TRIES
+
+
+def test_pages_need_a_logged_in_session(golestan):
+    """
+        Test that the report is only served to a logged-in session and the frameset opens with the login form.
+    """
+    response = requests.post(golestan_url(HTTP_REPORT_PATH), data={"F20851": "212"})
+    assert "<table>" not in response.text
+    assert 'id="Faci1"' in response.text
+    assert 'id="Faci2"' not in requests.get(golestan_url(LOGIN_PATH)).text
+
+
+def test_login_form_is_only_kept_open_on_request(golestan):
+    """
+        Test that a login post replaces the form unless keep_login_form posts it into a hidden frame.
+    """
+    assert 'target=' not in requests.get(golestan_url(HTTP_LOGIN_PATH)).text
+
+    golestan.keep_login_form = True
+    assert 'target="loginResult"' in requests.get(golestan_url(HTTP_LOGIN_PATH)).text
+
+
+def test_benchmark_command(capsys, mocker):
+    """
+        Test that the end-to-end benchmark reports every concurrency level.
+    """
+    mocker.patch("src.crawlers.http_course_retrieve_crawler.answer_captcha", return_value=CaptchaAnswer(text="a7kx3"))
+    # the crawls run on threads of their own, outside the test transaction
+    mocker.patch("src.crawlers.captcha_login.LoginAttempts.save")
+    mocker.patch("src.crawlers.crawl_timing.CrawlTrace.finish")
+
+    call_command("benchmark_crawlers", engine="http", concurrency="1,2", crawls=2, courses=5,
+                 no_captcha_check=True, json=True)
+
+    report = json.loads(capsys.readouterr().out)
+    assert [level["concurrency"] for level in report["levels"]] == [1, 2]
+    assert all(level["failed"] == 0 and level["courses"] == 5 for level in report["levels"])
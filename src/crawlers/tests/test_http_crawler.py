@@ -0,0 +1,169 @@
+import pytest
+import requests
+from src.crawlers import HttpCourseRetrieveCrawler, engine
+from src.crawlers.captcha_login import UNKNOWN, CaptchaAnswer, LoginAttempts
+from src.crawlers.golestan_html import report_rows
+from src.crawlers.golestan_pages import (
+    HTTP_CAPTCHA_PATH, HTTP_LOGIN_PATH, HTTP_REPORT_PATH, WRONG_CAPTCHA_MESSAGE, WRONG_CREDENTIALS_MESSAGE,
+)
+from src.crawlers.http_course_retrieve_crawler import GolestanProtocolError
+
+
+REPORT = """
+<table>
+<tr><th>h</th><th>h</th><th>h</th><th>code</th><th>name</th><th>t</th><th>p</th><th>cap</th><th>g</th>
+<th>prof</th><th>classes</th><th>loc</th><th>pre</th><th>notes</th></tr>
+<tr><td>1</td><td>x</td><td>y</td><td>1212317_01</td><td>فارسي عمومي</td><td>3</td><td>0</td><td>50</td>
+<td>مختلط</td><td>حسين پور</td><td>درس(ت): يك شنبه 10:00-12:00<br>امتحان(1404.03.26) ساعت : 10:00-12:00</td>
+<td>ادبيات</td><td>1212318</td><td></td></tr>
+</table>
+"""
+
+
+def page(text="", status=200, content_type="text/html; charset=utf-8", content=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = content if content is not None else text.encode()
+    response.headers["Content-Type"] = content_type
+    response.encoding = "utf-8"
+    return response
+
+
+@pytest.fixture
+def golestan(mocker):
+    """ Requests sent by the crawler, answered by a fake Golestan keyed by (method, path). """
+    pages = {
+        ("GET", HTTP_LOGIN_PATH): page('<input type="hidden" name="__VIEWSTATE" value="vs1">'),
+        ("GET", HTTP_CAPTCHA_PATH): page(content=b"GIF89a", content_type="image/gif"),
+        ("POST", HTTP_LOGIN_PATH): page("<script>menu.id = 'Faci2';</script>"),
+        ("GET", HTTP_REPORT_PATH): page('<input type="hidden" name="__VIEWSTATE" value="vs2">'),
+        ("POST", HTTP_REPORT_PATH): page(REPORT),
+    }
+    sent = []
+
+    def request(self, method, url, **kwargs):
+        path = url.split("golestan.ui.ac.ir", 1)[1]
+        sent.append((method, path, kwargs.get("data")))
+        return pages[(method, path)]
+
+    mocker.patch.object(requests.Session, "request", request)
+    mocker.patch("src.crawlers.http_course_retrieve_crawler.answer_captcha",
+                 return_value=CaptchaAnswer(key="k", text="a7kx3"))
+    mocker.patch("src.crawlers.captcha_login.LoginAttempts.save")
+    return pages, sent
+
+
+def test_report_rows_render_cells_like_inner_text():
+    """
+        Test that report cells are read like innerText, with <br> as a newline.
+    """
+    rows = report_rows(REPORT)
+
+    assert len(rows) == 2
+    assert rows[1][3] == "1212317_01"
+    assert rows[1][10] == "درس(ت): يك شنبه 10:00-12:00\nامتحان(1404.03.26) ساعت : 10:00-12:00"
+
+
+def test_courses_are_fetched_over_http(golestan):
+    """
+        Test that the login and report forms are posted back with their hidden fields and the report is mapped.
+    """
+    _, sent = golestan
+
+    courses = HttpCourseRetrieveCrawler().fetch_student_courses("4001", "secret")
+
+    assert sent[2] == ("POST", HTTP_LOGIN_PATH, {"__VIEWSTATE": "vs1", "F80351": "4001", "F80401": "secret",
+                                                  "F51701": "a7kx3"})
+    assert sent[4] == ("POST", HTTP_REPORT_PATH, {"__VIEWSTATE": "vs2", "F20851": "212", "ExToEx": "1"})
+    assert len(courses) == 1
+    assert courses[0]["course_code"] == "1212317_01"
+    assert courses[0]["prerequisites"] == ["1212318"]
+    assert courses[0]["notes"] == ""
+
+
+def test_wrong_credentials_are_left_to_the_browser_crawler(golestan, mocker):
+    """
+        Test that Golestan's wrong password message is a protocol error, so Playwright confirms it, after one post.
+    """
+    pages, sent = golestan
+    pages[("POST", HTTP_LOGIN_PATH)] = page(f"<span id='errtxt' title='{WRONG_CREDENTIALS_MESSAGE}'></span>")
+    record = mocker.spy(LoginAttempts, "record")
+
+    with pytest.raises(GolestanProtocolError):
+        HttpCourseRetrieveCrawler().fetch_student_courses("4001", "wrong")
+    assert [request for request in sent if request[0] == "POST"] == [sent[2]]
+    assert record.call_args.args[2] == UNKNOWN
+
+
+def test_login_needs_the_main_menu(golestan):
+    """
+        Test that a login answer with neither a message nor the main menu is a protocol error, not a login.
+    """
+    pages, sent = golestan
+    pages[("POST", HTTP_LOGIN_PATH)] = page("<html>something else</html>")
+
+    with pytest.raises(GolestanProtocolError):
+        HttpCourseRetrieveCrawler().fetch_student_courses("4001", "secret")
+    assert ("GET", HTTP_REPORT_PATH, None) not in sent
+
+
+def test_no_accepted_captcha_is_a_protocol_error(golestan, settings):
+    """
+        Test that the password is posted at most CRAWLER_HTTP_LOGIN_TRIES times, then the crawl falls back to Playwright.
+    """
+    settings.CRAWLER_HTTP_LOGIN_TRIES = 2
+    pages, sent = golestan
+    pages[("POST", HTTP_LOGIN_PATH)] = page(f"<span id='errtxt' title='{WRONG_CAPTCHA_MESSAGE}'></span>")
+
+    with pytest.raises(GolestanProtocolError):
+        HttpCourseRetrieveCrawler().fetch_student_courses("4001", "secret")
+    assert len([request for request in sent if request[:2] == ("POST", HTTP_LOGIN_PATH)]) == 2
+
+
+def test_unexpected_report_is_a_protocol_error(golestan):
+    """
+        Test that a report page without the course table raises GolestanProtocolError.
+    """
+    pages, _ = golestan
+    pages[("POST", HTTP_REPORT_PATH)] = page("<html>session expired</html>")
+
+    with pytest.raises(GolestanProtocolError):
+        HttpCourseRetrieveCrawler().fetch_student_courses("4001", "secret")
+
+
+def test_engine_falls_back_to_playwright(mocker, settings):
+    """
+        Test that the http backend is tried first and Playwright takes over when it fails, but not on a ValueError.
+    """
+    settings.CRAWLER_BACKEND = "http"
+    http_crawler = mocker.patch("src.crawlers.engine.HttpCourseRetrieveCrawler").return_value
+    browser_crawler = mocker.patch("src.crawlers.engine.CourseRetrieveCrawler").return_value
+    browser_crawler.fetch_student_courses.return_value = ["from playwright"]
+
+    http_crawler.fetch_student_courses.side_effect = requests.ConnectionError()
+    assert engine.fetch_student_courses("4001", "secret") == ["from playwright"]
+
+    http_crawler.fetch_student_courses.side_effect = GolestanProtocolError("the wrong password message")
+    assert engine.fetch_student_courses("4001", "secret") == ["from playwright"]
+
+    http_crawler.fetch_student_courses.side_effect = ValueError("username or password is incorrect")
+    with pytest.raises(ValueError):
+        engine.fetch_student_courses("4001", "wrong")
+    assert browser_crawler.fetch_student_courses.call_count == 2
+
+
+def test_http_crawl_is_traced(golestan, mocker):
+    """
+        Test that each stage of the crawl is timed and the trace is stored when the crawler closes.
+    """
+    record = mocker.patch("src.crawlers.services.record_crawl_spans")
+    crawler = HttpCourseRetrieveCrawler()
+
+    crawler.fetch_student_courses("4001", "secret")
+    crawler.close()
+
+    trace_id, name, spans = record.call_args.args
+    assert trace_id == crawler.trace.trace_id
+    assert name == "HttpCourseRetrieveCrawler"
+    assert [span["stage"] for span in spans] == ["login_page", "captcha", "solve", "login", "report", "total"]
+    assert not any(span["failed"] for span in spans)
@@ -0,0 +1,114 @@
+import pytest
+from src.crawlers import CourseRetrieveCrawler
+from src.crawlers.golestan_pages import LEGACY_COLUMNS, course_from_row, report_columns
+
+
+HEADER = [
+    "دانشكده درس", "گروه آموزشي", "مقطع", "شماره و گروه درس", "نام درس", "نظري", "عملي", "ظرفيت", "جنسيت",
+    "نام استاد", "زمان و مكان ارائه/ امتحان", "محل برگزاري", "پيش نياز", "هم نياز", "توضيحات",
+]
+
+
+def row(code, classes="درس(ت): يك شنبه 10:00-12:00\tامتحان(1404.03.26)"):
+    return ["فني", "كامپيوتر", "كارشناسي", code, "ساختمان داده", "3", "0", "40", "مختلط", "دكتر الف",
+            classes, "دانشكده فني", "1212318", "", "ندارد"]
+
+
+def test_report_columns_follow_the_header():
+    """
+        Test that columns are found by header text, including an extra prerequisite column.
+    """
+    columns = report_columns(HEADER)
+
+    assert columns["course_code"] == 3
+    assert columns["classes"] == 10
+    assert columns["class_location"] == 11
+    assert columns["prerequisites"] == 12
+    assert columns["notes"] == 14
+
+    course = course_from_row(row("1212317_01"), columns)
+    assert course["notes"] == "ندارد"
+    assert course["prerequisites"] == ["1212318", ""]
+    # a tab inside a cell no longer shifts the columns after it
+    assert course["classes"] == "درس(ت): يك شنبه 10:00-12:00\tامتحان(1404.03.26)"
+    assert course["class_location"] == "دانشكده فني"
+
+
+def test_unknown_header_keeps_the_legacy_positions():
+    """
+        Test that a header without known labels maps to the positions used before.
+    """
+    assert report_columns(["?"] * 14) == LEGACY_COLUMNS
+
+
+def test_legacy_position_of_a_claimed_column_is_not_reused():
+    """
+        Test that a missing header whose legacy position holds another field's column is an error.
+    """
+    header = ["?"] * 5 + ["نام درس"] + ["?"] * 9
+
+    with pytest.raises(ValueError, match="theory"):
+        report_columns(header)
+
+
+@pytest.fixture
+def table():
+    return [HEADER] + [row(f"12123{i:02d}_01") for i in range(5)]
+
+
+@pytest.fixture
+def course_page(mocker, table):
+    pool = mocker.patch("src.crawlers.golestan_base_crawler.get_browser_pool").return_value
+    page = pool.acquire.return_value.new_page.return_value
+
+    def evaluate(script, arg):
+        end = len(table) if arg["count"] is None else arg["start"] + arg["count"]
+        return {"total": len(table), "rows": table[arg["start"]:end]}
+
+    course_page = page.expect_popup.return_value.__enter__.return_value.value
+    course_page.evaluate.side_effect = evaluate
+    mocker.patch.object(CourseRetrieveCrawler, "login")
+    mocker.patch.object(CourseRetrieveCrawler, "_CourseRetrieveCrawler__search_courses")
+    return course_page
+
+
+def test_courses_are_read_with_one_evaluate(course_page):
+    """
+        Test that the whole report is read by a single evaluate() call.
+    """
+    courses = CourseRetrieveCrawler().fetch_student_courses("4001", "secret")
+
+    assert course_page.evaluate.call_count == 1
+    assert [course["course_code"] for course in courses] == [f"12123{i:02d}_01" for i in range(5)]
+
+
+def test_courses_are_streamed_in_chunks(course_page):
+    """
+        Test that the streaming variant yields the same courses in chunks.
+    """
+    chunks = list(CourseRetrieveCrawler().stream_student_courses("4001", "secret", chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [course["course_code"] for chunk in chunks for course in chunk] == [f"12123{i:02d}_01" for i in range(5)]
+
+
+@pytest.mark.parametrize("table", [[], [HEADER]])
+def test_report_without_courses_is_an_error(course_page, table):
+    """
+        Test that a report without a table or with only its header fails both reading paths.
+    """
+    with pytest.raises(ValueError, match="no courses"):
+        CourseRetrieveCrawler().fetch_student_courses("4001", "secret")
+    with pytest.raises(ValueError, match="no courses"):
+        list(CourseRetrieveCrawler().stream_student_courses("4001", "secret"))
+
+
+def test_missing_report_table_is_an_error(course_page):
+    """
+        Test that a page where the report script finds no table fails the stream.
+    """
+    course_page.evaluate.side_effect = None
+    course_page.evaluate.return_value = None
+
+    with pytest.raises(ValueError, match="no courses"):
+        list(CourseRetrieveCrawler().stream_student_courses("4001", "secret"))
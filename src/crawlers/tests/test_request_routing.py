@@ -0,0 +1,79 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from playwright.sync_api import Error as PlaywrightError
+from src.crawlers.request_routing import RequestRouter
+
+
+def make_router():
+    return RequestRouter(
+        blocked_resource_types=["image", "stylesheet", "font"],
+        blocked_url_patterns=[r"google-analytics\.com"],
+        allowed_url_patterns=[r"(?i)captcha"],
+    )
+
+
+def make_route(resource_type, url):
+    route = MagicMock()
+    route.request.resource_type = resource_type
+    route.request.url = url
+    return route
+
+
+def test_should_block():
+    """
+        Test that blocked types and URL patterns are aborted unless the URL is allowlisted.
+    """
+    router = make_router()
+
+    assert router.should_block("image", "https://golestan.ui.ac.ir/_images/logo.png")
+    assert router.should_block("stylesheet", "https://golestan.ui.ac.ir/_css/main.css")
+    assert router.should_block("script", "https://www.google-analytics.com/analytics.js")
+    assert not router.should_block("image", "https://golestan.ui.ac.ir/Forms/AuthenticateUser/captcha.aspx?rnd=1")
+    assert not router.should_block("document", "https://golestan.ui.ac.ir/Forms/F0213_PROCESS_SYSMENU/F0213.aspx")
+    assert not router.should_block("script", "https://golestan.ui.ac.ir/_scripts/golestan.js")
+
+
+def test_routes_are_aborted_or_passed_on_and_counted():
+    """
+        Test that blocked requests are aborted, others fall back to the network, and both are counted,
+        allowed ones with the body size of their finished responses.
+    """
+    router = make_router()
+    blocked = make_route("font", "https://golestan.ui.ac.ir/_fonts/tahoma.woff")
+    allowed = make_route("document", "https://golestan.ui.ac.ir/forms/authenticateuser/main.htm")
+
+    router._route(blocked)
+    router._route(allowed)
+    router._count_finished(MagicMock(sizes=MagicMock(return_value={"responseBodySize": 2048})))
+    asyncio.run(router._count_finished_async(MagicMock(sizes=AsyncMock(return_value={"responseBodySize": 512}))))
+    router._count_finished(MagicMock(sizes=MagicMock(side_effect=PlaywrightError("Target page has been closed"))))
+
+    blocked.abort.assert_called_once_with("blockedbyclient")
+    allowed.fallback.assert_called_once()
+    assert router.stats.as_dict() == {
+        "allowed_requests": 1,
+        "allowed_bytes": 2560,
+        "blocked_requests": 1,
+        "blocked_by_type": {"font": 1},
+    }
+
+
+def test_attach_routes_the_whole_context():
+    """
+        Test that the router is installed on the context, so popups are routed as well.
+    """
+    router = make_router()
+    context = MagicMock()
+    router.attach(context)
+    context.route.assert_called_once_with("**/*", router._route)
+    context.on.assert_called_once_with("requestfinished", router._count_finished)
+
+    async_context = MagicMock(route=AsyncMock())
+    asyncio.run(router.attach_async(async_context))
+    async_context.route.assert_awaited_once_with("**/*", router._route_async)
+    async_context.on.assert_called_once_with("requestfinished", router._count_finished_async)
+
+    route = make_route("image", "https://golestan.ui.ac.ir/_images/bg.gif")
+    route.abort = AsyncMock()
+    asyncio.run(router._route_async(route))
+    route.abort.assert_awaited_once_with("blockedbyclient")
@@ -0,0 +1,104 @@
+import multiprocessing
+import pytest
+from django.core.cache import caches
+from django.db import connections
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from src.crawlers.golestan_base_crawler import GolestanBaseCrawler
+from src.crawlers.session_cache import _cache_key, drop_session, load_session, save_session
+
+
+STATE = {"cookies": [{"name": "ASP.NET_SessionId", "value": "x1y2", "domain": "golestan.ui.ac.ir", "path": "/"}],
+         "origins": []}
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def cache(settings):
+    cache = caches[settings.GOLESTAN_SESSION_CACHE]
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_session_round_trip_is_bound_to_the_password(cache):
+    """
+        Test that a saved session is only returned for the same student and password, and is stored encrypted.
+    """
+    save_session("4001", "secret", STATE)
+
+    assert load_session("4001", "secret") == STATE
+    assert load_session("4001", "wrong") is None
+    assert load_session("4002", "secret") is None
+    entry = cache.get(_cache_key("4001"))
+    assert b"x1y2" not in entry["state"]
+    assert "secret" not in entry["password"]
+    drop_session("4001")
+    assert load_session("4001", "secret") is None
+
+
+def test_session_ttl_zero_disables_the_cache(settings):
+    """
+        Test that GOLESTAN_SESSION_TTL=0 keeps no session.
+    """
+    settings.GOLESTAN_SESSION_TTL = 0
+    save_session("4001", "secret", STATE)
+    assert load_session("4001", "secret") is None
+
+
+@pytest.fixture
+def crawler(mocker):
+    mocker.patch("src.crawlers.golestan_base_crawler.get_browser_pool")
+    return GolestanBaseCrawler()
+
+
+def test_login_resumes_a_saved_session(crawler, mocker):
+    """
+        Test that a valid saved session skips the login form and its captcha.
+    """
+    save_session("4001", "secret", STATE)
+    full_login = mocker.patch.object(GolestanBaseCrawler, "_GolestanBaseCrawler__login")
+
+    crawler.login("4001", "secret")
+
+    crawler.context.add_cookies.assert_called_once_with(STATE["cookies"])
+    full_login.assert_not_called()
+
+
+def test_expired_session_falls_back_to_a_full_login(crawler, mocker):
+    """
+        Test that a session Golestan no longer accepts is dropped and replaced by a fresh login.
+    """
+    save_session("4001", "secret", STATE)
+    crawler.page.wait_for_function.side_effect = PlaywrightTimeoutError("Timeout 3000ms exceeded")
+    full_login = mocker.patch.object(GolestanBaseCrawler, "_GolestanBaseCrawler__login")
+    mocker.patch("src.crawlers.captcha_login.LoginAttempts.save")
+    fresh_state = {"cookies": [], "origins": []}
+    crawler.context.storage_state.return_value = fresh_state
+
+    crawler.login("4001", "secret")
+
+    full_login.assert_called_once()
+    crawler.context.clear_cookies.assert_called_once()
+    assert load_session("4001", "secret") == fresh_state
+
+
+def save_in_child_process():
+    save_session("4001", "secret", STATE)
+    connections.close_all()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_session_saved_by_one_process_is_resumed_by_another():
+    """
+        Test that a session saved by another process, like a web worker validating a student, is read back here.
+    """
+    # the child must not share this process's database connection
+    connections.close_all()
+    child = multiprocessing.get_context("fork").Process(target=save_in_child_process)
+    child.start()
+    child.join()
+
+    assert child.exitcode == 0
+    assert load_session("4001", "secret") == STATE
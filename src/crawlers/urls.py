@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import AdmissionMetricsView, CaptchaMetricsView, CrawlTimingMetricsView
+
+
+urlpatterns = [
+    path('metrics/captcha/', CaptchaMetricsView.as_view(), name='captcha-metrics'),
+    path('metrics/crawls/', CrawlTimingMetricsView.as_view(), name='crawl-timing-metrics'),
+    path('metrics/admission/', AdmissionMetricsView.as_view(), name='admission-metrics'),
+]
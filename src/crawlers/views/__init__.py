@@ -0,0 +1 @@
+from .metrics_view import AdmissionMetricsView, CaptchaMetricsView, CrawlTimingMetricsView
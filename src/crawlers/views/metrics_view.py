@@ -0,0 +1,54 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from src.crawlers.services import admission_metrics, captcha_metrics, crawl_timing_metrics
+from src.crawlers.schemas import (
+    admission_metrics_view_schema, captcha_metrics_view_schema, crawl_timing_metrics_view_schema,
+)
+
+
+def window_hours(request):
+    """ The `hours` query parameter, between 1 and 30 days; None when it isn't an integer. """
+    try:
+        return max(1, min(int(request.query_params.get('hours', 24)), 24 * 30))
+    except ValueError:
+        return None
+
+
+@captcha_metrics_view_schema
+class CaptchaMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        hours = window_hours(request)
+        if hours is None:
+            return Response({"hours": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(captcha_metrics(hours), status=status.HTTP_200_OK)
+
+
+@crawl_timing_metrics_view_schema
+class CrawlTimingMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        hours = window_hours(request)
+        if hours is None:
+            return Response({"hours": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        metrics = crawl_timing_metrics(hours, crawler=request.query_params.get('crawler'))
+        return Response(metrics, status=status.HTTP_200_OK)
+
+
+@admission_metrics_view_schema
+class AdmissionMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        hours = window_hours(request)
+        if hours is None:
+            return Response({"hours": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(admission_metrics(hours), status=status.HTTP_200_OK)
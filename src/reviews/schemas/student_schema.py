@@ -7,7 +7,8 @@ from src.utill.serializers import GolestanRequestSerializer
 student_create_view_schema = extend_schema(
     summary="Create UI Student Profile",
     description="Authenticate against Golestan and create a student profile linked to the current user. "
-                "Only available to authenticated users without an existing profile.",
+                "Only available to authenticated users without an existing profile. "
+                "When every Golestan crawl slot stays busy, the request is answered 429 with a `Retry-After` header.",
     request=GolestanRequestSerializer,
     responses={
         201: OpenApiResponse(
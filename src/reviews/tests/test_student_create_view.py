@@ -0,0 +1,27 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from src.crawlers import CrawlerBusy
+
+
+@pytest.fixture
+def api_client(db):
+    user = get_user_model().objects.create(username="student", email="student@example.com")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+def test_busy_crawlers_are_throttled(api_client, mocker):
+    """
+        Test that a student validation is answered 429 with Retry-After when no crawl slot comes free.
+    """
+    mocker.patch("src.reviews.views.student_view.fetch_student_info", side_effect=CrawlerBusy(12))
+
+    response = api_client.post(reverse('create-student'), {"student_id": "4001", "password": "secret"}, format='json')
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response["Retry-After"] == "12"
@@ -2,11 +2,12 @@ from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from rest_framework.generics import GenericAPIView
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from src.utill.serializers import GolestanRequestSerializer
-from src.crawlers import StudentValidatorCrawler
+from src.crawlers import CrawlerBusy, fetch_student_info
 from src.reviews.models import Student
 from src.reviews.schemas import student_create_view_schema
 
@@ -24,16 +25,15 @@ class StudentCreateView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
         golestan_username = serializer.validated_data['student_id']
         golestan_password = serializer.validated_data['password']
-        crawler = StudentValidatorCrawler()
 
         try:
-            student_info = crawler.fetch_student_info(golestan_username, golestan_password)
+            student_info = fetch_student_info(golestan_username, golestan_password)
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except CrawlerBusy as e:
+            raise Throttled(wait=e.retry_after, detail=str(_("too many students are being validated, try again later")))
         except Exception as e:
             return Response({"detail": _("internal server error")}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        finally:
-            crawler.close()
 
         with transaction.atomic():
             user = request.user